@@ -0,0 +1,228 @@
+"""
+Audit Job Runner
+
+Runs audit jobs on a bounded pool of async workers.
+
+- Each job gets its own AgentOrchestrator, so metrics never leak between audits
+- A bounded backlog provides backpressure (submit fails fast when full)
+- Per-tenant concurrency caps stop one tenant from occupying every worker
+"""
+
+import asyncio
+import logging
+from collections import Counter, defaultdict, deque
+from typing import Awaitable, Callable, Deque, Dict, List, Optional
+
+from src.config import settings
+from src.models.schemas import AuditJobRequest, JobStatus, Report
+from src.agents.orchestrator import AgentOrchestrator
+from src.utils.errors import JobQueueFullException
+
+logger = logging.getLogger(__name__)
+
+
+# Listener signature: (job, status, report, error_message)
+JobListener = Callable[
+    [AuditJobRequest, JobStatus, Optional[Report], Optional[str]], Awaitable[None]
+]
+
+
+class AuditJobRunner:
+    """Bounded async worker pool for audit jobs"""
+
+    def __init__(
+        self,
+        worker_count: Optional[int] = None,
+        max_pending: Optional[int] = None,
+        max_per_tenant: Optional[int] = None,
+    ):
+        """
+        Args:
+            worker_count: Number of audits that may run at once
+            max_pending: Max jobs waiting to start (backpressure limit)
+            max_per_tenant: Max audits running at once for a single tenant
+        """
+        self.worker_count = worker_count or settings.AUDIT_WORKER_COUNT
+        self.max_pending = max_pending or settings.AUDIT_QUEUE_MAX_SIZE
+        self.max_per_tenant = max_per_tenant or settings.AUDIT_MAX_CONCURRENT_PER_TENANT
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._listeners: List[JobListener] = []
+
+        # Jobs held back because their tenant is at its concurrency cap
+        self._deferred: Dict[str, Deque[AuditJobRequest]] = defaultdict(deque)
+        self._running_per_tenant: Counter = Counter()
+        self._running: Dict[str, asyncio.Task] = {}
+        self._pending_count = 0
+
+        logger.info(
+            f"[JOBS] Job runner configured: workers={self.worker_count} "
+            f"max_pending={self.max_pending} max_per_tenant={self.max_per_tenant}"
+        )
+
+    # ===== LIFECYCLE =====
+
+    async def start(self):
+        """Start the worker tasks"""
+        if self._workers:
+            return
+
+        self._queue = asyncio.Queue()
+        self._workers = [
+            asyncio.create_task(self._worker(i), name=f"audit-worker-{i}")
+            for i in range(self.worker_count)
+        ]
+        logger.info(f"[JOBS] Started {self.worker_count} audit workers")
+
+    async def stop(self):
+        """Cancel workers and any running audits"""
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+
+        self._workers = []
+        logger.info("[JOBS] Audit workers stopped")
+
+    def add_listener(self, listener: JobListener):
+        """Register a callback for job status transitions"""
+        self._listeners.append(listener)
+
+    # ===== SUBMISSION =====
+
+    def submit(self, job: AuditJobRequest):
+        """
+        Queue a job for execution.
+
+        Raises:
+            JobQueueFullException: If the backlog is full (caller should retry later)
+        """
+        if self._queue is None:
+            raise RuntimeError("Job runner is not started")
+
+        if self._pending_count >= self.max_pending:
+            logger.warning(
+                f"[JOBS] Backlog full ({self._pending_count}/{self.max_pending}), "
+                f"rejecting job {job.job_id}"
+            )
+            raise JobQueueFullException(
+                f"Audit backlog is full ({self.max_pending} jobs pending)"
+            )
+
+        self._pending_count += 1
+        self._queue.put_nowait(job)
+        logger.info(f"[JOBS] Job queued: {job.job_id} (tenant={job.tenant_id})")
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Current pool utilisation"""
+        return {
+            "workers": self.worker_count,
+            "running": len(self._running),
+            "pending": self._pending_count,
+            "deferred": sum(len(jobs) for jobs in self._deferred.values()),
+        }
+
+    # ===== WORKERS =====
+
+    async def _worker(self, worker_id: int):
+        """Pull jobs from the queue and run them"""
+        queue = self._queue
+        assert queue is not None  # Workers are only spawned by start()
+        while True:
+            job = await queue.get()
+
+            try:
+                if self._running_per_tenant[job.tenant_id] >= self.max_per_tenant:
+                    # Park the job; it is re-queued when a tenant slot frees up
+                    self._deferred[job.tenant_id].append(job)
+                    continue
+
+                self._pending_count -= 1
+                self._running_per_tenant[job.tenant_id] += 1
+
+                try:
+                    await self._run_job(job, worker_id)
+                finally:
+                    self._running_per_tenant[job.tenant_id] -= 1
+                    self._release_deferred(job.tenant_id)
+
+            finally:
+                queue.task_done()
+
+    def _release_deferred(self, tenant_id: str):
+        """Move one parked job for the tenant back onto the run queue"""
+        deferred = self._deferred.get(tenant_id)
+        if deferred and self._queue is not None:
+            self._queue.put_nowait(deferred.popleft())
+            if not deferred:
+                del self._deferred[tenant_id]
+
+        if self._running_per_tenant[tenant_id] <= 0:
+            self._running_per_tenant.pop(tenant_id, None)
+
+    async def _run_job(self, job: AuditJobRequest, worker_id: int):
+        """Run a single audit with its own orchestrator"""
+        orchestrator = AgentOrchestrator()
+        task = asyncio.create_task(
+            orchestrator.execute_audit(
+                job_id=job.job_id,
+                workspace_id=job.workspace_id,
+                subscription_id=job.subscription_id,
+                resource_group=job.resource_group,
+                workspace_name=job.workspace_name,
+                days_lookback=job.days_lookback,
+                incremental=job.incremental,
+            )
+        )
+        self._running[job.job_id] = task
+
+        logger.info(f"[JOBS] Worker {worker_id} running job {job.job_id}")
+        await self._notify(job, JobStatus.RUNNING)
+
+        try:
+            report = await task
+            await self._notify(job, JobStatus.COMPLETED, report=report)
+
+            summary = orchestrator.get_execution_summary()
+            logger.info(
+                f"[JOBS] Job completed: {job.job_id} "
+                f"({summary.get('total_execution_time', 0):.1f}s)"
+            )
+
+        except asyncio.CancelledError:
+            logger.warning(f"[JOBS] Job cancelled: {job.job_id}")
+            await self._notify(
+                job, JobStatus.CANCELLED, error_message="Audit cancelled"
+            )
+            # Re-raise only if the worker itself is being stopped
+            worker = asyncio.current_task()
+            if worker is not None and worker.cancelling():
+                raise
+
+        except Exception as e:
+            logger.error(f"[JOBS] Job failed: {job.job_id} - {str(e)}")
+            await self._notify(job, JobStatus.FAILED, error_message=str(e))
+
+        finally:
+            self._running.pop(job.job_id, None)
+
+    async def _notify(
+        self,
+        job: AuditJobRequest,
+        status: JobStatus,
+        report: Optional[Report] = None,
+        error_message: Optional[str] = None,
+    ):
+        """Invoke status listeners; listener failures never fail the job"""
+        for listener in self._listeners:
+            try:
+                await listener(job, status, report, error_message)
+            except Exception as e:
+                logger.error(
+                    f"[JOBS] Status listener failed for {job.job_id}: {str(e)}"
+                )
+
+
+# ===== SINGLETON INSTANCE =====
+audit_job_runner = AuditJobRunner()
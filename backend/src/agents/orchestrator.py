@@ -8,24 +8,51 @@ Implements ReAct loop: Reason → Act → Observe
 import logging
 import asyncio
 import time
-from typing import List, Dict, Optional, Tuple
+from typing import Any, List, Dict, Optional, Tuple
 from datetime import datetime
 
 from src.config import settings
 from src.models.schemas import (
     AnalyticsRule, Workbook, HuntQuery, DataConnector, TableIngestionData,
-    KqlParseResult, Report
+    KqlParseResult, Report, ToolEventType, ToolExecutionEvent, WorkspacePricingProfile
 )
 from src.services.azure_api import azure_api_service
+from src.agents.scheduler import StepScheduler
+from src.agents.tool_executor import tool_executor
 from src.services.kql_parser import kql_parser
-from src.services.cost_calculator import cost_calculator
+from src.services.kql_resolver import KqlResolver
+from src.services.rule_snapshot import RuleSnapshot, rule_snapshot_store
+from src.services.usage_index import attribute_query_log
+from src.services.table_catalog import TableCatalog
+from src.services.cost_calculator import CostTable, cost_calculator
 from src.services.report_generator import report_generator
+from src.services.event_bus import event_bus
 from src.security import pii_masking, prompt_shield, data_sanitizer
 from src.security_middleware import security_middleware
 from src.utils.logging import AuditLogger
 
 logger = logging.getLogger(__name__)
 
+# Tool name -> (step number, description) used for progress events
+AUDIT_STEPS = {
+    "list_workspace_tables": (1, "Listing all tables in workspace"),
+    "get_workspace_pricing": (1, "Reading workspace region and pricing tier"),
+    "get_ingestion_volume": (2, "Calculating ingestion volumes"),
+    "get_daily_ingestion": (2, "Fetching daily ingestion history"),
+    "get_query_usage": (2, "Fetching query log usage"),
+    "parse_query_log_kql": (4, "Attributing LAQueryLogs queries to tables"),
+    "list_analytics_rules": (3, "Fetching analytics rules"),
+    "list_saved_functions": (4, "Fetching saved workspace functions"),
+    "parse_kql_tables": (4, "Parsing KQL table references"),
+    "list_workbooks": (5, "Fetching workbooks"),
+    "list_hunt_queries": (6, "Fetching hunt queries"),
+    "parse_artifact_kql": (6, "Parsing workbook and hunt query KQL"),
+    "list_data_connectors": (7, "Fetching data connectors"),
+    "calculate_costs": (8, "Calculating cost savings"),
+    "generate_report": (9, "Generating optimization report"),
+}
+TOTAL_AUDIT_STEPS = max(step for step, _ in AUDIT_STEPS.values())
+
 
 class AgentOrchestrator:
     """
@@ -46,6 +73,7 @@ class AgentOrchestrator:
         self.tokens_used = 0
         self.max_tokens = settings.AGENT_MAX_TOKENS_PER_RUN
         self.tool_results = {}
+        self.reparsed_results = None
 
         logger.info("[AGENT] Orchestrator initialized")
 
@@ -56,7 +84,8 @@ class AgentOrchestrator:
         subscription_id: str,
         resource_group: str,
         workspace_name: str,
-        days_lookback: int = 30
+        days_lookback: int = 30,
+        incremental: bool = True
     ) -> Report:
         """
         Execute complete audit workflow.
@@ -68,6 +97,7 @@ class AgentOrchestrator:
             resource_group: Resource group name
             workspace_name: Workspace display name
             days_lookback: Days of history to analyze
+            incremental: Reuse parse results of rules unchanged since the last audit
 
         Returns:
             Completed Report object
@@ -81,38 +111,233 @@ class AgentOrchestrator:
         try:
             logger.info(f"[AGENT] Starting audit execution: job_id={job_id}")
 
-            # ===== STEP 1: List all tables =====
+            # ===== STEPS 1-7: Fetch workspace data =====
+            # Independent fetches run concurrently; KQL parsing starts as soon
+            # as the analytics rules arrive rather than after every fetch.
+            scheduler = self._build_fetch_scheduler(
+                resource_group, workspace_name, days_lookback, incremental
+            )
+            step_results = await scheduler.run()
+
+            tables = step_results["list_workspace_tables"]
+            pricing_profile = step_results["get_workspace_pricing"]
+            ingestion_data = step_results["get_ingestion_volume"]
+            daily_ingestion = step_results["get_daily_ingestion"]
+            query_usage = step_results["parse_query_log_kql"]
+            rules, kql_parse_results = step_results["parse_kql_tables"]
+            workbooks, hunt_queries = step_results["parse_artifact_kql"]
+            connectors = step_results["list_data_connectors"]
+
+            for step_name, step_time in scheduler.step_times.items():
+                self.execution_times.setdefault(step_name, step_time)
+
+            logger.info(
+                f"[AGENT] Data collection complete in "
+                f"{time.time() - self.execution_start_time:.1f}s "
+                f"(slowest step: {max(scheduler.step_times.values()):.1f}s)"
+            )
+
+            # ===== STEP 8: Calculate savings =====
+            logger.info("[AGENT] STEP 8: Calculating cost savings")
+            cost_table = await self._execute_tool(
+                "calculate_costs",
+                cost_calculator.build_cost_table,
+                [table.table_name for table in tables],
+                ingestion_data,
+                [table.current_tier for table in tables],
+                "Archive",
+                pricing_profile,
+                cpu_bound=True
+            )
+
+            logger.info(
+                f"[AGENT] Cost calculations complete: {len(cost_table)} tables, "
+                f"${cost_table.total('monthly_savings'):,.2f}/month potential savings"
+            )
+
+            # ===== STEP 9: Generate report =====
+            logger.info("[AGENT] STEP 9: Generating optimization report")
+
+            execution_time = time.time() - self.execution_start_time
+
+            report = await self._execute_tool(
+                "generate_report",
+                report_generator.generate_report,
+                job_id=job_id,
+                workspace_id=workspace_id,
+                workspace_name=workspace_name,
+                tables=tables,
+                rules=rules,
+                ingestion_data=ingestion_data,
+                connectors=connectors,
+                kql_parse_results=kql_parse_results,
+                workbooks=workbooks,
+                hunt_queries=hunt_queries,
+                reparsed_results=self.reparsed_results,
+                query_usage=query_usage,
+                cost_table=cost_table,
+                daily_ingestion=daily_ingestion,
+                agent_tokens_used=self.tokens_used,
+                agent_max_tokens=self.max_tokens,
+                agent_run_seconds=execution_time,
+                cpu_bound=True
+            )
+
+            logger.info(
+                f"[AGENT] Audit execution complete: "
+                f"job_id={job_id} "
+                f"tables={len(tables)} "
+                f"annual_savings=${report.summary.total_annual_savings:,.0f} "
+                f"execution_time={execution_time:.1f}s"
+            )
+
+            self._publish_event(
+                "step_complete", None, "Audit complete", step_number=TOTAL_AUDIT_STEPS
+            )
+
+            # ===== SECURITY: Audit logging for completed audit =====
+            logger.info("[AGENT] Logging audit completion event")
+            security_middleware.log_security_event(
+                event_type="AUDIT_COMPLETED",
+                severity="LOW",
+                details=f"Audit completed: {len(tables)} tables, ${report.summary.total_annual_savings:,.0f} savings identified"
+            )
+
+            return report
+
+        except asyncio.TimeoutError:
+            logger.error(f"[AGENT] Execution timeout after {settings.AGENT_TIMEOUT_SECONDS}s")
+            raise
+
+        except Exception as e:
+            logger.error(f"[AGENT] Execution failed: {str(e)}")
+            raise
+
+    def _build_fetch_scheduler(
+        self, resource_group: str, workspace_name: str, days_lookback: int, incremental: bool = True
+    ) -> StepScheduler:
+        """
+        Build the dependency graph for the data collection steps.
+
+        None of the Azure fetches depend on each other, so they all start
+        immediately. KQL validation and parsing waits for the rules, the table
+        catalog (the tables are attributed against) and the saved functions
+        (expanded by the resolver). In incremental mode only rules changed
+        since the last audit of the workspace are parsed. Workbook and hunt
+        query KQL is parsed once both have been fetched, and LAQueryLogs
+        queries are attributed against the same catalog and functions.
+
+        Returns:
+            StepScheduler ready to run
+        """
+
+        # ===== STEP 1: List all tables =====
+        async def list_tables():
             logger.info("[AGENT] STEP 1: Fetching workspace tables")
             tables = await self._execute_tool(
                 "list_workspace_tables",
-                lambda: azure_api_service.list_workspace_tables(resource_group, workspace_name)
+                azure_api_service.list_workspace_tables,
+                resource_group,
+                workspace_name
             )
 
             if not tables:
                 raise Exception("No tables found in workspace")
 
             logger.info(f"[AGENT] Found {len(tables)} tables")
+            return tables
+
+        # Workspace region/commitment tier select the price rates (non-fatal)
+        async def get_pricing_profile():
+            try:
+                return await self._execute_tool(
+                    "get_workspace_pricing",
+                    azure_api_service.get_workspace_pricing_profile,
+                    resource_group,
+                    workspace_name
+                )
+            except Exception as e:
+                logger.warning(f"[AGENT] Using default pricing region: {str(e)}")
+                return WorkspacePricingProfile(
+                    region=settings.PRICING_REGION, currency=settings.PRICING_CURRENCY
+                )
 
-            # ===== STEP 2: Get ingestion volume =====
+        # ===== STEP 2: Get ingestion volume =====
+        async def get_ingestion():
             logger.info("[AGENT] STEP 2: Fetching ingestion volume data")
             ingestion_data = await self._execute_tool(
                 "get_ingestion_volume",
-                lambda: azure_api_service.get_ingestion_volume(
-                    resource_group, workspace_name, days_lookback
-                )
+                azure_api_service.get_ingestion_volume,
+                resource_group,
+                workspace_name,
+                days_lookback
             )
 
             logger.info(f"[AGENT] Ingestion data retrieved for {len(ingestion_data)} tables")
+            return ingestion_data
+
+        # Daily history for the savings forecast (non-fatal)
+        async def get_daily_ingestion():
+            try:
+                return await self._execute_tool(
+                    "get_daily_ingestion",
+                    azure_api_service.get_daily_ingestion,
+                    resource_group,
+                    workspace_name,
+                    settings.FORECAST_HISTORY_DAYS
+                )
+            except Exception as e:
+                logger.warning(f"[AGENT] Skipping savings forecast: {str(e)}")
+                return []
+
+        # Tables analysts and automation actually query (non-fatal: needs query auditing)
+        async def get_query_usage():
+            if not settings.QUERY_USAGE_ENABLED:
+                return {}, {}
+            try:
+                return await self._execute_tool(
+                    "get_query_usage",
+                    azure_api_service.get_query_usage,
+                    resource_group,
+                    workspace_name,
+                    days_lookback
+                )
+            except Exception as e:
+                logger.warning(f"[AGENT] Skipping query log usage: {str(e)}")
+                return {}, {}
 
-            # ===== STEP 3: List analytics rules =====
+        # ===== STEP 3: List analytics rules =====
+        async def list_rules():
             logger.info("[AGENT] STEP 3: Fetching analytics rules")
             rules = await self._execute_tool(
                 "list_analytics_rules",
-                lambda: azure_api_service.list_analytics_rules(resource_group, workspace_name)
+                azure_api_service.list_analytics_rules,
+                resource_group,
+                workspace_name
             )
 
             logger.info(f"[AGENT] Found {len(rules)} analytics rules")
+            return rules
+
+        # Saved functions rules may read through (non-fatal)
+        async def list_saved_functions():
+            try:
+                return await self._execute_tool(
+                    "list_saved_functions",
+                    azure_api_service.list_saved_functions,
+                    resource_group,
+                    workspace_name
+                )
+            except Exception as e:
+                logger.warning(f"[AGENT] Saved functions will not be resolved: {str(e)}")
+                return []
+
+        # Tables are attributed against what actually exists in the workspace
+        async def build_catalog(tables):
+            return TableCatalog(table.table_name for table in tables)
 
+        # ===== STEP 4: Parse KQL from rules =====
+        async def parse_rules(rules, catalog, functions):
             # ===== SECURITY: Validate and mask KQL queries =====
             logger.info("[AGENT] Applying security controls: validating and masking KQL")
             rules = security_middleware.validate_and_mask_kql_queries(rules)
@@ -122,13 +347,41 @@ class AgentOrchestrator:
                 details=f"Validated {len(rules)} KQL queries"
             )
 
-            # ===== STEP 4: Parse KQL from rules =====
             logger.info("[AGENT] STEP 4: Parsing KQL queries")
-            kql_queries = [rule.kql_query for rule in rules if rule.kql_query]
+            resolver = KqlResolver(functions, catalog)
 
-            kql_parse_results = await self._execute_tool(
-                "parse_kql_tables",
-                lambda: kql_parser.batch_parse(kql_queries)
+            snapshot_key = rule_snapshot_store.workspace_key(
+                settings.AZURE_SUBSCRIPTION_ID, resource_group, workspace_name
+            )
+            async with rule_snapshot_store.lock(snapshot_key):
+                snapshot = await rule_snapshot_store.load(
+                    snapshot_key, RuleSnapshot.fingerprint_of(catalog, functions)
+                )
+
+                # Results of rules unchanged since the last audit are reused
+                kql_parse_results = [
+                    snapshot.lookup(rule) if incremental else None for rule in rules
+                ]
+                changed = [i for i, result in enumerate(kql_parse_results) if result is None]
+
+                parsed = await self._execute_tool(
+                    "parse_kql_tables",
+                    kql_parser.batch_parse,
+                    [rules[i].kql_query for i in changed],
+                    catalog,
+                    resolver,
+                    cpu_bound=True
+                )
+                for i, parse_result in zip(changed, parsed):
+                    kql_parse_results[i] = parse_result
+
+                snapshot.update(rules, kql_parse_results)
+                await rule_snapshot_store.save(snapshot_key, snapshot)
+
+            self.reparsed_results = parsed
+            logger.info(
+                f"[AGENT] Parsed {len(changed)} of {len(rules)} rules; "
+                f"expanded {resolver.bodies_parsed} of {len(functions)} saved functions"
             )
 
             # Map parsed tables back to rules
@@ -139,29 +392,108 @@ class AgentOrchestrator:
             parse_success_rate = sum(1 for r in kql_parse_results if r.success) / len(kql_parse_results) if kql_parse_results else 0
             logger.info(f"[AGENT] KQL parsing complete: {parse_success_rate:.1%} success rate")
 
-            # ===== STEP 5: List workbooks =====
+            return rules, kql_parse_results
+
+        # ===== STEP 5: List workbooks =====
+        async def list_workbooks():
             logger.info("[AGENT] STEP 5: Fetching workbooks")
             workbooks = await self._execute_tool(
                 "list_workbooks",
-                lambda: azure_api_service.list_workbooks(resource_group, workspace_name)
+                azure_api_service.list_workbooks,
+                resource_group,
+                workspace_name
             )
 
             logger.info(f"[AGENT] Found {len(workbooks)} workbooks")
+            return workbooks
 
-            # ===== STEP 6: List hunt queries =====
+        # ===== STEP 6: List hunt queries =====
+        async def list_hunt_queries():
             logger.info("[AGENT] STEP 6: Fetching hunt queries")
             hunt_queries = await self._execute_tool(
                 "list_hunt_queries",
-                lambda: azure_api_service.list_hunt_queries(resource_group, workspace_name)
+                azure_api_service.list_hunt_queries,
+                resource_group,
+                workspace_name
             )
 
             logger.info(f"[AGENT] Found {len(hunt_queries)} hunt queries")
+            return hunt_queries
+
+        # Tables read by workbooks and hunt queries count as usage too
+        async def parse_artifacts(workbooks, hunt_queries, catalog, functions):
+            resolver = KqlResolver(functions, catalog)
+            queries = [query for workbook in workbooks for query in workbook.kql_queries]
+            queries.extend(hunt_query.kql_query for hunt_query in hunt_queries)
+
+            results = iter(await self._execute_tool(
+                "parse_artifact_kql",
+                kql_parser.batch_parse,
+                queries,
+                catalog,
+                resolver,
+                cpu_bound=True
+            ))
+
+            for workbook in workbooks:
+                parsed = [
+                    result for result in (next(results) for _ in workbook.kql_queries)
+                    if result.success
+                ]
+                workbook.tables_referenced = list(dict.fromkeys(
+                    table for result in parsed for table in result.tables
+                ))
+                workbook.parsing_confidence = min(
+                    (result.parsing_confidence for result in parsed), default=0.0
+                )
+
+            for hunt_query, result in zip(hunt_queries, results):
+                hunt_query.tables_referenced = result.tables
+                hunt_query.parsing_confidence = result.parsing_confidence
+
+            logger.info(
+                f"[AGENT] Parsed {len(queries)} queries from "
+                f"{len(workbooks)} workbooks and {len(hunt_queries)} hunt queries"
+            )
+            return workbooks, hunt_queries
+
+        # Each distinct LAQueryLogs query is parsed once, like rules and artifacts
+        async def parse_query_log(query_log, catalog, functions):
+            texts, daily_counts = query_log
+            if not texts:
+                return []
+
+            query_hashes = list(texts)
+            try:
+                # Mostly one-off queries: keep them out of the shared parse cache
+                results = await self._execute_tool(
+                    "parse_query_log_kql",
+                    kql_parser.batch_parse,
+                    [texts[query_hash] for query_hash in query_hashes],
+                    catalog,
+                    KqlResolver(functions, catalog),
+                    write_cache=False,
+                    cpu_bound=True
+                )
+            except Exception as e:
+                logger.warning(f"[AGENT] Skipping query log usage: {str(e)}")
+                return []
+            query_usage = attribute_query_log(daily_counts, query_hashes, results)
+
+            logger.info(
+                f"[AGENT] Attributed {len(query_hashes)} distinct logged queries "
+                f"to {len({row[1] for row in query_usage})} tables"
+            )
+            return query_usage
 
-            # ===== STEP 7: List data connectors =====
+        # ===== STEP 7: List data connectors =====
+        async def list_connectors():
             logger.info("[AGENT] STEP 7: Fetching data connectors")
             connectors = await self._execute_tool(
                 "list_data_connectors",
-                lambda: azure_api_service.list_data_connectors(resource_group, workspace_name)
+                azure_api_service.list_data_connectors,
+                resource_group,
+                workspace_name
             )
 
             logger.info(f"[AGENT] Found {len(connectors)} data connectors")
@@ -175,80 +507,54 @@ class AgentOrchestrator:
                 details=f"Masked metadata for {len(connectors)} connectors"
             )
 
-            # ===== STEP 8: Calculate savings =====
-            logger.info("[AGENT] STEP 8: Calculating cost savings")
-            tables_with_costs = []
-
-            for table in tables:
-                ingestion_gb = ingestion_data.get(table.table_name, 0.0)
-                costs = cost_calculator.calculate_table_costs(ingestion_gb, table.current_tier, "Archive")
-
-                table_data = {
-                    "table_name": table.table_name,
-                    "ingestion_gb_day": ingestion_gb,
-                    "costs": costs
-                }
-                tables_with_costs.append(table_data)
-
-            logger.info("[AGENT] Cost calculations complete")
-
-            # ===== STEP 9: Generate report =====
-            logger.info("[AGENT] STEP 9: Generating optimization report")
-
-            execution_time = time.time() - self.execution_start_time
-
-            report = await self._execute_tool(
-                "generate_report",
-                lambda: report_generator.generate_report(
-                    job_id=job_id,
-                    workspace_id=workspace_id,
-                    workspace_name=workspace_name,
-                    tables=tables,
-                    rules=rules,
-                    ingestion_data=ingestion_data,
-                    connectors=connectors,
-                    kql_parse_results=kql_parse_results,
-                    agent_tokens_used=self.tokens_used,
-                    agent_max_tokens=self.max_tokens,
-                    agent_run_seconds=execution_time
-                )
+            return connectors
+
+        return (
+            StepScheduler()
+            .add_step("list_workspace_tables", list_tables)
+            .add_step("get_workspace_pricing", get_pricing_profile)
+            .add_step("get_ingestion_volume", get_ingestion)
+            .add_step("get_daily_ingestion", get_daily_ingestion)
+            .add_step("list_analytics_rules", list_rules)
+            .add_step("list_saved_functions", list_saved_functions)
+            .add_step("table_catalog", build_catalog, depends_on=["list_workspace_tables"])
+            .add_step(
+                "parse_kql_tables", parse_rules,
+                depends_on=["list_analytics_rules", "table_catalog", "list_saved_functions"]
             )
-
-            logger.info(
-                f"[AGENT] Audit execution complete: "
-                f"job_id={job_id} "
-                f"tables={len(tables)} "
-                f"annual_savings=${report.summary.total_annual_savings:,.0f} "
-                f"execution_time={execution_time:.1f}s"
+            .add_step("get_query_usage", get_query_usage)
+            .add_step(
+                "parse_query_log_kql", parse_query_log,
+                depends_on=["get_query_usage", "table_catalog", "list_saved_functions"]
             )
-
-            # ===== SECURITY: Audit logging for completed audit =====
-            logger.info("[AGENT] Logging audit completion event")
-            security_middleware.log_security_event(
-                event_type="AUDIT_COMPLETED",
-                severity="LOW",
-                details=f"Audit completed: {len(tables)} tables, ${report.summary.total_annual_savings:,.0f} savings identified"
+            .add_step("list_workbooks", list_workbooks)
+            .add_step("list_hunt_queries", list_hunt_queries)
+            .add_step(
+                "parse_artifact_kql", parse_artifacts,
+                depends_on=[
+                    "list_workbooks", "list_hunt_queries", "table_catalog", "list_saved_functions"
+                ]
             )
+            .add_step("list_data_connectors", list_connectors)
+        )
 
-            return report
-
-        except asyncio.TimeoutError:
-            logger.error(f"[AGENT] Execution timeout after {settings.AGENT_TIMEOUT_SECONDS}s")
-            raise
-
-        except Exception as e:
-            logger.error(f"[AGENT] Execution failed: {str(e)}")
-            raise
-
-    async def _execute_tool(self, tool_name: str, tool_func) -> any:
+    async def _execute_tool(
+        self, tool_name: str, tool_func, *args, cpu_bound: bool = False, **kwargs
+    ) -> Any:
         """
         Execute a single tool with monitoring.
 
         Tracks execution time, token usage, and logs tool calls.
+        Async tools are awaited on the event loop; CPU-bound tools run on
+        the shared bounded executor. The deadline is the tool's own deadline,
+        capped by the time left in the overall audit budget.
 
         Args:
             tool_name: Name of tool (for logging)
-            tool_func: Async callable that executes the tool
+            tool_func: Async callable, or sync callable if cpu_bound
+            *args: Positional arguments for tool_func
+            cpu_bound: Run on the CPU executor instead of the event loop
+            **kwargs: Keyword arguments for tool_func
 
         Returns:
             Tool result
@@ -258,35 +564,77 @@ class AgentOrchestrator:
         """
         start_time = time.time()
 
+        timeout = tool_executor.get_tool_timeout(tool_name)
+        if self.execution_start_time:
+            remaining = settings.AGENT_TIMEOUT_SECONDS - (start_time - self.execution_start_time)
+            timeout = min(timeout, remaining)
+
         try:
             logger.info(f"[AGENT] Executing tool: {tool_name}")
+            self._publish_event(
+                "tool_called", tool_name, AUDIT_STEPS.get(tool_name, (0, tool_name))[1]
+            )
 
-            # Execute tool with timeout
-            result = await asyncio.wait_for(
-                asyncio.to_thread(tool_func),
-                timeout=settings.AGENT_TIMEOUT_SECONDS
+            # Execute tool with deadline
+            result = await tool_executor.run(
+                tool_name, tool_func, *args, cpu_bound=cpu_bound, timeout=timeout, **kwargs
             )
 
             execution_time = time.time() - start_time
             self.execution_times[tool_name] = execution_time
 
             # Log tool completion
-            result_count = len(result) if isinstance(result, (list, dict)) else 1
+            result_count = len(result) if isinstance(result, (list, dict, CostTable)) else 1
             logger.info(
                 f"[AGENT] Tool complete: {tool_name} "
                 f"(results: {result_count}, time: {execution_time:.2f}s)"
             )
+            self._publish_event(
+                "tool_completed", tool_name,
+                f"{result_count} results in {execution_time:.2f}s"
+            )
 
             return result
 
         except asyncio.TimeoutError:
             logger.error(f"[AGENT] Tool timeout: {tool_name}")
+            self._publish_event("tool_failed", tool_name, f"Timed out after {timeout:.0f}s")
+            raise
+
+        except asyncio.CancelledError:
+            logger.warning(f"[AGENT] Tool cancelled: {tool_name}")
             raise
 
         except Exception as e:
             logger.error(f"[AGENT] Tool failed: {tool_name} - {str(e)}")
+            self._publish_event("tool_failed", tool_name, "Tool execution failed")
             raise
 
+    def _publish_event(
+        self,
+        event_type: ToolEventType,
+        tool_name: Optional[str],
+        details: str,
+        step_number: Optional[int] = None
+    ):
+        """Publish a progress event for this job to the event bus"""
+        if not self.agent_id:
+            return
+
+        if step_number is None:
+            step_number = AUDIT_STEPS.get(tool_name or "", (0, ""))[0]
+
+        event_bus.publish(
+            self.agent_id,
+            ToolExecutionEvent(
+                event_type=event_type,
+                step_number=step_number,
+                tool_name=tool_name,
+                details=details,
+                timestamp=datetime.utcnow()
+            )
+        )
+
     def check_token_budget(self):
         """Check if agent has exceeded token budget"""
         if self.tokens_used >= self.max_tokens:
@@ -306,7 +654,3 @@ class AgentOrchestrator:
             "tokens_used": self.tokens_used,
             "tokens_limit": self.max_tokens
         }
-
-
-# ===== SINGLETON INSTANCE =====
-agent_orchestrator = AgentOrchestrator()
@@ -0,0 +1,109 @@
+"""
+Audit Step Scheduler
+
+Runs audit workflow steps as a dependency graph.
+Each step starts as soon as the steps it depends on have finished,
+so independent Azure fetches run concurrently instead of in series.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Sequence
+
+logger = logging.getLogger(__name__)
+
+
+class AuditStep:
+    """A single named step in the audit workflow"""
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable[..., Awaitable[Any]],
+        depends_on: Sequence[str] = (),
+    ):
+        """
+        Args:
+            name: Unique step name
+            func: Async callable; receives the results of depends_on in order
+            depends_on: Names of steps that must complete first
+        """
+        self.name = name
+        self.func = func
+        self.depends_on = tuple(depends_on)
+
+
+class StepScheduler:
+    """
+    Dependency-aware scheduler for audit steps.
+
+    Steps must be added after the steps they depend on, which keeps the
+    graph acyclic by construction. If any step fails, all pending steps
+    are cancelled and the original exception is re-raised.
+    """
+
+    def __init__(self):
+        """Initialize empty step graph"""
+        self._steps: Dict[str, AuditStep] = {}
+        self.step_times: Dict[str, float] = {}
+
+    def add_step(
+        self,
+        name: str,
+        func: Callable[..., Awaitable[Any]],
+        depends_on: Sequence[str] = (),
+    ) -> "StepScheduler":
+        """
+        Register a step.
+
+        Raises:
+            ValueError: If the name is taken or a dependency is unknown
+        """
+        if name in self._steps:
+            raise ValueError(f"Duplicate step: {name}")
+
+        missing = [dep for dep in depends_on if dep not in self._steps]
+        if missing:
+            raise ValueError(f"Step {name} depends on unknown steps: {missing}")
+
+        self._steps[name] = AuditStep(name, func, depends_on)
+        return self
+
+    async def run(self) -> Dict[str, Any]:
+        """
+        Execute all steps, honouring dependencies.
+
+        Returns:
+            Dictionary mapping step name -> step result
+        """
+        tasks: Dict[str, asyncio.Task] = {}
+
+        async def run_step(step: AuditStep) -> Any:
+            dependency_results: List[Any] = [
+                await tasks[dep] for dep in step.depends_on
+            ]
+
+            start_time = time.time()
+            result = await step.func(*dependency_results)
+            self.step_times[step.name] = time.time() - start_time
+
+            logger.debug(
+                f"[AGENT] Step complete: {step.name} ({self.step_times[step.name]:.2f}s)"
+            )
+            return result
+
+        for step in self._steps.values():
+            tasks[step.name] = asyncio.create_task(run_step(step), name=step.name)
+
+        try:
+            await asyncio.gather(*tasks.values())
+
+        except BaseException:
+            for task in tasks.values():
+                if not task.done():
+                    task.cancel()
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+            raise
+
+        return {name: task.result() for name, task in tasks.items()}
@@ -0,0 +1,114 @@
+"""
+Agent Tool Execution Engine
+
+Runs agent tools with the right execution model:
+- Async tools (Azure API calls) are awaited directly on the event loop
+- CPU-bound tools (KQL parsing, report generation) run on a bounded executor
+- Every tool call gets a deadline and is cancelled when it expires
+"""
+
+import asyncio
+import functools
+import inspect
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from src.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class ToolExecutor:
+    """Execute agent tools with per-tool deadlines and cancellation"""
+
+    def __init__(self, max_workers: Optional[int] = None):
+        """
+        Args:
+            max_workers: Size of the CPU-bound worker pool
+        """
+        self.max_workers = max_workers or settings.AGENT_CPU_WORKERS
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+        logger.info(
+            f"[AGENT] Tool executor initialized (cpu_workers={self.max_workers})"
+        )
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """Bounded pool for CPU-bound tools (created on first use)"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="agent-tool"
+            )
+        return self._executor
+
+    @staticmethod
+    def get_tool_timeout(tool_name: str) -> float:
+        """Get the deadline for a tool (per-tool override or default)"""
+        return float(
+            settings.AGENT_TOOL_TIMEOUTS.get(
+                tool_name, settings.AGENT_TOOL_TIMEOUT_SECONDS
+            )
+        )
+
+    async def run(
+        self,
+        tool_name: str,
+        tool_func: Callable[..., Any],
+        *args,
+        cpu_bound: bool = False,
+        timeout: Optional[float] = None,
+        **kwargs,
+    ) -> Any:
+        """
+        Execute a tool and return its result.
+
+        Args:
+            tool_name: Name of tool (for deadlines and logging)
+            tool_func: Coroutine function, or plain function if cpu_bound
+            cpu_bound: Run tool_func on the bounded executor
+            timeout: Deadline in seconds (defaults to the tool's configured deadline)
+
+        Returns:
+            Tool result
+
+        Raises:
+            asyncio.TimeoutError: If the tool misses its deadline
+        """
+        deadline = timeout if timeout is not None else self.get_tool_timeout(tool_name)
+
+        if cpu_bound:
+            loop = asyncio.get_running_loop()
+            awaitable = loop.run_in_executor(
+                self.executor, functools.partial(tool_func, *args, **kwargs)
+            )
+        else:
+            awaitable = tool_func(*args, **kwargs)
+            if not inspect.isawaitable(awaitable):
+                return awaitable
+
+        # wait_for cancels the coroutine (or the queued executor job) on timeout.
+        # An executor job that has already started runs to completion in its
+        # thread, but its result is discarded.
+        start_time = time.time()
+        try:
+            return await asyncio.wait_for(awaitable, timeout=max(deadline, 0.0))
+
+        except asyncio.TimeoutError:
+            logger.error(
+                f"[AGENT] Tool deadline exceeded: {tool_name} "
+                f"({time.time() - start_time:.1f}s > {deadline:.1f}s)"
+            )
+            raise
+
+    def shutdown(self):
+        """Stop accepting CPU-bound work and cancel queued jobs"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# ===== SINGLETON INSTANCE =====
+tool_executor = ToolExecutor()
@@ -7,6 +7,7 @@ Endpoints:
 - GET  /audits/{job_id} - Get audit job status
 - GET  /audits/{job_id}/stream - SSE stream of progress
 - GET  /audits/{job_id}/report - Get full report
+- POST /audits/{job_id}/what-if - Simulate tier changes
 - POST /audits/{job_id}/approve - Approve tier changes
 - GET  /audits - List all audit jobs
 - GET  /health - Health check
@@ -15,30 +16,61 @@ Endpoints:
 import logging
 import json
 import os
-from typing import List, Optional
+import uuid
+from typing import List, Optional, Tuple
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import Response, StreamingResponse
 
 from src.config import settings
 from src.models.schemas import (
     StartAuditRequest, ApprovalRequest, WorkspaceInfo, AuditJobMetadata,
     Report, HealthResponse, ErrorResponse, JobStatus,
-    TierType, ConfidenceLevel, ReportSummary, TableRecommendation,
-    ConnectorCoverageItem, ReportWarning, ExecutionMetadata,
-    SetupCredentialsRequest
+    SetupCredentialsRequest, AuditJobRequest, ToolExecutionEvent,
+    WhatIfRequest, WhatIfResult
 )
 from src.api.auth import validate_entra_token, require_approval_group, extract_user_info
 from src.services.azure_api import azure_api_service
+from src.services.job_store import RUNNER_OWNED_STATES, job_store
+from src.services.report_store import report_store
+from src.services.what_if import what_if_service
+from src.agents.job_runner import audit_job_runner
+from src.agents.orchestrator import TOTAL_AUDIT_STEPS
+from src.services.event_bus import event_bus
 from src.security import pii_masking, prompt_shield
 from src.security_middleware import security_middleware
 from src.utils.logging import AuditLogger
+from src.utils.errors import JobQueueFullException, UnknownTableException
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/v1", tags=["audit"])
 
 
+def _parse_workspace_resource_id(workspace_id: str) -> Tuple[str, str]:
+    """
+    Extract (resource_group, workspace_name) from a workspace ARM resource ID.
+
+    Raises:
+        ValueError: If workspace_id is not a Log Analytics workspace resource ID
+    """
+    parts = workspace_id.strip("/").split("/")
+    keys = {parts[i].lower(): parts[i + 1] for i in range(0, len(parts) - 1, 2)}
+
+    if "resourcegroups" not in keys or "workspaces" not in keys:
+        raise ValueError("workspace_id must be a Log Analytics workspace resource ID")
+
+    return keys["resourcegroups"], keys["workspaces"]
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """True if an If-None-Match header matches the ETag (weak comparison)"""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in [tag.removeprefix("W/") for tag in candidates]
+
+
 # ===== HEALTH CHECK =====
 @router.get(
     "/health",
@@ -224,18 +256,46 @@ async def start_audit(
             details=f"days_lookback={request.days_lookback}"
         )
 
-        # Create job (in production, would create database record)
-        job_id = f"job-{datetime.utcnow().timestamp()}"
+        try:
+            resource_group, workspace_name = _parse_workspace_resource_id(request.workspace_id)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
 
-        # Return job metadata
-        return AuditJobMetadata(
-            job_id=job_id,
+        # Create job record, then hand it to the worker pool
+        job = AuditJobMetadata(
+            job_id=f"job-{uuid.uuid4().hex}",
             workspace_id=request.workspace_id,
             status=JobStatus.QUEUED,
             created_at=datetime.utcnow(),
             error_message=None,
             report_url=None
         )
+        await job_store.create_job(job, tenant_id=user_info['tenant_id'])
+
+        try:
+            audit_job_runner.submit(
+                AuditJobRequest(
+                    job_id=job.job_id,
+                    tenant_id=user_info['tenant_id'] or "unknown",
+                    workspace_id=request.workspace_id,
+                    subscription_id=request.subscription_id,
+                    resource_group=resource_group,
+                    workspace_name=workspace_name,
+                    days_lookback=request.days_lookback,
+                    incremental=request.incremental
+                )
+            )
+        except JobQueueFullException as e:
+            await job_store.update_status(job.job_id, JobStatus.FAILED, error_message=str(e))
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Audit queue is full, please retry later"
+            )
+
+        return job
 
     except HTTPException:
         raise
@@ -263,15 +323,17 @@ async def get_audit_status(
         user_info = extract_user_info(token)
         logger.info(f"[AUDIT] Status requested for job: {job_id}")
 
-        # Placeholder: In production, would query database
-        return AuditJobMetadata(
-            job_id=job_id,
-            workspace_id="placeholder-ws",
-            status=JobStatus.RUNNING,
-            created_at=datetime.utcnow(),
-            error_message=None,
-            report_url=None
-        )
+        job = await job_store.get_job(job_id, tenant_id=user_info['tenant_id'])
+        if job is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Audit job not found"
+            )
+
+        return job
+
+    except HTTPException:
+        raise
 
     except Exception as e:
         logger.error(f"[AUDIT] Status check failed: {str(e)}")
@@ -288,28 +350,90 @@ async def get_audit_status(
 )
 async def stream_audit_progress(
     job_id: str,
+    request: Request,
+    last_event_id: Optional[int] = Query(None, description="Resume after this event ID"),
     token: dict = Depends(validate_entra_token)
 ):
     """
     Stream audit progress via Server-Sent Events (SSE).
 
     Returns real-time updates as agent executes tools and completes steps.
+    Events come from the job's shared ring buffer on the event bus, so any
+    number of clients can watch the same job. Reconnecting clients resume
+    from the Last-Event-ID header (or ?last_event_id=). Comment frames are
+    sent as heartbeats while the agent is busy. Once the job finishes, a
+    final frame carries the job's actual status.
     """
+    user_info = extract_user_info(token)
+    job = await job_store.get_job(job_id, tenant_id=user_info['tenant_id'])
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Audit job not found"
+        )
+
+    resume_from = last_event_id
+    if resume_from is None:
+        header_value = request.headers.get("Last-Event-ID", "0")
+        resume_from = int(header_value) if header_value.isdigit() else 0
+
+    def status_frame(job_status: JobStatus) -> str:
+        payload = {"job_id": job_id, "status": job_status.value.title(), "progress_percent": 100}
+        return f"data: {json.dumps(payload)}\n\n"
+
+    def progress_frame(event_id: int, event: ToolExecutionEvent, job_status: str) -> str:
+        # NOTE: SSE data MUST be valid JSON (use json.dumps for proper formatting)
+        payload = {
+            "job_id": job_id,
+            **event.model_dump(mode="json"),
+            # Fields read by the progress page
+            "current_step": event.step_number,
+            "total_steps": TOTAL_AUDIT_STEPS,
+            "current_tool": event.tool_name,
+            "tool_description": event.details,
+            "status": job_status,
+            "progress_percent": round(event.step_number / TOTAL_AUDIT_STEPS * 100)
+        }
+        return f"id: {event_id}\ndata: {json.dumps(payload)}\n\n"
+
     async def event_generator():
         try:
-            logger.info(f"[AUDIT] SSE stream opened for job: {job_id}")
+            logger.info(f"[AUDIT] SSE stream opened for job: {job_id} (resume_from={resume_from})")
+
+            if job.status not in RUNNER_OWNED_STATES and not event_bus.has_stream(job_id):
+                # No runner will publish for this job (finished, interrupted by a
+                # restart, or waiting on approval) and its buffer is gone, so a
+                # subscription would only ever see heartbeats - report the state only
+                yield status_frame(job.status)
+                return
+
+            async for event_id, event in event_bus.subscribe(job_id, last_event_id=resume_from):
+                if await request.is_disconnected():
+                    break
+
+                if event is None:
+                    yield ": heartbeat\n\n"
+                    continue
 
-            # Placeholder: In production, would stream events from agent execution
-            # NOTE: SSE data MUST be valid JSON (use json.dumps for proper formatting)
-            yield f"data: {json.dumps({'job_id': job_id, 'current_step': 1, 'total_steps': 3, 'current_tool': 'list_tables', 'tool_description': 'Listing all tables in workspace', 'status': 'Running', 'progress_percent': 33})}\n\n"
-            yield f"data: {json.dumps({'job_id': job_id, 'current_step': 2, 'total_steps': 3, 'current_tool': 'get_ingestion_volume', 'tool_description': 'Calculating ingestion volumes', 'status': 'Running', 'progress_percent': 66})}\n\n"
-            yield f"data: {json.dumps({'job_id': job_id, 'current_step': 3, 'total_steps': 3, 'current_tool': 'list_analytics_rules', 'tool_description': 'Analyzing analytics rules', 'status': 'Completed', 'progress_percent': 100})}\n\n"
+                # A tool_failed event is not a failed job: optional steps fail
+                # and the audit carries on. Only the job runner's final status
+                # (sent once the stream closes) says how the job ended.
+                job_status = "Completed" if event.event_type == "step_complete" else "Running"
+                yield progress_frame(event_id, event, job_status)
+            else:
+                yield status_frame(event_bus.job_status(job_id) or job.status)
+
+            logger.info(f"[AUDIT] SSE stream closed for job: {job_id}")
 
         except Exception as e:
             logger.error(f"[AUDIT] SSE stream error: {str(e)}")
             yield f"data: {json.dumps({'error': str(e)})}\n\n"
 
-    return StreamingResponse(event_generator(), media_type="text/event-stream")
+    return StreamingResponse(
+        event_generator(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 
 @router.get(
@@ -320,156 +444,59 @@ async def stream_audit_progress(
 )
 async def get_report(
     job_id: str,
+    request: Request,
     token: dict = Depends(validate_entra_token)
 ):
-    """Get full audit report"""
+    """
+    Get full audit report.
+
+    Served from the report store with the content hash as ETag; a matching
+    If-None-Match returns 304 without downloading the report.
+    """
     try:
         user_info = extract_user_info(token)
         logger.info(f"[AUDIT] Report requested for job: {job_id}")
 
-        # Generate mock report for demo purposes
-        # In production, would fetch from Blob Storage
-        mock_report = Report(
-            job_id=job_id,
-            workspace_id="/subscriptions/b8f99f9f-c121-422b-a657-c999df2c5296/resourceGroups/rg-jayesh/providers/Microsoft.OperationalInsights/workspaces/PCS-Sentinel-Demo",
-            workspace_name="PCS-Sentinel-Demo",
-            timestamp=datetime.now(),
-            summary=ReportSummary(
-                total_tables_analyzed=120,
-                total_ingestion_gb_per_month=450.0,
-                total_monthly_cost_hot=15000.0,
-                total_monthly_cost_archive=1500.0,
-                total_monthly_savings=13500.0,
-                total_annual_savings=162000.0,
-                tables_by_tier={"Hot": 85, "Basic": 25, "Archive": 10},
-                tables_by_confidence={"HIGH": 45, "MEDIUM": 55, "LOW": 20}
-            ),
-            archive_candidates=[
-                TableRecommendation(
-                    table_name="OldSecurityEvent",
-                    current_tier=TierType.HOT,
-                    ingestion_gb_per_day=0.1,
-                    ingestion_gb_per_month=3.0,
-                    rule_coverage_count=0,
-                    rule_names=[],
-                    confidence=ConfidenceLevel.HIGH,
-                    parsing_confidence=1.0,
-                    monthly_cost_hot=100.0,
-                    monthly_cost_archive=10.0,
-                    monthly_savings=90.0,
-                    annual_savings=1080.0,
-                    notes="No analytics rules reference this table"
-                ),
-                TableRecommendation(
-                    table_name="UnusedEvents",
-                    current_tier=TierType.HOT,
-                    ingestion_gb_per_day=0.05,
-                    ingestion_gb_per_month=1.5,
-                    rule_coverage_count=0,
-                    rule_names=[],
-                    confidence=ConfidenceLevel.HIGH,
-                    parsing_confidence=1.0,
-                    monthly_cost_hot=50.0,
-                    monthly_cost_archive=5.0,
-                    monthly_savings=45.0,
-                    annual_savings=540.0,
-                    notes="Ingestion stopped 60 days ago"
-                )
-            ],
-            low_usage_candidates=[
-                TableRecommendation(
-                    table_name="RareAuditLog",
-                    current_tier=TierType.HOT,
-                    ingestion_gb_per_day=0.02,
-                    ingestion_gb_per_month=0.6,
-                    rule_coverage_count=1,
-                    rule_names=["Rare Compliance Check"],
-                    confidence=ConfidenceLevel.MEDIUM,
-                    parsing_confidence=0.85,
-                    monthly_cost_hot=20.0,
-                    monthly_cost_archive=2.0,
-                    monthly_savings=18.0,
-                    annual_savings=216.0,
-                    notes="Only 1 low-priority rule references this"
-                )
-            ],
-            active_tables=[
-                TableRecommendation(
-                    table_name="SecurityEvent",
-                    current_tier=TierType.HOT,
-                    ingestion_gb_per_day=5.0,
-                    ingestion_gb_per_month=150.0,
-                    rule_coverage_count=45,
-                    rule_names=["Detection Rule 1", "Detection Rule 2", "Detection Rule 3"],
-                    confidence=ConfidenceLevel.HIGH,
-                    parsing_confidence=1.0,
-                    monthly_cost_hot=5000.0,
-                    monthly_cost_archive=500.0,
-                    monthly_savings=4500.0,
-                    annual_savings=54000.0,
-                    notes="Critical table - 45 active detection rules depend on this"
-                ),
-                TableRecommendation(
-                    table_name="SigninLogs",
-                    current_tier=TierType.HOT,
-                    ingestion_gb_per_day=2.0,
-                    ingestion_gb_per_month=60.0,
-                    rule_coverage_count=12,
-                    rule_names=["Suspicious Signin Rule 1", "Suspicious Signin Rule 2"],
-                    confidence=ConfidenceLevel.HIGH,
-                    parsing_confidence=1.0,
-                    monthly_cost_hot=2000.0,
-                    monthly_cost_archive=200.0,
-                    monthly_savings=1800.0,
-                    annual_savings=21600.0,
-                    notes="Used in 12 detection rules and 3 workbooks"
-                )
-            ],
-            connector_coverage=[
-                ConnectorCoverageItem(
-                    connector_name="Azure Security Center",
-                    connector_type="Scheduled Query",
-                    tables_fed=["SecurityEvent", "SecurityAlert"],
-                    tables_with_coverage=2,
-                    tables_without_coverage=0
-                ),
-                ConnectorCoverageItem(
-                    connector_name="Azure Activity",
-                    connector_type="Data Connector",
-                    tables_fed=["AzureActivity"],
-                    tables_with_coverage=1,
-                    tables_without_coverage=0
-                )
-            ],
-            warnings=[
-                ReportWarning(
-                    warning_type="LOW_CONFIDENCE",
-                    table_name="ComplexKQLTable",
-                    description="KQL parsing had low confidence for rules using this table",
-                    recommendation="Manually review the 3 rules referencing this table"
-                ),
-                ReportWarning(
-                    warning_type="EXTERNAL_DEPENDENCY",
-                    table_name="CustomTable",
-                    description="This table feeds an external reporting system",
-                    recommendation="Consult with reporting team before archiving"
-                )
-            ],
-            metadata=ExecutionMetadata(
-                agent_run_timestamp=datetime.now(),
-                agent_completion_time_seconds=45.3,
-                kql_parsing_success_rate=0.92,
-                tables_analyzed=120,
-                rules_analyzed=156,
-                workbooks_analyzed=23,
-                hunt_queries_analyzed=45,
-                agent_tokens_used=8500,
-                agent_tokens_limit=50000
+        job = await job_store.get_job(job_id, tenant_id=user_info['tenant_id'])
+        if job is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Audit job not found"
+            )
+
+        cache_headers = {"Cache-Control": "private, no-cache", "Vary": "Accept-Encoding"}
+
+        etag = await report_store.get_etag(job_id)
+        if etag is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Report not available for this job"
             )
-        )
 
-        logger.info(f"[AUDIT] Report generated successfully for job: {job_id}")
-        return mock_report
+        if _etag_matches(request.headers.get("if-none-match"), etag):
+            logger.info(f"[AUDIT] Report not modified for job: {job_id}")
+            return Response(
+                status_code=status.HTTP_304_NOT_MODIFIED,
+                headers={"ETag": etag, **cache_headers}
+            )
+
+        stored = await report_store.get(job_id)
+        if stored is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Report not available for this job"
+            )
+
+        # Serve the stored gzip bytes directly when the client accepts them
+        headers = {"ETag": stored.etag, **cache_headers}
+        if "gzip" in request.headers.get("accept-encoding", ""):
+            body = stored.compressed
+            headers["Content-Encoding"] = "gzip"
+        else:
+            body = stored.json_bytes()
+
+        logger.info(f"[AUDIT] Report served for job: {job_id}")
+        return Response(content=body, media_type="application/json", headers=headers)
 
     except HTTPException:
         raise
@@ -482,6 +509,55 @@ async def get_report(
         )
 
 
+@router.post(
+    "/audits/{job_id}/what-if",
+    response_model=WhatIfResult,
+    summary="Simulate tier changes",
+    description="Recalculate workspace cost totals with tables moved between Hot/Basic/Archive"
+)
+async def simulate_tier_changes(
+    job_id: str,
+    request: WhatIfRequest,
+    token: dict = Depends(validate_entra_token)
+):
+    """Apply simulated tier changes to a completed audit (nothing is migrated)"""
+    try:
+        user_info = extract_user_info(token)
+        logger.info(f"[AUDIT] What-if requested for job: {job_id} ({len(request.changes)} changes)")
+
+        job = await job_store.get_job(job_id, tenant_id=user_info['tenant_id'])
+        if job is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Audit job not found"
+            )
+
+        model = await what_if_service.get_model(job_id)
+        if model is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Report not available for this job"
+            )
+
+        return model.simulate(request.changes)
+
+    except HTTPException:
+        raise
+
+    except UnknownTableException as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+    except Exception as e:
+        logger.error(f"[AUDIT] What-if simulation failed: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to simulate tier changes"
+        )
+
+
 # ===== APPROVAL GATE (HARD SEPARATION) =====
 @router.post(
     "/audits/{job_id}/approve",
@@ -548,20 +624,29 @@ async def approve_migration(
     "/audits",
     response_model=List[AuditJobMetadata],
     summary="List all audit jobs",
-    description="Retrieve history of audit jobs with pagination"
+    description=(
+        "Retrieve history of audit jobs, newest first. Page with `before` (the job_id "
+        "of the last job on the previous page); offset paging is not supported because "
+        "it is O(offset) on both job store backends."
+    )
 )
 async def list_audits(
-    skip: int = 0,
-    limit: int = 50,
+    limit: int = Query(50, ge=1, le=500),
+    workspace_id: Optional[str] = None,
+    before: Optional[str] = Query(None, description="Keyset cursor: job_id of the last item seen"),
     token: dict = Depends(validate_entra_token)
 ):
-    """List all audit jobs (paginated)"""
+    """List audit jobs, newest first (paginated)"""
     try:
         user_info = extract_user_info(token)
         logger.info(f"[AUDIT] Audit history requested")
 
-        # Placeholder: In production, would query database with pagination
-        return []
+        return await job_store.list_jobs(
+            limit=limit,
+            tenant_id=user_info['tenant_id'],
+            workspace_id=workspace_id,
+            before=before
+        )
 
     except Exception as e:
         logger.error(f"[AUDIT] Audit list failed: {str(e)}")
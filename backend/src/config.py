@@ -13,7 +13,8 @@ from azure.identity import (
     DefaultAzureCredential,
     ClientSecretCredential
 )
-from typing import Optional
+from azure.identity import aio as identity_aio
+from typing import List, Optional
 import logging
 
 logger = logging.getLogger(__name__)
@@ -50,6 +51,59 @@ class Settings(BaseSettings):
     AZURE_CLIENT_ID: Optional[str] = None  # Service principal client ID
     AZURE_CLIENT_SECRET: Optional[str] = None  # Service principal secret
 
+    # ===== STORAGE (account name is not a secret; access is via Managed Identity) =====
+    AZURE_STORAGE_ACCOUNT_NAME: Optional[str] = None
+
+    # ===== AUDIT JOB STORE (safe) =====
+    JOB_STORE_BACKEND: str = "sqlite"  # sqlite, table (Azure Table Storage)
+    JOB_STORE_SQLITE_PATH: str = "data/jobs.db"
+    JOB_LEASE_SECONDS: int = 120  # Unrenewed for this long, a queued/running job is orphaned
+
+    # ===== PRICING (safe) =====
+    PRICING_REGION: str = "eastus"  # Fallback when a workspace's region is unknown
+    PRICING_CURRENCY: str = "USD"  # Billing currency for cost calculations
+    PRICING_REGIONS: List[str] = []  # Regions to fetch prices for (empty = all)
+    PRICING_CURRENCIES: List[str] = ["USD"]  # Currencies to fetch prices for
+    PRICING_CACHE_TTL_SECONDS: int = 86400  # Refresh retail prices daily
+    PRICING_SNAPSHOT_PATH: str = "data/pricing_snapshot.json"
+    PRICING_OFFLINE: bool = False  # Air-gapped: never call the Retail Prices API
+    PRICING_FETCH_TIMEOUT_SECONDS: int = 30
+
+    # ===== INGESTION CACHE (safe) =====
+    # Per-workspace daily ingestion ("" = memory only)
+    INGESTION_CACHE_PATH: str = "data/ingestion_cache"
+    INGESTION_CACHE_SETTLE_DAYS: int = 2  # Recent days re-queried every audit (late Usage records)
+
+    # ===== KQL PARSING (safe) =====
+    KQL_PARSE_WORKERS: int = 0  # Worker processes for large batches (0 = one per CPU, 1 = serial)
+    KQL_PARSE_PARALLEL_THRESHOLD: int = 500  # Uncached queries below which parsing stays serial
+    KQL_PARSE_CHUNK_SIZE: int = 200  # Queries per worker task
+    KQL_PARSE_CACHE_MAX_ENTRIES: int = 10000  # Parse results kept in memory
+    KQL_PARSE_CACHE_PATH: str = "data/kql_parse_cache.db"  # Survives restarts ("" = memory only)
+
+    # ===== INCREMENTAL AUDIT (safe) =====
+    # Per-workspace parse results of the last audit ("" = memory only)
+    RULE_SNAPSHOT_PATH: str = "data/rule_snapshots"
+
+    # ===== QUERY LOG USAGE (safe) =====
+    # Count LAQueryLogs queries as table usage (needs query auditing)
+    QUERY_USAGE_ENABLED: bool = True
+    QUERY_USAGE_ACTIVE_DAYS: int = 7  # Tables queried on at least this many days stay Hot
+    QUERY_USAGE_MAX_QUERIES: int = 2000  # Most-run distinct queries parsed per audit
+
+    # ===== SAVINGS FORECAST (safe) =====
+    FORECAST_HORIZON_DAYS: int = 90  # Next quarter
+    FORECAST_SIMULATIONS: int = 5000  # Monte Carlo paths per table
+    FORECAST_BATCH_TABLES: int = 1000  # Tables simulated per NumPy batch (bounds memory)
+    FORECAST_HISTORY_DAYS: int = 30  # Daily ingestion history the model is fitted on
+    FORECAST_SEED: Optional[int] = None  # Fixed seed for reproducible forecasts
+
+    # ===== REPORT STORE (safe) =====
+    REPORT_STORE_BACKEND: str = "filesystem"  # filesystem, blob (Azure Blob Storage)
+    REPORT_STORE_PATH: str = "data/reports"
+    REPORT_STORE_CONTAINER: str = "reports"
+    REPORT_CACHE_MAX_ENTRIES: int = 32  # Recently served reports kept in memory
+
     # ===== FRONTEND/EXTERNAL URLS =====
     FRONTEND_URL: str = "http://localhost:3000"
     API_BASE_URL: str = "http://localhost:8000"
@@ -61,9 +115,25 @@ class Settings(BaseSettings):
 
     # ===== TOKEN BUDGETS & LIMITS (safe) =====
     AGENT_MAX_TOKENS_PER_RUN: int = 50000
-    AGENT_TIMEOUT_SECONDS: int = 600
+    AGENT_TIMEOUT_SECONDS: int = 600  # Deadline for a whole audit run
+    AGENT_TOOL_TIMEOUT_SECONDS: int = 300  # Default deadline for a single tool call
+    AGENT_TOOL_TIMEOUTS: dict = {}  # Per-tool overrides, e.g. {"parse_kql_tables": 120}
+    AGENT_CPU_WORKERS: int = 4  # Bounded pool for CPU-bound tools (KQL parsing, reports)
+
+    # ===== AUDIT WORKER POOL (safe) =====
+    AUDIT_WORKER_COUNT: int = 4  # Audits that may run at once on one replica
+    AUDIT_QUEUE_MAX_SIZE: int = 100  # Jobs waiting to start before new submissions are rejected
+    AUDIT_MAX_CONCURRENT_PER_TENANT: int = 2  # Running audits allowed per Entra tenant
+
+    # ===== PROGRESS STREAMING (safe) =====
+    EVENT_BUS_MAX_EVENTS_PER_JOB: int = 500  # Ring buffer size per job
+    EVENT_BUS_RETENTION_SECONDS: int = 900  # Keep finished jobs' events for late subscribers
+    SSE_HEARTBEAT_SECONDS: int = 15
     API_RATE_LIMIT_PER_MINUTE: int = 100
 
+    # ===== AZURE HTTP TRANSPORT (safe) =====
+    AZURE_HTTP_POOL_SIZE: int = 50  # Max open connections in the shared aiohttp session
+
     # ===== APPROVAL & ACCESS CONTROL =====
     APPROVAL_GROUP_ID: Optional[str] = None
     REQUIRED_ROLES_FOR_AUDIT: list = ["Microsoft.Authorization/roleAssignments/read"]
@@ -112,6 +182,32 @@ class Settings(BaseSettings):
         logger.warning("[AUDIT] Using DefaultAzureCredential (dev fallback) - consider setting AZURE_CLIENT_ID and AZURE_CLIENT_SECRET")
         return DefaultAzureCredential()
 
+    @property
+    def async_credential(self):
+        """
+        Get async authentication credential for the azure.*.aio clients.
+
+        Same priority order as `credential`. The caller owns the returned
+        credential and must close it.
+        """
+        if self.AZURE_CLIENT_ID and self.AZURE_CLIENT_SECRET:
+            logger.info("[AUDIT] Using Service Principal credential (async ClientSecretCredential)")
+            return identity_aio.ClientSecretCredential(
+                tenant_id=self.AZURE_TENANT_ID,
+                client_id=self.AZURE_CLIENT_ID,
+                client_secret=self.AZURE_CLIENT_SECRET
+            )
+
+        if self.ENVIRONMENT == "prod":
+            logger.info("[AUDIT] Using Managed Identity credential (async, production)")
+            return identity_aio.ManagedIdentityCredential()
+
+        logger.warning(
+            "[AUDIT] Using async DefaultAzureCredential (dev fallback) - "
+            "consider setting AZURE_CLIENT_ID and AZURE_CLIENT_SECRET"
+        )
+        return identity_aio.DefaultAzureCredential()
+
     @property
     def kv_client(self) -> SecretClient:
         """
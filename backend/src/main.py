@@ -13,6 +13,14 @@ from fastapi.exceptions import RequestValidationError
 
 from src.config import settings
 from src.api.routes import router
+from src.services.azure_api import azure_api_service
+from src.agents.tool_executor import tool_executor
+from src.agents.job_runner import audit_job_runner
+from src.services.job_store import job_store
+from src.services.report_store import report_store
+from src.services.pricing import pricing_service
+from src.services.event_bus import event_bus
+from src.services.kql_parser import kql_parser
 from src.utils.logging import setup_logging
 
 # Setup logging
@@ -100,12 +108,28 @@ async def startup_event():
     logger.info(f"[STARTUP] Environment: {settings.ENVIRONMENT}")
     logger.info(f"[STARTUP] Frontend URL: {settings.FRONTEND_URL}")
     logger.info(f"[STARTUP] Key Vault: {settings.AZURE_KEY_VAULT_URL}")
+    await pricing_service.start()
+    # Jobs whose owner stopped renewing their lease will never finish; end them
+    # (now and periodically) so clients do not wait on them forever
+    await job_store.start()
+    # Save the report before the job is marked COMPLETED
+    audit_job_runner.add_listener(report_store.on_job_status)
+    audit_job_runner.add_listener(job_store.on_job_status)
+    audit_job_runner.add_listener(event_bus.on_job_status)
+    await audit_job_runner.start()
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Cleanup on shutdown"""
     logger.info("[SHUTDOWN] SentinelLens backend shutting down")
+    await audit_job_runner.stop()
+    await pricing_service.stop()
+    tool_executor.shutdown()
+    kql_parser.shutdown()
+    await job_store.close()
+    await report_store.close()
+    await azure_api_service.close()
 
 
 # ===== ROUTES =====
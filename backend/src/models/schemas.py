@@ -6,7 +6,7 @@ This prevents insecure output handling and ensures type safety.
 """
 
 from pydantic import BaseModel, Field, HttpUrl, validator
-from typing import List, Optional, Literal
+from typing import Dict, List, Optional, Literal
 from datetime import datetime
 from enum import Enum
 
@@ -44,13 +44,17 @@ class StartAuditRequest(BaseModel):
     workspace_id: str = Field(..., min_length=1, description="Sentinel workspace ID")
     subscription_id: str = Field(..., min_length=1, description="Azure subscription ID")
     days_lookback: int = Field(default=30, ge=1, le=365, description="Days of history to analyze")
+    incremental: bool = Field(
+        default=True, description="Only re-parse rules changed since the last audit"
+    )
 
     class Config:
         schema_extra = {
             "example": {
                 "workspace_id": "workspace-123",
                 "subscription_id": "sub-456",
-                "days_lookback": 30
+                "days_lookback": 30,
+                "incremental": True
             }
         }
 
@@ -67,6 +71,18 @@ class ApprovalRequest(BaseModel):
         }
 
 
+class WhatIfRequest(BaseModel):
+    """Tier changes to simulate on top of a completed audit"""
+    changes: Dict[str, TierType] = Field(..., description="Table name -> simulated tier")
+
+    class Config:
+        schema_extra = {
+            "example": {
+                "changes": {"UnusedTable1": "Archive", "VerboseTable": "Basic"}
+            }
+        }
+
+
 class SetupCredentialsRequest(BaseModel):
     """Setup app registration credentials"""
     client_id: str = Field(..., min_length=1, description="Azure AD app registration client ID")
@@ -102,9 +118,12 @@ class AuditJobMetadata(BaseModel):
     report_url: Optional[str] = None
 
 
+ToolEventType = Literal["tool_called", "tool_completed", "tool_failed", "step_complete"]
+
+
 class ToolExecutionEvent(BaseModel):
     """Real-time SSE event for agent progress"""
-    event_type: Literal["tool_called", "tool_completed", "tool_failed", "step_complete"]
+    event_type: ToolEventType
     step_number: int
     tool_name: Optional[str] = None
     details: str
@@ -136,6 +155,10 @@ class TableRecommendation(BaseModel):
     ingestion_gb_per_month: float = Field(..., ge=0)
     rule_coverage_count: int = Field(..., ge=0)
     rule_names: List[str] = []
+    workbook_count: int = Field(default=0, ge=0)  # Workbooks querying the table
+    hunt_query_count: int = Field(default=0, ge=0)  # Hunt queries reading the table
+    query_count: int = Field(default=0, ge=0)  # LAQueryLogs queries reading the table
+    query_days: int = Field(default=0, ge=0)  # Days in the lookback it was queried on
     confidence: ConfidenceLevel
     parsing_confidence: float = Field(..., ge=0, le=1)
     monthly_cost_hot: float = Field(..., ge=0)
@@ -164,6 +187,17 @@ class TableRecommendation(BaseModel):
         }
 
 
+ArtifactKind = Literal["rule", "workbook", "hunt_query"]
+
+
+class UsagePosting(BaseModel):
+    """Rule, workbook or hunt query that reads a table"""
+    artifact_id: str
+    artifact_name: str
+    kind: ArtifactKind
+    parsing_confidence: float = Field(..., ge=0, le=1)
+
+
 class ConnectorCoverageItem(BaseModel):
     """Connector to table mapping"""
     connector_name: str
@@ -181,6 +215,14 @@ class ReportWarning(BaseModel):
     recommendation: str
 
 
+class WorkspacePricingProfile(BaseModel):
+    """Region and pricing tier of a workspace (selects its price rates)"""
+    region: str
+    currency: str = "USD"
+    sku: str = "PerGB2018"
+    commitment_gb_per_day: int = 0  # 0 = pay-as-you-go
+
+
 class ExecutionMetadata(BaseModel):
     """Metadata about report generation"""
     agent_run_timestamp: datetime
@@ -192,6 +234,36 @@ class ExecutionMetadata(BaseModel):
     hunt_queries_analyzed: int
     agent_tokens_used: int
     agent_tokens_limit: int
+    pricing_profile: Optional[WorkspacePricingProfile] = None  # Rates the costs were computed with
+    tier_rates: Dict[str, float] = {}  # Tier -> price per GB used by this audit
+    kql_parse_cache_hits: int = 0  # Queries served by the parse cache
+    kql_parse_cache_misses: int = 0  # Queries parsed from scratch
+    rules_reparsed: Optional[int] = None  # Rules parsed this audit (incremental: changed ones)
+    query_log_tables: int = 0  # Tables with LAQueryLogs activity (0 if query logs are unavailable)
+
+
+class CommitmentPlan(BaseModel):
+    """Cheapest workspace pricing plan found by the commitment-tier optimizer"""
+    commitment_gb_per_day: int  # 0 = pay-as-you-go
+    current_commitment_gb_per_day: int = 0
+    analytics_gb_per_day: float  # Analytics (Hot) ingestion left after the moves
+    tables_to_basic: List[str] = []
+    tables_to_archive: List[str] = []
+    current_monthly_cost: float
+    optimized_monthly_cost: float
+    monthly_savings: float
+    plans_evaluated: int
+
+
+class SavingsForecast(BaseModel):
+    """Monte Carlo forecast of savings from the recommended tier moves"""
+    horizon_days: int
+    simulations: int
+    tables_forecast: int  # Tables with a recommended move and daily history
+    history_days: int
+    p10_savings: float  # Savings over the horizon, 10th percentile
+    p50_savings: float
+    p90_savings: float
 
 
 class ReportSummary(BaseModel):
@@ -224,9 +296,16 @@ class Report(BaseModel):
     # Coverage analysis
     connector_coverage: List[ConnectorCoverageItem] = []
 
+    # Drill-down: table -> every artifact that reads it
+    usage_index: Dict[str, List[UsagePosting]] = {}
+
     # Warnings
     warnings: List[ReportWarning] = []
 
+    # Workspace-level pricing recommendation
+    commitment_plan: Optional[CommitmentPlan] = None
+    savings_forecast: Optional[SavingsForecast] = None
+
     # Execution details
     metadata: ExecutionMetadata
 
@@ -241,6 +320,17 @@ class Report(BaseModel):
         }
 
 
+class WhatIfResult(BaseModel):
+    """Workspace totals with simulated tier changes applied"""
+    job_id: str
+    changed_tables: int
+    baseline_monthly_cost: float  # All tables on their current tier
+    scenario_monthly_cost: float
+    monthly_savings: float
+    annual_savings: float
+    tables_by_tier: dict  # Scenario tier counts, e.g. {"Hot": 48, "Basic": 5, "Archive": 4}
+
+
 class HealthResponse(BaseModel):
     """Health check response"""
     status: str = "healthy"
@@ -267,13 +357,57 @@ class ErrorResponse(BaseModel):
 
 
 # ===== INTERNAL SCHEMAS (not exposed in API) =====
+class KqlTableReference(BaseModel):
+    """Table read by a KQL query, with its character offsets in the query"""
+    table_name: str
+    start: int
+    end: int
+    qualifier: Optional[str] = None  # e.g. workspace("prod") for cross-resource queries
+    wildcard: bool = False  # e.g. union Sec* - matches several tables
+    function_call: bool = False  # e.g. _Im_Dns(...) - a function, not a table
+
+
 class KqlParseResult(BaseModel):
     """Result of KQL parsing"""
     tables: List[str]
     confidence: ConfidenceLevel
-    parsing_method: Literal["AST", "REGEX"]
+    parsing_method: Literal["AST", "REGEX", "CATALOG"]
     success: bool
     error_message: Optional[str] = None
+    table_references: List[KqlTableReference] = []  # Positions (AST and CATALOG only)
+    unresolved_sources: List[str] = []  # Function calls and wildcards to expand (AST only)
+    from_cache: bool = False  # Served by the parse cache
+
+    @property
+    def parsing_confidence(self) -> float:
+        """Numeric confidence score (0-1) for the extracted tables"""
+        if not self.success:
+            return 0.0
+        return {
+            ConfidenceLevel.HIGH: 1.0,
+            ConfidenceLevel.MEDIUM: 0.7,
+            ConfidenceLevel.LOW: 0.4
+        }[self.confidence]
+
+
+class RuleSnapshotEntry(BaseModel):
+    """Parse result of one analytics rule, as of the last audit"""
+    rule_id: str
+    etag: Optional[str] = None
+    query_hash: str  # SHA-256 of the (masked) query text
+    result: KqlParseResult
+
+
+class AuditJobRequest(BaseModel):
+    """Audit job queued for the worker pool"""
+    job_id: str
+    tenant_id: str
+    workspace_id: str
+    subscription_id: str
+    resource_group: str
+    workspace_name: str
+    days_lookback: int = 30
+    incremental: bool = True
 
 
 class TableIngestionData(BaseModel):
@@ -292,6 +426,7 @@ class AnalyticsRule(BaseModel):
     rule_type: str  # Scheduled, NRT, etc
     kql_query: str
     enabled: bool
+    etag: Optional[str] = None  # ARM etag, changes on every edit
     tables_referenced: List[str] = []
     parsing_confidence: float = 0.0
 
@@ -302,6 +437,7 @@ class Workbook(BaseModel):
     workbook_name: str
     kql_queries: List[str] = []
     tables_referenced: List[str] = []
+    parsing_confidence: float = 0.0  # Lowest across its parsed queries
 
 
 class HuntQuery(BaseModel):
@@ -310,6 +446,14 @@ class HuntQuery(BaseModel):
     query_name: str
     kql_query: str
     tables_referenced: List[str] = []
+    parsing_confidence: float = 0.0
+
+
+class WorkspaceFunction(BaseModel):
+    """Saved workspace function (a saved search with a function alias)"""
+    function_alias: str
+    query: str
+    function_parameters: Optional[str] = None  # e.g. "starttime:datetime=ago(1d)"
 
 
 class DataConnector(BaseModel):
@@ -4,22 +4,31 @@ Azure API Service Layer
 Wraps all Azure SDK calls for Sentinel, Log Analytics, and Monitor APIs.
 All methods use Managed Identity for authentication.
 All API calls are logged (metadata only, never data contents).
+
+Uses the azure.*.aio SDK clients over a single shared aiohttp session,
+so Azure round-trips never block the FastAPI event loop.
 """
 
-from azure.identity import ManagedIdentityCredential, DefaultAzureCredential
-from azure.mgmt.securityinsight import SecurityInsights
-from azure.mgmt.loganalytics import LogAnalyticsManagementClient
-from azure.monitor.query import LogsQueryClient
+from azure.mgmt.securityinsight.aio import SecurityInsights
+from azure.mgmt.loganalytics.aio import LogAnalyticsManagementClient
+from azure.monitor.query.aio import LogsQueryClient
+from azure.core.pipeline.transport import AioHttpTransport
 from azure.core.exceptions import AzureError
+import aiohttp
 import logging
+from collections import defaultdict
 from typing import List, Dict, Optional, Tuple
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta, timezone
 import asyncio
+import numpy as np
 
 from src.config import settings
 from src.models.schemas import (
-    AnalyticsRule, Workbook, HuntQuery, DataConnector, TableIngestionData, TierType
+    AnalyticsRule, Workbook, HuntQuery, DataConnector, TableIngestionData, TierType,
+    WorkspaceFunction, WorkspacePricingProfile
 )
+from src.services.ingestion_cache import ingestion_cache
+from src.services.usage_index import QueryLogAggregate
 
 logger = logging.getLogger(__name__)
 
@@ -28,23 +37,76 @@ class AzureApiService:
     """Service for all Azure API interactions"""
 
     def __init__(self):
-        """Initialize Azure clients"""
-        # Get credential (Managed Identity in prod, DefaultAzureCredential in dev)
-        self.credential = settings.credential
-
-        # Initialize clients
-        self.sentinel_client = SecurityInsights(
-            credential=self.credential,
-            subscription_id=settings.AZURE_SUBSCRIPTION_ID
-        )
-        self.log_analytics_client = LogAnalyticsManagementClient(
-            credential=self.credential,
-            subscription_id=settings.AZURE_SUBSCRIPTION_ID
-        )
-        self.logs_query_client = LogsQueryClient(credential=self.credential)
+        """
+        Initialize Azure API service.
+
+        Clients are created lazily on first use because the shared aiohttp
+        session must be bound to the running event loop.
+        """
+        self.credential = None
+        self.sentinel_client = None
+        self.log_analytics_client = None
+        self.logs_query_client = None
+
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._init_lock = asyncio.Lock()
 
         logger.info("[AUDIT] Azure API service initialized")
 
+    def _transport(self) -> AioHttpTransport:
+        """Create a transport that reuses the shared aiohttp session"""
+        return AioHttpTransport(session=self._session, session_owner=False)
+
+    async def _ensure_clients(self):
+        """Create the async credential, shared session and SDK clients once"""
+        if self._session is not None and not self._session.closed:
+            return
+
+        async with self._init_lock:
+            if self._session is not None and not self._session.closed:
+                return
+
+            # Get credential (Managed Identity in prod, DefaultAzureCredential in dev)
+            self.credential = settings.async_credential
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=settings.AZURE_HTTP_POOL_SIZE)
+            )
+
+            # Initialize clients (all share one connection pool)
+            self.sentinel_client = SecurityInsights(
+                credential=self.credential,
+                subscription_id=settings.AZURE_SUBSCRIPTION_ID,
+                transport=self._transport()
+            )
+            self.log_analytics_client = LogAnalyticsManagementClient(
+                credential=self.credential,
+                subscription_id=settings.AZURE_SUBSCRIPTION_ID,
+                transport=self._transport()
+            )
+            self.logs_query_client = LogsQueryClient(
+                credential=self.credential,
+                transport=self._transport()
+            )
+
+            logger.info("[AUDIT] Azure async clients created (shared aiohttp session)")
+
+    async def close(self):
+        """Close SDK clients, the shared session and the credential"""
+        if self._session is None:
+            return
+
+        for client in (self.sentinel_client, self.log_analytics_client, self.logs_query_client):
+            try:
+                await client.close()
+            except Exception as e:
+                logger.debug(f"[AUDIT] Failed to close client: {str(e)}")
+
+        await self._session.close()
+        await self.credential.close()
+        self._session = None
+
+        logger.info("[AUDIT] Azure API service closed")
+
     async def list_workspaces(self) -> List[Dict[str, str]]:
         """
         List all Log Analytics workspaces in the subscription.
@@ -53,27 +115,29 @@ class AzureApiService:
             List of workspaces with name and ID
         """
         try:
+            await self._ensure_clients()
             logger.info(f"[AUDIT] Listing workspaces in subscription: {settings.AZURE_SUBSCRIPTION_ID}")
             logger.debug(f"[AUDIT] Using credential type: {type(self.credential).__name__}")
 
             workspaces = []
 
             # Use Resource Management Client to list workspaces
-            from azure.mgmt.resource import ResourceManagementClient
+            from azure.mgmt.resource.aio import ResourceManagementClient
             resource_client = ResourceManagementClient(
                 credential=self.credential,
-                subscription_id=settings.AZURE_SUBSCRIPTION_ID
+                subscription_id=settings.AZURE_SUBSCRIPTION_ID,
+                transport=self._transport()
             )
 
             logger.debug("[AUDIT] ResourceManagementClient created, listing workspaces...")
 
             # List all Log Analytics workspaces by resource type
-            workspaces_list = resource_client.resources.list(
-                filter="resourceType eq 'Microsoft.OperationalInsights/workspaces'"
-            )
-
-            # Convert generator to list to trigger the actual API call
-            workspaces_list = list(workspaces_list)
+            async with resource_client:
+                workspaces_list = [
+                    resource async for resource in resource_client.resources.list(
+                        filter="resourceType eq 'Microsoft.OperationalInsights/workspaces'"
+                    )
+                ]
             logger.debug(f"[AUDIT] Resource list API returned {len(workspaces_list)} items")
 
             for resource in workspaces_list:
@@ -104,6 +168,7 @@ class AzureApiService:
             List of tables with metadata
         """
         try:
+            await self._ensure_clients()
             logger.info(f"[AUDIT] Fetching tables for workspace: {workspace_name}")
 
             # Get all tables from Log Analytics
@@ -117,7 +182,7 @@ class AzureApiService:
             )
 
             table_count = 0
-            for table in tables_list:
+            async for table in tables_list:
                 try:
                     # Parse table properties
                     tier = self._get_table_tier(table)
@@ -152,7 +217,10 @@ class AzureApiService:
         days_lookback: int = 30
     ) -> Dict[str, float]:
         """
-        Query Usage table to get ingestion volume per table (GB/day).
+        Average ingestion volume per table (GB/day) over the last complete days.
+
+        Computed locally from the cached daily series; only days missing
+        from the cache are queried.
 
         Returns:
             Dictionary mapping table_name -> gb_per_day
@@ -162,38 +230,217 @@ class AzureApiService:
                 f"[AUDIT] Fetching ingestion volume for {days_lookback} days"
             )
 
-            # KQL query to get ingestion per table
+            _, table_names, gb = await self._get_daily_series(
+                resource_group, workspace_name, days_lookback
+            )
+            averages = gb.sum(axis=1) / days_lookback
+            ingestion_data = dict(zip(table_names, averages.tolist()))
+
+            logger.info(f"[AUDIT] Ingestion data fetched for {len(ingestion_data)} tables")
+            return ingestion_data
+
+        except Exception as e:
+            logger.error(f"[AUDIT] Failed to get ingestion volume: {str(e)}")
+            raise
+
+    async def get_daily_ingestion(
+        self,
+        resource_group: str,
+        workspace_name: str,
+        days_lookback: int = 30
+    ) -> List[Tuple[date, str, float]]:
+        """
+        Per-day ingestion per table over the last complete days.
+
+        Returns:
+            List of (day, table_name, gb) rows
+        """
+        try:
+            logger.info(
+                f"[AUDIT] Fetching daily ingestion for {days_lookback} days"
+            )
+
+            days, table_names, gb = await self._get_daily_series(
+                resource_group, workspace_name, days_lookback
+            )
+            table_index, day_index = gb.nonzero()
+            rows = [
+                (days[d], table_names[t], float(gb[t, d]))
+                for t, d in zip(table_index.tolist(), day_index.tolist())
+            ]
+
+            logger.info(f"[AUDIT] Daily ingestion fetched: {len(rows)} table-days")
+            return rows
+
+        except Exception as e:
+            logger.error(f"[AUDIT] Failed to get daily ingestion: {str(e)}")
+            raise
+
+    async def _get_daily_series(
+        self,
+        resource_group: str,
+        workspace_name: str,
+        days_lookback: int
+    ) -> Tuple[List[date], List[str], np.ndarray]:
+        """
+        Daily ingestion matrix for the last `days_lookback` complete UTC days.
+
+        Cached days come from the local ingestion cache; the Usage table is
+        only queried from the oldest missing day onwards.
+
+        Returns:
+            (days, table names, (tables x days) GB matrix)
+        """
+        today = datetime.utcnow().date()
+        days = [today - timedelta(days=offset) for offset in range(days_lookback, 0, -1)]
+        key = ingestion_cache.workspace_key(
+            settings.AZURE_SUBSCRIPTION_ID, resource_group, workspace_name
+        )
+
+        async with ingestion_cache.lock(key):
+            series = await ingestion_cache.load(key)
+            missing = series.missing_days(days)
+
+            if missing:
+                queried_days = days[days.index(missing[0]):days.index(missing[-1]) + 1]
+                rows = await self._query_daily_usage(
+                    resource_group, workspace_name,
+                    queried_days[0], queried_days[-1] + timedelta(days=1)
+                )
+                series = await ingestion_cache.update(key, queried_days, rows)
+                logger.info(
+                    f"[AUDIT] Queried {len(queried_days)} days of Usage "
+                    f"({days_lookback - len(queried_days)} cached)"
+                )
+            else:
+                logger.info(f"[AUDIT] All {days_lookback} days served from ingestion cache")
+
+        table_names, gb = series.window(days)
+        return days, table_names, gb
+
+    async def _query_daily_usage(
+        self,
+        resource_group: str,
+        workspace_name: str,
+        start: date,
+        end: date
+    ) -> List[Tuple[date, str, float]]:
+        """
+        Query Usage table for GB per table per day in [start, end).
+
+        Returns:
+            List of (day, table_name, gb) rows
+        """
+        await self._ensure_clients()
+
+        kql_query = f"""
+        Usage
+        | where TimeGenerated >= datetime({start.isoformat()})
+            and TimeGenerated < datetime({end.isoformat()})
+        | where DataType != "Usage"
+        | summarize GB = sum(Quantity) / 1000 by Day = bin(TimeGenerated, 1d), DataType
+        | project Day, TableName=DataType, GB
+        """
+
+        workspace_id = (
+            f"/subscriptions/{settings.AZURE_SUBSCRIPTION_ID}/resourcegroups/{resource_group}"
+            f"/providers/microsoft.operationalinsights/workspaces/{workspace_name}"
+        )
+
+        response = await self.logs_query_client.query_workspace(
+            workspace_id=workspace_id,
+            query=kql_query,
+            timespan=(
+                datetime.combine(start, datetime.min.time(), tzinfo=timezone.utc),
+                datetime.combine(end, datetime.min.time(), tzinfo=timezone.utc)
+            )
+        )
+
+        rows = []
+        if response.tables:
+            for row in response.tables[0].rows:
+                day = row[0].date() if isinstance(row[0], datetime) else row[0]
+                rows.append((day, row[1], float(row[2]) if row[2] is not None else 0.0))
+        return rows
+
+    async def get_query_usage(
+        self,
+        resource_group: str,
+        workspace_name: str,
+        days_lookback: int = 30,
+        max_queries: Optional[int] = None
+    ) -> QueryLogAggregate:
+        """
+        Most-run distinct queries and their daily counts over the last
+        complete days, from LAQueryLogs.
+
+        Log rows are aggregated server-side by day and query text hash, so
+        each distinct query text is transferred once per day; the caller
+        parses each text once (see attribute_query_log). Only the
+        max_queries texts run most often over the window are returned, as
+        ad-hoc queries are mostly unique and each would otherwise be parsed.
+        Needs query auditing enabled on the workspace.
+
+        Args:
+            resource_group: Workspace resource group
+            workspace_name: Workspace name
+            days_lookback: Complete days to look back
+            max_queries: Distinct queries to keep (default QUERY_USAGE_MAX_QUERIES)
+
+        Returns:
+            (query hash -> query text, query hash -> [(day, query count)])
+        """
+        max_queries = max_queries or settings.QUERY_USAGE_MAX_QUERIES
+        try:
+            await self._ensure_clients()
+            logger.info(f"[AUDIT] Fetching query log usage for {days_lookback} days")
+
+            end = datetime.utcnow().date()
+            start = end - timedelta(days=days_lookback)
+
             kql_query = f"""
-            Usage
-            | where TimeGenerated >= ago({days_lookback}d)
-            | where DataType != "Usage"
-            | summarize TotalGB = sum(Quantity) / 1000 by DataType
-            | extend AvgGBPerDay = TotalGB / {days_lookback}
-            | project TableName=DataType, AvgGBPerDay
+            let logs = LAQueryLogs
+                | where TimeGenerated >= datetime({start.isoformat()})
+                    and TimeGenerated < datetime({end.isoformat()})
+                | where ResponseCode == 200
+                | extend QueryHash = hash_sha256(QueryText);
+            let top_queries = logs
+                | summarize QueryCount = count() by QueryHash
+                | top {max_queries} by QueryCount
+                | project QueryHash;
+            logs
+            | where QueryHash in (top_queries)
+            | summarize QueryCount = count(), QueryText = take_any(QueryText)
+                by Day = bin(TimeGenerated, 1d), QueryHash
+            | project Day, QueryHash, QueryCount, QueryText
             """
 
-            # Run the query
-            workspace_id = f"/subscriptions/{settings.AZURE_SUBSCRIPTION_ID}/resourcegroups/{resource_group}/providers/microsoft.operationalinsights/workspaces/{workspace_name}"
+            workspace_id = (
+                f"/subscriptions/{settings.AZURE_SUBSCRIPTION_ID}/resourcegroups/{resource_group}"
+                f"/providers/microsoft.operationalinsights/workspaces/{workspace_name}"
+            )
 
-            response = self.logs_query_client.query_workspace(
+            response = await self.logs_query_client.query_workspace(
                 workspace_id=workspace_id,
                 query=kql_query,
-                timespan=timedelta(days=days_lookback)
+                timespan=(
+                    datetime.combine(start, datetime.min.time(), tzinfo=timezone.utc),
+                    datetime.combine(end, datetime.min.time(), tzinfo=timezone.utc)
+                )
             )
 
-            # Parse results
-            ingestion_data = {}
-            if response.tables:
-                for row in response.tables[0].rows:
-                    table_name = row[0]
-                    avg_gb_per_day = float(row[1]) if row[1] is not None else 0.0
-                    ingestion_data[table_name] = avg_gb_per_day
+            texts: Dict[str, str] = {}
+            daily_counts: Dict[str, List[Tuple[date, int]]] = defaultdict(list)
+            for row in (response.tables[0].rows if response.tables else []):
+                day = row[0].date() if isinstance(row[0], datetime) else row[0]
+                texts.setdefault(row[1], row[3] or "")
+                daily_counts[row[1]].append((day, int(row[2])))
 
-            logger.info(f"[AUDIT] Ingestion data fetched for {len(ingestion_data)} tables")
-            return ingestion_data
+            logger.info(f"[AUDIT] Query log usage fetched: {len(texts)} distinct queries")
+            return texts, dict(daily_counts)
 
         except Exception as e:
-            logger.error(f"[AUDIT] Failed to get ingestion volume: {str(e)}")
+            logger.error(f"[AUDIT] Failed to get query log usage: {str(e)}")
             raise
 
     async def list_analytics_rules(
@@ -206,6 +453,7 @@ class AzureApiService:
             List of analytics rules with KQL queries
         """
         try:
+            await self._ensure_clients()
             logger.info(f"[AUDIT] Fetching analytics rules")
 
             rules = []
@@ -217,7 +465,7 @@ class AzureApiService:
             )
 
             rule_count = 0
-            for rule in alert_rules:
+            async for rule in alert_rules:
                 try:
                     # Extract rule type
                     rule_type = type(rule).__name__
@@ -233,6 +481,7 @@ class AzureApiService:
                                 rule_type=rule_type,
                                 kql_query=kql_query,
                                 enabled=getattr(rule, 'enabled', False),
+                                etag=getattr(rule, 'etag', None),
                                 tables_referenced=[]  # Will be populated by KQL parser
                             )
                         )
@@ -259,6 +508,7 @@ class AzureApiService:
             List of workbooks with KQL queries
         """
         try:
+            await self._ensure_clients()
             logger.info("[AUDIT] Fetching workbooks")
 
             workbooks = []
@@ -269,7 +519,7 @@ class AzureApiService:
             )
 
             workbook_count = 0
-            for wb in workbook_list:
+            async for wb in workbook_list:
                 try:
                     # Extract KQL queries from workbook (simplified)
                     kql_queries = self._extract_kql_from_workbook(wb)
@@ -305,18 +555,19 @@ class AzureApiService:
             List of hunt queries with KQL
         """
         try:
+            await self._ensure_clients()
             logger.info("[AUDIT] Fetching hunt queries")
 
             hunt_queries = []
 
             # Get all saved searches (hunt queries)
-            saved_searches = self.log_analytics_client.saved_searches.list_by_workspace(
+            saved_searches = await self.log_analytics_client.saved_searches.list_by_workspace(
                 resource_group_name=resource_group,
                 workspace_name=workspace_name
             )
 
             query_count = 0
-            for search in saved_searches:
+            for search in saved_searches.value or []:
                 try:
                     kql_query = getattr(search, 'query', '')
 
@@ -342,6 +593,41 @@ class AzureApiService:
             logger.error(f"[AUDIT] Failed to list hunt queries: {str(e)}")
             raise
 
+    async def list_saved_functions(
+        self, resource_group: str, workspace_name: str
+    ) -> List[WorkspaceFunction]:
+        """
+        Fetch saved workspace functions (saved searches with a function alias).
+
+        Returns:
+            List of functions with their KQL body
+        """
+        try:
+            await self._ensure_clients()
+            logger.info("[AUDIT] Fetching saved functions")
+
+            saved_searches = await self.log_analytics_client.saved_searches.list_by_workspace(
+                resource_group_name=resource_group,
+                workspace_name=workspace_name
+            )
+
+            functions = [
+                WorkspaceFunction(
+                    function_alias=search.function_alias,
+                    query=search.query,
+                    function_parameters=getattr(search, 'function_parameters', None)
+                )
+                for search in saved_searches.value or []
+                if getattr(search, 'function_alias', None) and getattr(search, 'query', None)
+            ]
+
+            logger.info(f"[AUDIT] Successfully listed {len(functions)} saved functions")
+            return functions
+
+        except Exception as e:
+            logger.error(f"[AUDIT] Failed to list saved functions: {str(e)}")
+            raise
+
     async def list_data_connectors(
         self, resource_group: str, workspace_name: str
     ) -> List[DataConnector]:
@@ -352,6 +638,7 @@ class AzureApiService:
             List of connectors with tables they feed
         """
         try:
+            await self._ensure_clients()
             logger.info("[AUDIT] Fetching data connectors")
 
             connectors = []
@@ -363,7 +650,7 @@ class AzureApiService:
             )
 
             connector_count = 0
-            for connector in connector_list:
+            async for connector in connector_list:
                 try:
                     # Extract connector type and table mappings
                     connector_type = type(connector).__name__
@@ -390,6 +677,46 @@ class AzureApiService:
             logger.error(f"[AUDIT] Failed to list data connectors: {str(e)}")
             raise
 
+    async def get_workspace_pricing_profile(
+        self, resource_group: str, workspace_name: str
+    ) -> WorkspacePricingProfile:
+        """
+        Fetch the workspace region and pricing tier.
+
+        Returns:
+            Pricing profile used to select region/commitment-specific rates
+        """
+        try:
+            await self._ensure_clients()
+            logger.info(f"[AUDIT] Fetching pricing tier for workspace: {workspace_name}")
+
+            workspace = await self.log_analytics_client.workspaces.get(
+                resource_group_name=resource_group,
+                workspace_name=workspace_name
+            )
+
+            sku = workspace.sku.name if workspace.sku else "PerGB2018"
+            commitment = 0
+            if workspace.sku and workspace.sku.capacity_reservation_level:
+                commitment = int(workspace.sku.capacity_reservation_level)
+
+            profile = WorkspacePricingProfile(
+                region=workspace.location.replace(" ", "").lower(),
+                currency=settings.PRICING_CURRENCY,
+                sku=str(sku),
+                commitment_gb_per_day=commitment
+            )
+
+            logger.info(
+                f"[AUDIT] Workspace pricing: {profile.region}, {profile.sku}"
+                f"{f' ({commitment} GB/day)' if commitment else ''}"
+            )
+            return profile
+
+        except Exception as e:
+            logger.error(f"[AUDIT] Failed to get workspace pricing tier: {str(e)}")
+            raise
+
     # ===== HELPER METHODS =====
 
     def _get_table_tier(self, table) -> TierType:
@@ -0,0 +1,174 @@
+"""
+Commitment Tier Optimizer
+
+Finds the cheapest workspace pricing plan: which commitment tier to buy
+(pay-as-you-go, 100, 200, 500+ GB/day) together with which eligible tables
+to move out of the Analytics tier to Basic or Archive.
+
+Every plan is evaluated at once as a (move plans x commitment tiers) cost
+matrix:
+- Move plans are prefixes of the eligible tables, ordered by cheapest
+  destination rate then largest volume (prefix sums give each plan's moved
+  GB/day and destination cost)
+- Commitment tiers are the levels priced for the workspace's region
+
+Costs follow CostCalculator conventions: per-GB rates, 30-day months.
+"""
+
+import logging
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+from src.models.schemas import CommitmentPlan, WorkspacePricingProfile
+from src.services.cost_calculator import APPROXIMATE_PRICING
+from src.services.pricing import PricingService, pricing_service
+
+logger = logging.getLogger(__name__)
+
+# Commitment tier discounts off the pay-as-you-go Analytics rate, used when
+# the price index has no commitment prices for the region
+APPROXIMATE_COMMITMENT_DISCOUNTS = {
+    100: 0.15,
+    200: 0.20,
+    300: 0.22,
+    400: 0.23,
+    500: 0.25,
+    1000: 0.26,
+    2000: 0.28,
+    5000: 0.30,
+}
+
+
+class CommitmentOptimizer:
+    """Vectorized search over commitment tiers and table tier moves"""
+
+    def __init__(self, pricing: Optional[PricingService] = None):
+        """
+        Args:
+            pricing: Price source (defaults to the shared pricing service)
+        """
+        self.pricing = pricing or pricing_service
+
+    def _rate(self, tier: str, profile: Optional[WorkspacePricingProfile]) -> float:
+        price = self.pricing.get_price(
+            tier,
+            region=profile.region if profile else None,
+            currency=profile.currency if profile else None,
+        )
+        return price if price is not None else APPROXIMATE_PRICING[tier]
+
+    def _commitment_tiers(
+        self, payg_rate: float, profile: Optional[WorkspacePricingProfile]
+    ) -> Dict[int, float]:
+        """Commitment level (GB/day) -> effective per-GB rate; 0 is pay-as-you-go"""
+        region = profile.region if profile else self.pricing.region
+        currency = profile.currency if profile else self.pricing.currency
+
+        tiers = {0: payg_rate}
+        for level in self.pricing.index.commitment_levels(region, currency):
+            rate = self.pricing.index.get(region, currency, "Hot", level)
+            if rate is not None:
+                tiers[level] = rate
+
+        if len(tiers) == 1:
+            for level, discount in APPROXIMATE_COMMITMENT_DISCOUNTS.items():
+                tiers[level] = payg_rate * (1 - discount)
+        return tiers
+
+    def optimize(
+        self,
+        table_names: Sequence[str],
+        ingestion_gb_per_day: Sequence[float],
+        current_tiers: Sequence[str],
+        target_tiers: Sequence[Optional[str]],
+        pricing_profile: Optional[WorkspacePricingProfile] = None,
+    ) -> CommitmentPlan:
+        """
+        Find the cheapest commitment tier and set of table moves.
+
+        Args:
+            table_names: Table names
+            ingestion_gb_per_day: Daily ingestion per table (aligned)
+            current_tiers: Current tier per table (aligned)
+            target_tiers: Tier each table may move to ("Basic"/"Archive"),
+                None if it must stay where it is (aligned)
+            pricing_profile: Workspace region/currency/current commitment
+
+        Returns:
+            Cheapest CommitmentPlan, compared against the current plan
+        """
+        names = np.asarray(table_names, dtype=object)
+        gb = np.asarray(ingestion_gb_per_day, dtype=np.float64)
+        current = np.asarray(current_tiers, dtype=object)
+        targets = np.asarray(target_tiers, dtype=object)
+
+        payg_rate = self._rate("Hot", pricing_profile)
+        basic_rate = self._rate("Basic", pricing_profile)
+        archive_rate = self._rate("Archive", pricing_profile)
+
+        # Only Analytics (Hot) ingestion counts toward a commitment tier
+        hot = current == "Hot"
+        analytics_gb = float(gb[hot].sum())
+
+        # Destination rate per movable table (NaN = must stay)
+        move_rate = np.where(
+            targets == "Archive",
+            archive_rate,
+            np.where(targets == "Basic", basic_rate, np.nan),
+        )
+        movable = np.flatnonzero(hot & ~np.isnan(move_rate))
+        order = movable[np.lexsort((-gb[movable], move_rate[movable]))]
+
+        # Move plans: move nothing, then each prefix of the ordered tables
+        moved_gb = np.concatenate(([0.0], np.cumsum(gb[order])))
+        moved_cost = np.concatenate(([0.0], np.cumsum(gb[order] * move_rate[order])))
+        kept_gb = np.maximum(analytics_gb - moved_gb, 0.0)
+
+        # Commitment tiers: daily reservation for `level` GB, overage at the same rate
+        tiers = self._commitment_tiers(payg_rate, pricing_profile)
+        levels = np.fromiter(tiers.keys(), dtype=np.float64)
+        rates = np.fromiter(tiers.values(), dtype=np.float64)
+        reservation = levels * rates
+
+        daily_cost = (
+            reservation[None, :]
+            + rates[None, :] * np.maximum(kept_gb[:, None] - levels[None, :], 0.0)
+            + moved_cost[:, None]
+        )
+
+        # argmin takes the first minimum: fewest moves, lowest commitment
+        plan_index, tier_index = np.unravel_index(
+            np.argmin(daily_cost), daily_cost.shape
+        )
+
+        current_level = pricing_profile.commitment_gb_per_day if pricing_profile else 0
+        current_column = (
+            int(np.searchsorted(levels, current_level)) if current_level in tiers else 0
+        )
+        current_daily = float(daily_cost[0, current_column])
+        optimized_daily = float(daily_cost[plan_index, tier_index])
+
+        moved = order[:plan_index]
+        plan = CommitmentPlan(
+            commitment_gb_per_day=int(levels[tier_index]),
+            current_commitment_gb_per_day=int(levels[current_column]),
+            analytics_gb_per_day=round(float(kept_gb[plan_index]), 4),
+            tables_to_basic=names[moved[targets[moved] == "Basic"]].tolist(),
+            tables_to_archive=names[moved[targets[moved] == "Archive"]].tolist(),
+            current_monthly_cost=round(current_daily * 30, 2),
+            optimized_monthly_cost=round(optimized_daily * 30, 2),
+            monthly_savings=round((current_daily - optimized_daily) * 30, 2),
+            plans_evaluated=int(daily_cost.size),
+        )
+
+        logger.info(
+            f"[COST] Commitment optimizer: {plan.plans_evaluated} plans, best "
+            f"{plan.commitment_gb_per_day or 'pay-as-you-go'} "
+            f"(${plan.monthly_savings:,.2f}/month vs current)"
+        )
+        return plan
+
+
+# ===== SINGLETON INSTANCE =====
+commitment_optimizer = CommitmentOptimizer()
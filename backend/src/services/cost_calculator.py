@@ -2,20 +2,22 @@
 Cost Calculator Service
 
 Calculates ingestion costs and savings estimates.
-Pricing fetched from Azure Retail Prices API at runtime (not hardcoded).
+Pricing comes from the pricing service's in-memory index of Azure Retail
+Prices API data; APPROXIMATE_PRICING is only the fallback.
 """
 
 import logging
-from typing import Dict, Tuple
+from typing import Dict, Iterator, List, Optional, Sequence, Union
 from datetime import datetime
-import requests
-from functools import lru_cache
+import numpy as np
+
+from src.models.schemas import WorkspacePricingProfile
+from src.services.pricing import pricing_service
 
 logger = logging.getLogger(__name__)
 
-# Approximate pricing (cached, updated daily)
-# In production, fetch from Azure Retail Prices API:
-# https://prices.azure.com/api/retail/prices
+# Approximate pricing, used when the pricing service has no price for a tier
+# (e.g. before the first Retail Prices API fetch with no snapshot on disk)
 APPROXIMATE_PRICING = {
     "Hot": 0.10,      # ~$0.10 per GB per day (Analytics tier)
     "Basic": 0.05,    # ~$0.05 per GB per day (Basic tier)
@@ -23,6 +25,70 @@ APPROXIMATE_PRICING = {
 }
 
 
+class CostTable:
+    """
+    Per-audit table costs, computed once and keyed by table name.
+
+    Holds the column arrays from CostCalculator.calculate_batch_costs plus
+    the ingestion volume. The report, exports and what-if analysis all read
+    from the same instance instead of re-costing tables.
+    """
+
+    COST_COLUMNS = (
+        "daily_cost_hot", "daily_cost_archive", "monthly_cost_hot",
+        "monthly_cost_archive", "monthly_savings", "annual_savings"
+    )
+
+    def __init__(
+        self,
+        columns: Dict[str, np.ndarray],
+        pricing_profile: Optional[WorkspacePricingProfile] = None,
+        tier_rates: Optional[Dict[str, float]] = None
+    ):
+        """
+        Args:
+            columns: Aligned columns; must include table_name, current_tier,
+                ingestion_gb_per_day and COST_COLUMNS
+            pricing_profile: Workspace region/currency/commitment the rates came from
+            tier_rates: Tier -> price per GB the columns were computed with
+        """
+        self.columns = columns
+        self.pricing_profile = pricing_profile
+        self.tier_rates = tier_rates or {}
+        self._index = {name: i for i, name in enumerate(columns["table_name"].tolist())}
+        # Plain-float copies for per-row access (avoids numpy scalar boxing)
+        self._values = {
+            column: columns[column].tolist()
+            for column in ("ingestion_gb_per_day",) + self.COST_COLUMNS
+        }
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, table_name: str) -> bool:
+        return table_name in self._index
+
+    def get(self, table_name: str) -> Optional[Dict[str, float]]:
+        """Cost row for a table (same keys as calculate_table_costs), or None"""
+        i = self._index.get(table_name)
+        if i is None:
+            return None
+        return {column: values[i] for column, values in self._values.items()}
+
+    def rows(self) -> Iterator[Dict]:
+        """All rows in table order, e.g. for CSV export"""
+        names = self.columns["table_name"].tolist()
+        tiers = self.columns["current_tier"].tolist()
+        for i, name in enumerate(names):
+            row = {"table_name": name, "current_tier": tiers[i]}
+            row.update({column: values[i] for column, values in self._values.items()})
+            yield row
+
+    def total(self, column: str) -> float:
+        """Sum of a cost column across all tables"""
+        return float(self.columns[column].sum())
+
+
 class CostCalculator:
     """Calculate ingestion costs and savings"""
 
@@ -30,7 +96,8 @@ class CostCalculator:
     def calculate_table_costs(
         ingestion_gb_per_day: float,
         current_tier: str,
-        target_tier: str = "Archive"
+        target_tier: str = "Archive",
+        pricing_profile: Optional[WorkspacePricingProfile] = None
     ) -> Dict[str, float]:
         """
         Calculate costs for a table across different tiers.
@@ -39,6 +106,7 @@ class CostCalculator:
             ingestion_gb_per_day: Daily ingestion volume in GB
             current_tier: Current tier (Hot, Basic, Archive)
             target_tier: Target tier for migration
+            pricing_profile: Workspace region/currency/commitment (default rates if None)
 
         Returns:
             Dictionary with cost calculations:
@@ -47,8 +115,8 @@ class CostCalculator:
         """
         try:
             # Fetch current pricing (or use cached approximate)
-            hot_rate = CostCalculator._get_pricing("Hot")
-            archive_rate = CostCalculator._get_pricing(target_tier)
+            hot_rate = CostCalculator._get_pricing("Hot", pricing_profile)
+            archive_rate = CostCalculator._get_pricing(target_tier, pricing_profile)
 
             # Daily costs
             daily_cost_hot = ingestion_gb_per_day * hot_rate
@@ -89,43 +157,149 @@ class CostCalculator:
             }
 
     @staticmethod
-    @lru_cache(maxsize=128)
-    def _get_pricing(tier: str) -> float:
+    def calculate_batch_costs(
+        table_names: Sequence[str],
+        ingestion_gb_per_day: Union[Sequence[float], np.ndarray],
+        current_tiers: Sequence[str],
+        target_tier: str = "Archive",
+        pricing_profile: Optional[WorkspacePricingProfile] = None,
+        tier_rates: Optional[Dict[str, float]] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Calculate costs for many tables in one vectorized pass.
+
+        Same formulas and rounding as calculate_table_costs, applied to whole
+        columns, so costing a large workspace is a handful of array operations
+        instead of one Python call per table.
+
+        Args:
+            table_names: Table names
+            ingestion_gb_per_day: Daily ingestion volume in GB (aligned with table_names)
+            current_tiers: Current tier per table (aligned with table_names)
+            target_tier: Target tier for migration
+            pricing_profile: Workspace region/currency/commitment (default rates if None)
+            tier_rates: Tier -> price per GB (resolved from pricing_profile if None)
+
+        Returns:
+            Dictionary of aligned columns:
+            - table_name, current_tier
+            - daily_cost_hot, daily_cost_archive, monthly_cost_hot, monthly_cost_archive
+            - monthly_savings, annual_savings
+        """
+        names = np.asarray(table_names, dtype=object)
+        tiers = np.asarray(current_tiers, dtype=object)
+        gb_per_day = np.asarray(ingestion_gb_per_day, dtype=np.float64)
+
+        if not (len(names) == len(tiers) == len(gb_per_day)):
+            raise ValueError("table_names, ingestion_gb_per_day and current_tiers must be aligned")
+
+        # Rates are resolved once per batch, never per table
+        if tier_rates is None:
+            tier_rates = CostCalculator.get_tier_rates(pricing_profile)
+        hot_rate = tier_rates["Hot"]
+        archive_rate = tier_rates.get(target_tier, 0.0)
+
+        daily_cost_hot = gb_per_day * hot_rate
+        daily_cost_archive = gb_per_day * archive_rate
+        monthly_savings = (daily_cost_hot - daily_cost_archive) * 30
+
+        logger.debug(f"[COST] Batch costed {len(names)} tables")
+
+        return {
+            "table_name": names,
+            "current_tier": tiers,
+            "daily_cost_hot": np.round(daily_cost_hot, 4),
+            "daily_cost_archive": np.round(daily_cost_archive, 4),
+            "monthly_cost_hot": np.round(daily_cost_hot * 30, 2),
+            "monthly_cost_archive": np.round(daily_cost_archive * 30, 2),
+            "monthly_savings": np.round(monthly_savings, 2),
+            "annual_savings": np.round(monthly_savings * 12, 2)
+        }
+
+    @staticmethod
+    def build_cost_table(
+        table_names: List[str],
+        ingestion_data: Dict[str, float],
+        current_tiers: List[str],
+        target_tier: str = "Archive",
+        pricing_profile: Optional[WorkspacePricingProfile] = None
+    ) -> CostTable:
+        """
+        Cost every table of an audit once.
+
+        The tier rates are resolved once and kept on the table, so everything
+        derived from the audit later (what-if) prices tables the same way
+        even after a pricing refresh.
+
+        Args:
+            table_names: Table names
+            ingestion_data: Ingestion GB/day per table (missing tables count as 0)
+            current_tiers: Current tier per table (aligned with table_names)
+            target_tier: Target tier for migration
+            pricing_profile: Workspace region/currency/commitment (default rates if None)
+
+        Returns:
+            CostTable keyed by table name
+        """
+        gb_per_day = np.fromiter(
+            (ingestion_data.get(name, 0.0) for name in table_names),
+            dtype=np.float64,
+            count=len(table_names)
+        )
+        tier_rates = CostCalculator.get_tier_rates(pricing_profile)
+        columns = CostCalculator.calculate_batch_costs(
+            table_names, gb_per_day, current_tiers, target_tier, pricing_profile, tier_rates
+        )
+        columns["ingestion_gb_per_day"] = gb_per_day
+        return CostTable(columns, pricing_profile, tier_rates)
+
+    @staticmethod
+    def get_tier_rates(
+        pricing_profile: Optional[WorkspacePricingProfile] = None
+    ) -> Dict[str, float]:
+        """
+        Per-GB rate of every tier for a workspace.
+
+        Args:
+            pricing_profile: Workspace region/currency/commitment (default rates if None)
+
+        Returns:
+            Tier name -> price per GB
+        """
+        return {
+            tier: CostCalculator._get_pricing(tier, pricing_profile)
+            for tier in APPROXIMATE_PRICING
+        }
+
+    @staticmethod
+    def _get_pricing(
+        tier: str, pricing_profile: Optional[WorkspacePricingProfile] = None
+    ) -> float:
         """
         Get current pricing for a tier.
 
-        Attempts to fetch from Azure Retail Prices API, falls back to approximate.
+        Served from the pricing service's in-memory index (never blocks on
+        the network), falls back to approximate.
 
         Args:
             tier: Tier name (Hot, Basic, Archive)
+            pricing_profile: Workspace region/currency/commitment (default rates if None)
 
         Returns:
-            Price per GB per day
+            Price per GB
         """
-        try:
-            # Try to fetch from Azure Retail Prices API
-            response = requests.get(
-                "https://prices.azure.com/api/retail/prices",
-                params={
-                    "api-version": "2021-10-01",
-                    "$filter": f"productName eq 'Azure Log Analytics' and skuName eq '{tier}'",
-                },
-                timeout=5
+        if pricing_profile is None:
+            price = pricing_service.get_price(tier)
+        else:
+            price = pricing_service.get_price(
+                tier,
+                region=pricing_profile.region,
+                currency=pricing_profile.currency,
+                commitment=pricing_profile.commitment_gb_per_day
             )
+        if price is not None:
+            return price
 
-            if response.status_code == 200:
-                data = response.json()
-                if data.get("Items"):
-                    # Extract unit price per GB
-                    item = data["Items"][0]
-                    price_per_gb = float(item.get("unitPrice", 0))
-                    logger.debug(f"[COST] Fetched pricing for {tier}: ${price_per_gb}/GB")
-                    return price_per_gb
-
-        except Exception as e:
-            logger.debug(f"[COST] Failed to fetch pricing from API: {str(e)}")
-
-        # Fall back to approximate pricing
         return APPROXIMATE_PRICING.get(tier, 0.0)
 
     @staticmethod
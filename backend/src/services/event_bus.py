@@ -0,0 +1,171 @@
+"""
+Audit Event Bus
+
+In-process pub/sub for agent progress events.
+
+Each job has one bounded ring buffer of ToolExecutionEvent records with
+monotonically increasing IDs. Any number of SSE subscribers read from the
+same buffer, so many dashboards watching one job cost one buffer, and a
+reconnecting client resumes from its Last-Event-ID.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from itertools import islice
+from typing import AsyncIterator, Deque, Dict, Optional, Tuple
+
+from src.config import settings
+from src.models.schemas import AuditJobRequest, JobStatus, Report, ToolExecutionEvent
+
+logger = logging.getLogger(__name__)
+
+
+class JobEventStream:
+    """Ring buffer of events for a single job"""
+
+    def __init__(self, max_events: int):
+        self.events: Deque[Tuple[int, ToolExecutionEvent]] = deque(maxlen=max_events)
+        self.last_id = 0
+        self.closed = False
+        self.closed_at: Optional[float] = None
+        # Latest job status reported by the job runner
+        self.status: Optional[JobStatus] = None
+        # Replaced on every publish; waiting subscribers wake when it is set
+        self.changed = asyncio.Event()
+
+    def append(self, event: ToolExecutionEvent) -> int:
+        self.last_id += 1
+        self.events.append((self.last_id, event))
+        self._wake()
+        return self.last_id
+
+    def close(self):
+        self.closed = True
+        self.closed_at = time.monotonic()
+        self._wake()
+
+    def _wake(self):
+        changed, self.changed = self.changed, asyncio.Event()
+        changed.set()
+
+    def since(self, last_event_id: int):
+        """Events with ID greater than last_event_id (oldest first)"""
+        if not self.events or last_event_id >= self.last_id:
+            return []
+        # IDs are contiguous, so the start offset is direct arithmetic
+        start = max(0, last_event_id - self.events[0][0] + 1)
+        return list(islice(self.events, start, None))
+
+
+class EventBus:
+    """Per-job pub/sub with replay and heartbeats"""
+
+    def __init__(
+        self,
+        max_events_per_job: Optional[int] = None,
+        retention_seconds: Optional[int] = None,
+    ):
+        """
+        Args:
+            max_events_per_job: Ring buffer size per job
+            retention_seconds: How long a finished job's buffer stays available for replay
+        """
+        self.max_events_per_job = (
+            max_events_per_job or settings.EVENT_BUS_MAX_EVENTS_PER_JOB
+        )
+        self.retention_seconds = (
+            retention_seconds or settings.EVENT_BUS_RETENTION_SECONDS
+        )
+        self._streams: Dict[str, JobEventStream] = {}
+
+    def _stream(self, job_id: str) -> JobEventStream:
+        stream = self._streams.get(job_id)
+        if stream is None:
+            self._evict_expired()
+            stream = JobEventStream(self.max_events_per_job)
+            self._streams[job_id] = stream
+        return stream
+
+    def _evict_expired(self):
+        """Drop buffers of jobs that finished more than retention_seconds ago"""
+        cutoff = time.monotonic() - self.retention_seconds
+        expired = [
+            job_id
+            for job_id, stream in self._streams.items()
+            if stream.closed and stream.closed_at < cutoff
+        ]
+        for job_id in expired:
+            del self._streams[job_id]
+
+    def has_stream(self, job_id: str) -> bool:
+        """True if events for the job are buffered"""
+        return job_id in self._streams
+
+    def publish(self, job_id: str, event: ToolExecutionEvent) -> int:
+        """
+        Append an event to the job's buffer and wake subscribers.
+
+        Returns:
+            Event ID (used as the SSE id / Last-Event-ID)
+        """
+        return self._stream(job_id).append(event)
+
+    def job_status(self, job_id: str) -> Optional[JobStatus]:
+        """Latest status the job runner reported for a job, if its stream is buffered"""
+        stream = self._streams.get(job_id)
+        return stream.status if stream is not None else None
+
+    def close(self, job_id: str):
+        """Mark a job's stream finished; subscribers drain and exit"""
+        self._stream(job_id).close()
+
+    async def subscribe(
+        self,
+        job_id: str,
+        last_event_id: int = 0,
+        heartbeat_seconds: Optional[float] = None,
+    ) -> AsyncIterator[Tuple[Optional[int], Optional[ToolExecutionEvent]]]:
+        """
+        Yield (event_id, event) for every event after last_event_id.
+
+        Yields (None, None) as a heartbeat when no event arrives within
+        heartbeat_seconds. Returns once the job's stream is closed and drained.
+        """
+        heartbeat = heartbeat_seconds or settings.SSE_HEARTBEAT_SECONDS
+        stream = self._stream(job_id)
+
+        while True:
+            # Grab the wake-up handle before reading, so a publish between the
+            # read and the wait is never missed
+            changed = stream.changed
+
+            for event_id, event in stream.since(last_event_id):
+                last_event_id = event_id
+                yield event_id, event
+
+            if stream.closed:
+                return
+
+            try:
+                await asyncio.wait_for(changed.wait(), timeout=heartbeat)
+            except asyncio.TimeoutError:
+                yield None, None
+
+    async def on_job_status(
+        self,
+        job: AuditJobRequest,
+        status: JobStatus,
+        report: Optional[Report] = None,
+        error_message: Optional[str] = None,
+    ):
+        """Job runner listener: track the job's status and close the stream when it finishes"""
+        stream = self._stream(job.job_id)
+        stream.status = status
+        if status in (JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED):
+            stream.close()
+
+
+# ===== SINGLETON INSTANCE =====
+event_bus = EventBus()
@@ -0,0 +1,215 @@
+"""
+Daily Ingestion Cache
+
+Local columnar store of per-day, per-table ingestion (GB), keyed by
+workspace and day, so repeated audits only query Log Analytics for the
+days they have not seen yet and compute any lookback average locally.
+
+Each workspace is one compressed NumPy archive ("<workspace>.npz") holding
+three columns:
+- days: day ordinals (ascending)
+- tables: table names
+- gb: (tables x days) matrix of GB ingested
+
+Only settled days are persisted: Usage records for the most recent day(s)
+can still arrive late, so those days are always re-queried.
+"""
+
+import asyncio
+import logging
+import os
+import re
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.config import settings
+
+logger = logging.getLogger(__name__)
+
+DailyIngestionRow = Tuple[date, str, float]  # (day, table name, GB)
+
+
+class IngestionSeries:
+    """Per-day ingestion matrix for one workspace"""
+
+    def __init__(
+        self,
+        days: Optional[np.ndarray] = None,
+        tables: Optional[Sequence[str]] = None,
+        gb: Optional[np.ndarray] = None,
+    ):
+        """
+        Args:
+            days: Day ordinals, ascending
+            tables: Table names (matrix rows)
+            gb: (tables x days) GB ingested
+        """
+        self.days = (
+            np.zeros(0, dtype=np.int64)
+            if days is None
+            else np.asarray(days, dtype=np.int64)
+        )
+        self.tables: List[str] = list(tables or [])
+        self.gb = np.zeros((len(self.tables), len(self.days))) if gb is None else gb
+        self._day_index = {int(day): i for i, day in enumerate(self.days)}
+        self._table_index = {name: i for i, name in enumerate(self.tables)}
+
+    def __len__(self) -> int:
+        return len(self.days)
+
+    def missing_days(self, days: Sequence[date]) -> List[date]:
+        """Days of a window that are not in the series"""
+        return [day for day in days if day.toordinal() not in self._day_index]
+
+    def merge(
+        self, days: Sequence[date], rows: Sequence[DailyIngestionRow]
+    ) -> "IngestionSeries":
+        """
+        New series with freshly queried days added.
+
+        Args:
+            days: Every day the query covered (days without rows are zero)
+            rows: (day, table name, GB) rows for those days
+
+        Returns:
+            Merged series (this one is left unchanged)
+        """
+        new_days = np.union1d(self.days, [day.toordinal() for day in days]).astype(
+            np.int64
+        )
+        new_tables = self.tables + sorted(
+            {row[1] for row in rows} - set(self._table_index)
+        )
+
+        gb = np.zeros((len(new_tables), len(new_days)))
+        if len(self.days):
+            columns = np.searchsorted(new_days, self.days)
+            gb[: len(self.tables), columns] = self.gb
+
+        merged = IngestionSeries(new_days, new_tables, gb)
+        queried = np.searchsorted(new_days, [day.toordinal() for day in days])
+        gb[:, queried] = 0.0  # re-queried days replace cached values
+        for day, table_name, value in rows:
+            gb[
+                merged._table_index[table_name], merged._day_index[day.toordinal()]
+            ] += value
+        return merged
+
+    def window(self, days: Sequence[date]) -> Tuple[List[str], np.ndarray]:
+        """
+        Columns for a window of days.
+
+        Returns:
+            (table names, (tables x days) GB matrix); tables with no
+            ingestion in the window are dropped
+        """
+        columns = [self._day_index[day.toordinal()] for day in days]
+        gb = self.gb[:, columns]
+        active = np.flatnonzero(gb.any(axis=1))
+        return [self.tables[i] for i in active.tolist()], gb[active]
+
+    def settled(self, last_day: date) -> "IngestionSeries":
+        """Series restricted to days up to and including last_day"""
+        keep = self.days <= last_day.toordinal()
+        return IngestionSeries(self.days[keep], self.tables, self.gb[:, keep])
+
+
+class IngestionCache:
+    """On-disk npz store of IngestionSeries, one file per workspace"""
+
+    def __init__(self, root: Optional[str] = None, settle_days: Optional[int] = None):
+        """
+        Args:
+            root: Cache directory ("" disables persistence)
+            settle_days: Most recent days that are never persisted
+        """
+        self.root = settings.INGESTION_CACHE_PATH if root is None else root
+        self.settle_days = (
+            settings.INGESTION_CACHE_SETTLE_DAYS if settle_days is None else settle_days
+        )
+        self._series: Dict[str, IngestionSeries] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    @staticmethod
+    def workspace_key(
+        subscription_id: str, resource_group: str, workspace_name: str
+    ) -> str:
+        """Filesystem-safe cache key for a workspace"""
+        key = f"{subscription_id}_{resource_group}_{workspace_name}".lower()
+        return re.sub(r"[^a-z0-9_.-]", "_", key)
+
+    def lock(self, key: str) -> asyncio.Lock:
+        """Per-workspace lock, so concurrent audits query missing days once"""
+        return self._locks.setdefault(key, asyncio.Lock())
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, f"{key}.npz")
+
+    def _read(self, key: str) -> IngestionSeries:
+        path = self._path(key)
+        if not self.root or not os.path.exists(path):
+            return IngestionSeries()
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                return IngestionSeries(
+                    data["days"], data["tables"].tolist(), data["gb"]
+                )
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(
+                f"[AUDIT] Ignoring unreadable ingestion cache {path}: {str(e)}"
+            )
+            return IngestionSeries()
+
+    def _write(self, key: str, series: IngestionSeries):
+        os.makedirs(self.root, exist_ok=True)
+        path = self._path(key)
+        tmp_path = f"{path}.tmp.npz"
+        np.savez_compressed(
+            tmp_path,
+            days=series.days,
+            tables=np.array(series.tables, dtype=str),
+            gb=series.gb,
+        )
+        os.replace(tmp_path, path)
+
+    async def load(self, key: str) -> IngestionSeries:
+        """Cached series for a workspace (empty if none)"""
+        series = self._series.get(key)
+        if series is None:
+            series = await asyncio.to_thread(self._read, key)
+            self._series[key] = series
+        return series
+
+    async def update(
+        self, key: str, days: Sequence[date], rows: Sequence[DailyIngestionRow]
+    ) -> IngestionSeries:
+        """
+        Add freshly queried days and persist the settled ones.
+
+        Args:
+            key: Workspace cache key
+            days: Every day the query covered
+            rows: (day, table name, GB) rows for those days
+
+        Returns:
+            Series including the unsettled days (for the current audit)
+        """
+        merged = (await self.load(key)).merge(days, rows)
+
+        # Usage days are binned in UTC
+        last_settled = datetime.utcnow().date() - timedelta(days=self.settle_days)
+        settled = merged.settled(last_settled)
+        self._series[key] = settled
+
+        if self.root:
+            try:
+                await asyncio.to_thread(self._write, key, settled)
+            except OSError as e:
+                logger.warning(f"[AUDIT] Failed to write ingestion cache: {str(e)}")
+        return merged
+
+
+# ===== SINGLETON INSTANCE =====
+ingestion_cache = IngestionCache()
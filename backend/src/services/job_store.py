@@ -0,0 +1,882 @@
+"""
+Audit Job Store
+
+Persists audit job metadata and status transitions.
+
+Backends:
+- SqliteJobStore (default): local file, indexed by job_id, workspace and created_at
+- TableStorageJobStore: Azure Table Storage via Managed Identity
+
+Listing is newest-first and paginated by keyset only (`before=<job_id>`
+of the last job seen), so any page is an O(log n) index seek. There is no
+offset (`skip`): neither SQLite nor Table Storage can skip rows without
+walking them, which would make deep pages O(skip).
+
+Queued and running jobs live in one process's job runner, and a Table
+Storage store is shared by every replica. Each job therefore records the
+store instance that last moved it (owner_id) and a lease that the owner
+renews while it holds the job. A job is only treated as orphaned, and
+failed, once its lease has expired, so a restarting replica never ends
+jobs another replica is running.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import uuid
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Sequence, Set
+
+from src.config import settings
+from src.models.schemas import AuditJobMetadata, AuditJobRequest, JobStatus, Report
+from src.utils.errors import InvalidJobTransitionException, JobConflictException
+
+if TYPE_CHECKING:
+    from azure.data.tables import TableEntity
+
+logger = logging.getLogger(__name__)
+
+
+# Allowed status transitions (terminal states have no outgoing edges)
+VALID_TRANSITIONS: Dict[JobStatus, Set[JobStatus]] = {
+    JobStatus.QUEUED: {JobStatus.RUNNING, JobStatus.CANCELLED, JobStatus.FAILED},
+    JobStatus.RUNNING: {
+        JobStatus.AWAITING_APPROVAL,
+        JobStatus.COMPLETED,
+        JobStatus.FAILED,
+        JobStatus.CANCELLED,
+    },
+    JobStatus.AWAITING_APPROVAL: {
+        JobStatus.APPROVED,
+        JobStatus.COMPLETED,
+        JobStatus.CANCELLED,
+    },
+    JobStatus.APPROVED: {JobStatus.EXECUTING, JobStatus.CANCELLED},
+    JobStatus.EXECUTING: {JobStatus.COMPLETED, JobStatus.FAILED},
+    JobStatus.COMPLETED: set(),
+    JobStatus.FAILED: set(),
+    JobStatus.CANCELLED: set(),
+}
+
+# States only the owning process's job runner moves a job out of; if that
+# process stops, nothing will, so these jobs are leased. AWAITING_APPROVAL
+# waits on a user, not the runner, and needs no lease.
+RUNNER_OWNED_STATES = (
+    JobStatus.QUEUED,
+    JobStatus.RUNNING,
+    JobStatus.APPROVED,
+    JobStatus.EXECUTING,
+)
+
+INTERRUPTED_MESSAGE = "Audit interrupted by restart"
+
+
+def validate_transition(job_id: str, current: JobStatus, new: JobStatus):
+    """Raise if the status change is not allowed"""
+    if new != current and new not in VALID_TRANSITIONS[current]:
+        raise InvalidJobTransitionException(
+            f"Job {job_id}: invalid status transition {current.value} -> {new.value}"
+        )
+
+
+def interrupted_status(current: JobStatus) -> JobStatus:
+    """Terminal status for an orphaned job (APPROVED cannot move to FAILED)"""
+    if JobStatus.FAILED in VALID_TRANSITIONS[current]:
+        return JobStatus.FAILED
+    return JobStatus.CANCELLED
+
+
+class JobStore:
+    """Base class for audit job persistence"""
+
+    def __init__(self, lease_seconds: Optional[int] = None):
+        """
+        Args:
+            lease_seconds: How long a job's lease lasts without renewal
+        """
+        self.owner_id = f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self.lease_seconds = lease_seconds or settings.JOB_LEASE_SECONDS
+        # Runner-owned jobs this instance moved last, and so keeps leased
+        self._owned: Set[str] = set()
+        self._lease_task: Optional[asyncio.Task] = None
+
+    def _lease_expiry(self) -> str:
+        return (datetime.utcnow() + timedelta(seconds=self.lease_seconds)).isoformat()
+
+    def _track(self, job_id: str, status: JobStatus):
+        """Keep the job leased while it is in a runner-owned state"""
+        if status in RUNNER_OWNED_STATES:
+            self._owned.add(job_id)
+        else:
+            self._owned.discard(job_id)
+
+    async def start(self):
+        """Fail orphaned jobs, then keep this instance's leases fresh in the background"""
+        await self.fail_interrupted_jobs()
+        if self._lease_task is None:
+            self._lease_task = asyncio.create_task(self._lease_loop())
+
+    async def _lease_loop(self):
+        """Renew held leases and sweep expired ones, a few times per lease"""
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                await self.renew_leases()
+                await self.fail_interrupted_jobs()
+            except Exception as e:
+                logger.error(f"[JOBS] Lease maintenance failed: {str(e)}")
+
+    async def create_job(self, job: AuditJobMetadata, tenant_id: Optional[str] = None):
+        """Insert a new job (normally in QUEUED state)"""
+        raise NotImplementedError
+
+    async def get_job(
+        self, job_id: str, tenant_id: Optional[str] = None
+    ) -> Optional[AuditJobMetadata]:
+        """Fetch a job by ID (None if missing or owned by another tenant)"""
+        raise NotImplementedError
+
+    async def update_status(
+        self,
+        job_id: str,
+        status: JobStatus,
+        error_message: Optional[str] = None,
+        report_url: Optional[str] = None,
+    ) -> AuditJobMetadata:
+        """
+        Move a job to a new status.
+
+        Raises:
+            KeyError: If the job does not exist
+            InvalidJobTransitionException: If the transition is not allowed
+        """
+        raise NotImplementedError
+
+    async def list_jobs(
+        self,
+        limit: int = 50,
+        tenant_id: Optional[str] = None,
+        workspace_id: Optional[str] = None,
+        before: Optional[str] = None,
+    ) -> List[AuditJobMetadata]:
+        """
+        List jobs newest-first.
+
+        Args:
+            limit: Max rows to return
+            tenant_id: Only jobs started from this tenant
+            workspace_id: Only jobs for this workspace
+            before: Keyset cursor - only jobs created before this job_id
+        """
+        raise NotImplementedError
+
+    async def close(self):
+        """Stop lease maintenance and release backend resources"""
+        if self._lease_task is not None:
+            self._lease_task.cancel()
+            try:
+                await self._lease_task
+            except asyncio.CancelledError:
+                pass
+            self._lease_task = None
+
+    async def renew_leases(self):
+        """Extend the lease of every runner-owned job this instance holds"""
+        raise NotImplementedError
+
+    async def _job_ids_in_states(self, states: Sequence[JobStatus]) -> List[str]:
+        """IDs of every job currently in one of the given states"""
+        raise NotImplementedError
+
+    async def _end_if_orphaned(self, job_id: str) -> bool:
+        """
+        Atomically end a job if it is still runner-owned and its lease has expired.
+
+        Returns:
+            True if the job was ended
+        """
+        raise NotImplementedError
+
+    async def fail_interrupted_jobs(self) -> int:
+        """
+        End runner-owned jobs whose owner stopped renewing their lease.
+
+        Jobs move to FAILED, or to CANCELLED where the transition table does
+        not allow FAILED (APPROVED), so the status page and event stream see
+        a terminal state instead of waiting forever. Jobs of live replicas
+        (unexpired lease) are left alone.
+
+        Returns:
+            Number of jobs ended
+        """
+        ended = 0
+        for job_id in await self._job_ids_in_states(RUNNER_OWNED_STATES):
+            if job_id not in self._owned and await self._end_if_orphaned(job_id):
+                ended += 1
+
+        if ended:
+            logger.warning(
+                f"[JOBS] Ended {ended} jobs whose owner stopped (lease expired)"
+            )
+        return ended
+
+    async def on_job_status(
+        self,
+        job: AuditJobRequest,
+        status: JobStatus,
+        report: Optional[Report] = None,
+        error_message: Optional[str] = None,
+    ):
+        """Job runner listener: persist each status transition"""
+        report_url = (
+            f"/api/v1/audits/{job.job_id}/report" if report is not None else None
+        )
+        await self.update_status(
+            job.job_id, status, error_message=error_message, report_url=report_url
+        )
+
+
+class SqliteJobStore(JobStore):
+    """SQLite-backed job store (default)"""
+
+    SCHEMA = [
+        """
+        CREATE TABLE IF NOT EXISTS audit_jobs (
+            job_id TEXT PRIMARY KEY,
+            tenant_id TEXT,
+            workspace_id TEXT NOT NULL,
+            status TEXT NOT NULL,
+            created_at TEXT NOT NULL,
+            started_at TEXT,
+            completed_at TEXT,
+            error_message TEXT,
+            report_url TEXT,
+            owner_id TEXT,
+            lease_expires_at TEXT
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_jobs_created ON audit_jobs (created_at DESC, job_id DESC)",
+        "CREATE INDEX IF NOT EXISTS idx_jobs_workspace "
+        "ON audit_jobs (workspace_id, created_at DESC, job_id DESC)",
+        "CREATE INDEX IF NOT EXISTS idx_jobs_tenant "
+        "ON audit_jobs (tenant_id, created_at DESC, job_id DESC)",
+        "CREATE INDEX IF NOT EXISTS idx_jobs_status ON audit_jobs (status)",
+    ]
+
+    COLUMNS = (
+        "job_id, workspace_id, status, created_at, started_at, completed_at, "
+        "error_message, report_url"
+    )
+
+    # Added after the first release; older databases are migrated on open
+    LEASE_COLUMNS = ("owner_id", "lease_expires_at")
+
+    def __init__(self, path: Optional[str] = None, lease_seconds: Optional[int] = None):
+        """
+        Args:
+            path: Database file path (":memory:" for tests)
+            lease_seconds: How long a job's lease lasts without renewal
+        """
+        super().__init__(lease_seconds)
+        self.path = path or settings.JOB_STORE_SQLITE_PATH
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            for statement in self.SCHEMA:
+                self._conn.execute(statement)
+            existing = {
+                row["name"]
+                for row in self._conn.execute("PRAGMA table_info(audit_jobs)")
+            }
+            for column in self.LEASE_COLUMNS:
+                if column not in existing:
+                    self._conn.execute(
+                        f"ALTER TABLE audit_jobs ADD COLUMN {column} TEXT"
+                    )
+
+        logger.info(f"[JOBS] SQLite job store ready: {self.path}")
+
+    async def _run(self, func, *args):
+        """Run a blocking DB call off the event loop"""
+        return await asyncio.to_thread(func, *args)
+
+    @staticmethod
+    def _to_metadata(row: sqlite3.Row) -> AuditJobMetadata:
+        return AuditJobMetadata(
+            job_id=row["job_id"],
+            workspace_id=row["workspace_id"],
+            status=JobStatus(row["status"]),
+            created_at=datetime.fromisoformat(row["created_at"]),
+            started_at=(
+                datetime.fromisoformat(row["started_at"]) if row["started_at"] else None
+            ),
+            completed_at=(
+                datetime.fromisoformat(row["completed_at"])
+                if row["completed_at"]
+                else None
+            ),
+            error_message=row["error_message"],
+            report_url=row["report_url"],
+        )
+
+    async def create_job(self, job: AuditJobMetadata, tenant_id: Optional[str] = None):
+        def insert():
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "INSERT INTO audit_jobs (job_id, tenant_id, workspace_id, status, created_at, "
+                    "owner_id, lease_expires_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        job.job_id,
+                        tenant_id,
+                        job.workspace_id,
+                        job.status.value,
+                        job.created_at.isoformat(),
+                        self.owner_id,
+                        self._lease_expiry(),
+                    ),
+                )
+
+        await self._run(insert)
+        self._track(job.job_id, job.status)
+        logger.info(f"[JOBS] Job created: {job.job_id} ({job.status.value})")
+
+    async def get_job(
+        self, job_id: str, tenant_id: Optional[str] = None
+    ) -> Optional[AuditJobMetadata]:
+        def select():
+            with self._lock:
+                return self._conn.execute(
+                    f"SELECT {self.COLUMNS}, tenant_id FROM audit_jobs WHERE job_id = ?",
+                    (job_id,),
+                ).fetchone()
+
+        row = await self._run(select)
+        if row is None or (tenant_id and row["tenant_id"] != tenant_id):
+            return None
+        return self._to_metadata(row)
+
+    async def update_status(
+        self,
+        job_id: str,
+        status: JobStatus,
+        error_message: Optional[str] = None,
+        report_url: Optional[str] = None,
+    ) -> AuditJobMetadata:
+        def update():
+            with self._lock, self._conn:
+                row = self._conn.execute(
+                    f"SELECT {self.COLUMNS} FROM audit_jobs WHERE job_id = ?", (job_id,)
+                ).fetchone()
+                if row is None:
+                    raise KeyError(job_id)
+                return self._transition(row, status, error_message, report_url)
+
+        row = await self._run(update)
+        self._track(job_id, status)
+        logger.info(f"[JOBS] Job {job_id} -> {status.value}")
+        return self._to_metadata(row)
+
+    def _transition(
+        self,
+        row: sqlite3.Row,
+        status: JobStatus,
+        error_message: Optional[str],
+        report_url: Optional[str],
+    ) -> sqlite3.Row:
+        """Validate and write a status change (caller holds the lock and transaction)"""
+        job_id = row["job_id"]
+        validate_transition(job_id, JobStatus(row["status"]), status)
+
+        now = datetime.utcnow().isoformat()
+        started_at = row["started_at"] or (now if status == JobStatus.RUNNING else None)
+        completed_at = row["completed_at"]
+        if not VALID_TRANSITIONS[status]:
+            completed_at = now
+
+        self._conn.execute(
+            "UPDATE audit_jobs SET status = ?, started_at = ?, completed_at = ?, "
+            "error_message = COALESCE(?, error_message), "
+            "report_url = COALESCE(?, report_url), owner_id = ?, lease_expires_at = ? "
+            "WHERE job_id = ?",
+            (
+                status.value,
+                started_at,
+                completed_at,
+                error_message,
+                report_url,
+                self.owner_id,
+                self._lease_expiry(),
+                job_id,
+            ),
+        )
+        return self._conn.execute(
+            f"SELECT {self.COLUMNS} FROM audit_jobs WHERE job_id = ?", (job_id,)
+        ).fetchone()
+
+    async def list_jobs(
+        self,
+        limit: int = 50,
+        tenant_id: Optional[str] = None,
+        workspace_id: Optional[str] = None,
+        before: Optional[str] = None,
+    ) -> List[AuditJobMetadata]:
+        def select():
+            clauses, params = [], []
+
+            if tenant_id:
+                clauses.append("tenant_id = ?")
+                params.append(tenant_id)
+            if workspace_id:
+                clauses.append("workspace_id = ?")
+                params.append(workspace_id)
+            if before:
+                # Keyset cursor: seek straight to the cursor row via the index
+                clauses.append(
+                    "(created_at, job_id) < "
+                    "(SELECT created_at, job_id FROM audit_jobs WHERE job_id = ?)"
+                )
+                params.append(before)
+
+            where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+            params.append(limit)
+
+            with self._lock:
+                return self._conn.execute(
+                    f"SELECT {self.COLUMNS} FROM audit_jobs {where} "
+                    f"ORDER BY created_at DESC, job_id DESC LIMIT ?",
+                    params,
+                ).fetchall()
+
+        rows = await self._run(select)
+        return [self._to_metadata(row) for row in rows]
+
+    async def _job_ids_in_states(self, states: Sequence[JobStatus]) -> List[str]:
+        def select():
+            placeholders = ", ".join("?" for _ in states)
+            with self._lock:
+                return self._conn.execute(
+                    f"SELECT job_id FROM audit_jobs WHERE status IN ({placeholders})",
+                    [state.value for state in states],
+                ).fetchall()
+
+        return [row["job_id"] for row in await self._run(select)]
+
+    async def renew_leases(self):
+        job_ids = list(self._owned)
+        if not job_ids:
+            return
+
+        def renew() -> Set[str]:
+            placeholders = ", ".join("?" for _ in job_ids)
+            states = ", ".join("?" for _ in RUNNER_OWNED_STATES)
+            where = f"WHERE owner_id = ? AND job_id IN ({placeholders}) AND status IN ({states})"
+            params = [
+                self.owner_id,
+                *job_ids,
+                *(state.value for state in RUNNER_OWNED_STATES),
+            ]
+            with self._lock, self._conn:
+                self._conn.execute(
+                    f"UPDATE audit_jobs SET lease_expires_at = ? {where}",
+                    [self._lease_expiry(), *params],
+                )
+                rows = self._conn.execute(
+                    f"SELECT job_id FROM audit_jobs {where}", params
+                )
+                return {row["job_id"] for row in rows}
+
+        # Jobs another instance has since ended or taken over are no longer ours
+        held = await self._run(renew)
+        self._owned.difference_update(set(job_ids) - held)
+
+    async def _end_if_orphaned(self, job_id: str) -> bool:
+        def end() -> bool:
+            with self._lock, self._conn:
+                row = self._conn.execute(
+                    f"SELECT {self.COLUMNS}, lease_expires_at FROM audit_jobs WHERE job_id = ?",
+                    (job_id,),
+                ).fetchone()
+                if row is None or JobStatus(row["status"]) not in RUNNER_OWNED_STATES:
+                    return False
+                lease = row["lease_expires_at"]
+                if lease and lease > datetime.utcnow().isoformat():
+                    return False
+                status = interrupted_status(JobStatus(row["status"]))
+                self._transition(row, status, INTERRUPTED_MESSAGE, None)
+                return True
+
+        ended = await self._run(end)
+        if ended:
+            logger.info(f"[JOBS] Job {job_id} orphaned (lease expired), ended")
+        return ended
+
+    async def close(self):
+        await super().close()
+        with self._lock:
+            self._conn.close()
+
+
+class TableStorageJobStore(JobStore):
+    """
+    Azure Table Storage job store.
+
+    Table Storage only sorts by (PartitionKey, RowKey), so each job is
+    written as a primary entity plus index entities:
+    - PartitionKey "job",           RowKey job_id                 (point lookup)
+    - PartitionKey "all",           RowKey <inverted ts>_<job_id> (newest-first)
+    - PartitionKey "ws_<hash>",     RowKey <inverted ts>_<job_id> (per workspace)
+    - PartitionKey "tenant_<id>",   RowKey <inverted ts>_<job_id> (per tenant)
+    """
+
+    TABLE_NAME = "auditjobs"
+    MAX_TIMESTAMP_MS = 10**15
+
+    # Conditional writes retried before giving up on a contended job
+    MAX_WRITE_ATTEMPTS = 5
+
+    def __init__(
+        self, account_url: Optional[str] = None, lease_seconds: Optional[int] = None
+    ):
+        """
+        Args:
+            account_url: Table endpoint, e.g. https://<account>.table.core.windows.net
+            lease_seconds: How long a job's lease lasts without renewal
+        """
+        super().__init__(lease_seconds)
+        self.account_url = account_url or (
+            f"https://{settings.AZURE_STORAGE_ACCOUNT_NAME}.table.core.windows.net"
+        )
+        self._table_client = None
+        self._credential = None
+        self._init_lock = asyncio.Lock()
+
+        logger.info(f"[JOBS] Table Storage job store configured: {self.account_url}")
+
+    async def _client(self):
+        """Create the table client on first use (must run inside the event loop)"""
+        if self._table_client is not None:
+            return self._table_client
+
+        async with self._init_lock:
+            if self._table_client is None:
+                from azure.data.tables.aio import TableServiceClient
+
+                self._credential = settings.async_credential
+                service = TableServiceClient(
+                    endpoint=self.account_url, credential=self._credential
+                )
+                self._table_client = await service.create_table_if_not_exists(
+                    self.TABLE_NAME
+                )
+
+        return self._table_client
+
+    @classmethod
+    def _sort_key(cls, created_at: datetime, job_id: str) -> str:
+        """RowKey that sorts newest-first"""
+        inverted = cls.MAX_TIMESTAMP_MS - int(created_at.timestamp() * 1000)
+        return f"{inverted:015d}_{job_id}"
+
+    @staticmethod
+    def _workspace_partition(workspace_id: str) -> str:
+        # Workspace IDs are ARM paths ('/' is not allowed in keys)
+        return "ws_" + hashlib.sha1(workspace_id.lower().encode()).hexdigest()
+
+    @staticmethod
+    def _to_metadata(entity: Dict) -> AuditJobMetadata:
+        return AuditJobMetadata(
+            job_id=entity["job_id"],
+            workspace_id=entity["workspace_id"],
+            status=JobStatus(entity["status"]),
+            created_at=datetime.fromisoformat(entity["created_at"]),
+            started_at=(
+                datetime.fromisoformat(entity["started_at"])
+                if entity.get("started_at")
+                else None
+            ),
+            completed_at=(
+                datetime.fromisoformat(entity["completed_at"])
+                if entity.get("completed_at")
+                else None
+            ),
+            error_message=entity.get("error_message"),
+            report_url=entity.get("report_url"),
+        )
+
+    def _index_partitions(self, entity: Dict) -> List[str]:
+        partitions = ["all", self._workspace_partition(entity["workspace_id"])]
+        if entity.get("tenant_id"):
+            partitions.append(f"tenant_{entity['tenant_id']}")
+        return partitions
+
+    async def _write_all(self, entity: Dict, etag: Optional[str] = None):
+        """
+        Write the primary entity and its index copies.
+
+        Args:
+            entity: Job properties
+            etag: If set, the primary entity is only replaced if unchanged
+                since it was read with this ETag
+
+        Raises:
+            ResourceModifiedError: The primary entity changed since it was read
+        """
+        client = await self._client()
+        sort_key = entity["sort_key"]
+        primary = {**entity, "PartitionKey": "job", "RowKey": entity["job_id"]}
+
+        if etag is None:
+            await client.upsert_entity(primary)
+        else:
+            from azure.core import MatchConditions
+            from azure.data.tables import UpdateMode
+
+            await client.update_entity(
+                primary,
+                mode=UpdateMode.REPLACE,
+                etag=etag,
+                match_condition=MatchConditions.IfNotModified,
+            )
+        # Index copies follow the primary entity, which is the source of truth
+        for partition in self._index_partitions(entity):
+            await client.upsert_entity(
+                {**entity, "PartitionKey": partition, "RowKey": sort_key}
+            )
+
+    async def create_job(self, job: AuditJobMetadata, tenant_id: Optional[str] = None):
+        entity = {
+            "job_id": job.job_id,
+            "tenant_id": tenant_id or "",
+            "workspace_id": job.workspace_id,
+            "status": job.status.value,
+            "created_at": job.created_at.isoformat(),
+            "sort_key": self._sort_key(job.created_at, job.job_id),
+            "owner_id": self.owner_id,
+            "lease_expires_at": self._lease_expiry(),
+        }
+        await self._write_all(entity)
+        self._track(job.job_id, job.status)
+        logger.info(f"[JOBS] Job created: {job.job_id} ({job.status.value})")
+
+    async def _get_entity(self, job_id: str) -> Optional["TableEntity"]:
+        """Primary entity of a job (a TableEntity: its ETag is in .metadata)"""
+        from azure.core.exceptions import ResourceNotFoundError
+
+        client = await self._client()
+        try:
+            return await client.get_entity(partition_key="job", row_key=job_id)
+        except ResourceNotFoundError:
+            return None
+
+    async def get_job(
+        self, job_id: str, tenant_id: Optional[str] = None
+    ) -> Optional[AuditJobMetadata]:
+        entity = await self._get_entity(job_id)
+        if entity is None or (tenant_id and entity.get("tenant_id") != tenant_id):
+            return None
+        return self._to_metadata(entity)
+
+    async def update_status(
+        self,
+        job_id: str,
+        status: JobStatus,
+        error_message: Optional[str] = None,
+        report_url: Optional[str] = None,
+    ) -> AuditJobMetadata:
+        entity = await self._transition(
+            job_id, lambda current: status, error_message, report_url
+        )
+        if entity is None:
+            # next_status never declines here, so the job is missing
+            raise KeyError(job_id)
+        self._track(job_id, status)
+        logger.info(f"[JOBS] Job {job_id} -> {status.value}")
+        return self._to_metadata(entity)
+
+    async def _transition(
+        self,
+        job_id: str,
+        next_status: Callable[[Dict], Optional[JobStatus]],
+        error_message: Optional[str] = None,
+        report_url: Optional[str] = None,
+    ) -> Optional[Dict]:
+        """
+        Read-validate-write a status change, conditional on the entity's ETag.
+
+        A concurrent change by another replica fails the conditional write;
+        the entity is then re-read and the transition re-validated against it.
+
+        Args:
+            job_id: Job ID
+            next_status: New status given the current entity (None leaves the job as is)
+            error_message: Error to record
+            report_url: Report URL to record
+
+        Returns:
+            The written entity, or None if the job is missing or next_status declined
+
+        Raises:
+            InvalidJobTransitionException: If the transition is not allowed
+            JobConflictException: If the job kept changing between read and write
+        """
+        from azure.core.exceptions import ResourceModifiedError
+
+        for _ in range(self.MAX_WRITE_ATTEMPTS):
+            current = await self._get_entity(job_id)
+            if current is None:
+                return None
+            status = next_status(current)
+            if status is None:
+                return None
+
+            validate_transition(job_id, JobStatus(current["status"]), status)
+
+            entity = dict(current)
+            now = datetime.utcnow().isoformat()
+            entity["status"] = status.value
+            if status == JobStatus.RUNNING and not entity.get("started_at"):
+                entity["started_at"] = now
+            if not VALID_TRANSITIONS[status]:
+                entity["completed_at"] = now
+            if error_message is not None:
+                entity["error_message"] = error_message
+            if report_url is not None:
+                entity["report_url"] = report_url
+            entity["owner_id"] = self.owner_id
+            entity["lease_expires_at"] = self._lease_expiry()
+
+            try:
+                await self._write_all(entity, etag=current.metadata["etag"])
+            except ResourceModifiedError:
+                logger.info(f"[JOBS] Job {job_id} changed concurrently, retrying")
+                continue
+            return entity
+
+        raise JobConflictException(f"Job {job_id}: too many concurrent updates")
+
+    async def list_jobs(
+        self,
+        limit: int = 50,
+        tenant_id: Optional[str] = None,
+        workspace_id: Optional[str] = None,
+        before: Optional[str] = None,
+    ) -> List[AuditJobMetadata]:
+        client = await self._client()
+
+        if workspace_id:
+            partition = self._workspace_partition(workspace_id)
+        elif tenant_id:
+            partition = f"tenant_{tenant_id}"
+        else:
+            partition = "all"
+
+        query = "PartitionKey eq @pk"
+        parameters = {"pk": partition}
+
+        if before:
+            cursor = await self._get_entity(before)
+            if cursor is not None:
+                query += " and RowKey gt @cursor"
+                parameters["cursor"] = cursor["sort_key"]
+
+        jobs = []
+        async for entity in client.query_entities(
+            query, parameters=parameters, results_per_page=min(limit, 1000)
+        ):
+            if workspace_id and tenant_id and entity.get("tenant_id") != tenant_id:
+                continue
+            jobs.append(self._to_metadata(entity))
+            if len(jobs) >= limit:
+                break
+
+        return jobs
+
+    async def _job_ids_in_states(self, states: Sequence[JobStatus]) -> List[str]:
+        client = await self._client()
+        parameters = {f"s{i}": state.value for i, state in enumerate(states)}
+        query = (
+            "PartitionKey eq 'job' and ("
+            + " or ".join(f"status eq @{name}" for name in parameters)
+            + ")"
+        )
+        return [
+            entity["job_id"]
+            async for entity in client.query_entities(
+                query, parameters=parameters, select=["job_id"]
+            )
+        ]
+
+    async def renew_leases(self):
+        from azure.core import MatchConditions
+        from azure.core.exceptions import ResourceModifiedError, ResourceNotFoundError
+        from azure.data.tables import UpdateMode
+
+        client = await self._client()
+        for job_id in list(self._owned):
+            entity = await self._get_entity(job_id)
+            if (
+                entity is None
+                or entity.get("owner_id") != self.owner_id
+                or JobStatus(entity["status"]) not in RUNNER_OWNED_STATES
+            ):
+                # Ended or taken over by another instance: no longer ours
+                self._owned.discard(job_id)
+                continue
+            try:
+                # Merge only the lease; a concurrent status change wins
+                await client.update_entity(
+                    {
+                        "PartitionKey": "job",
+                        "RowKey": job_id,
+                        "lease_expires_at": self._lease_expiry(),
+                    },
+                    mode=UpdateMode.MERGE,
+                    etag=entity.metadata["etag"],
+                    match_condition=MatchConditions.IfNotModified,
+                )
+            except (ResourceModifiedError, ResourceNotFoundError):
+                continue
+
+    async def _end_if_orphaned(self, job_id: str) -> bool:
+        def orphaned_status(entity: Dict) -> Optional[JobStatus]:
+            # Re-checked on every attempt, so a lease renewed meanwhile wins
+            current = JobStatus(entity["status"])
+            if current not in RUNNER_OWNED_STATES:
+                return None
+            lease = entity.get("lease_expires_at")
+            if lease and lease > datetime.utcnow().isoformat():
+                return None
+            return interrupted_status(current)
+
+        if await self._transition(job_id, orphaned_status, INTERRUPTED_MESSAGE) is None:
+            return False
+        logger.info(f"[JOBS] Job {job_id} orphaned (lease expired), ended")
+        return True
+
+    async def close(self):
+        await super().close()
+        if self._table_client is not None:
+            await self._table_client.close()
+            await self._credential.close()
+            self._table_client = None
+
+
+def create_job_store() -> JobStore:
+    """Build the job store selected by JOB_STORE_BACKEND"""
+    if settings.JOB_STORE_BACKEND == "table":
+        return TableStorageJobStore()
+    return SqliteJobStore()
+
+
+# ===== SINGLETON INSTANCE =====
+job_store = create_job_store()
@@ -0,0 +1,184 @@
+"""
+KQL Parse Cache
+
+Memoizes KQL parse results, keyed by the SHA-256 of the normalized query
+(comments stripped, whitespace collapsed). Rules created from the same
+Content Hub template share one entry, across rules and across audits.
+
+Two levels:
+- In-process LRU of KqlParseResult objects
+- Optional SQLite store (JSON results) that survives restarts
+
+Table positions are only valid for the exact text they were parsed from, so
+a hit on a differently formatted query returns the result without them.
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.config import settings
+from src.models.schemas import KqlParseResult
+
+logger = logging.getLogger(__name__)
+
+# Bump when parser output changes, so persisted results are not reused
+CACHE_VERSION = 2
+
+
+class KqlParseCache:
+    """Two-level (memory LRU + SQLite) cache of parse results"""
+
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS kql_parse_cache ("
+        "key TEXT PRIMARY KEY, query_hash TEXT NOT NULL, result TEXT NOT NULL)"
+    )
+
+    def __init__(self, max_entries: Optional[int] = None, path: Optional[str] = None):
+        """
+        Args:
+            max_entries: Max results kept in memory
+            path: SQLite file ("" disables persistence, ":memory:" for tests)
+        """
+        self.max_entries = max_entries or settings.KQL_PARSE_CACHE_MAX_ENTRIES
+        self.path = settings.KQL_PARSE_CACHE_PATH if path is None else path
+        self.hits = 0
+        self.misses = 0
+
+        # key -> (hash of the exact query text, result)
+        self._entries: "OrderedDict[str, Tuple[str, KqlParseResult]]" = OrderedDict()
+        self._pending: Dict[str, Tuple[str, KqlParseResult]] = {}
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+        if self.path:
+            try:
+                if self.path != ":memory:":
+                    os.makedirs(
+                        os.path.dirname(os.path.abspath(self.path)), exist_ok=True
+                    )
+                self._conn = sqlite3.connect(self.path, check_same_thread=False)
+                with self._conn:
+                    self._conn.execute(self.SCHEMA)
+            except sqlite3.Error as e:
+                logger.warning(
+                    f"[KQL] Parse cache store unavailable, memory only: {str(e)}"
+                )
+                self._conn = None
+
+    @staticmethod
+    def key(normalized_query: str) -> str:
+        """Cache key of a normalized query"""
+        return hashlib.sha256(
+            f"{CACHE_VERSION}:{normalized_query}".encode()
+        ).hexdigest()
+
+    @staticmethod
+    def _query_hash(query: str) -> str:
+        return hashlib.sha256(query.encode()).hexdigest()
+
+    def _remember(self, key: str, entry: Tuple[str, KqlParseResult]):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _load(self, key: str) -> Optional[Tuple[str, KqlParseResult]]:
+        if self._conn is None:
+            return None
+        try:
+            row = self._conn.execute(
+                "SELECT query_hash, result FROM kql_parse_cache WHERE key = ?", (key,)
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"[KQL] Parse cache read failed: {str(e)}")
+            return None
+        if row is None:
+            return None
+        return row[0], KqlParseResult.model_validate_json(row[1])
+
+    def get(self, query: str, normalized_query: str) -> Optional[KqlParseResult]:
+        """
+        Cached result for a query.
+
+        Args:
+            query: Raw query text
+            normalized_query: Query as normalized by the parser
+
+        Returns:
+            Copy of the cached result (from_cache=True), or None on a miss
+        """
+        key = self.key(normalized_query)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            else:
+                entry = self._load(key)
+                if entry is not None:
+                    self._remember(key, entry)
+
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+
+        query_hash, result = entry
+        update: Dict[str, Any] = {"from_cache": True}
+        if query_hash != self._query_hash(query):
+            update["table_references"] = []
+        return result.model_copy(update=update)
+
+    def put(self, query: str, normalized_query: str, result: KqlParseResult):
+        """
+        Cache a fresh parse result (persisted on the next flush()).
+
+        Args:
+            query: Raw query text
+            normalized_query: Query as normalized by the parser
+            result: Parse result for the raw query
+        """
+        key = self.key(normalized_query)
+        entry = (self._query_hash(query), result)
+        with self._lock:
+            self._remember(key, entry)
+            if self._conn is not None:
+                self._pending[key] = entry
+
+    def flush(self):
+        """Write pending results to the SQLite store in one transaction"""
+        with self._lock:
+            if not self._pending:
+                return
+            rows: List[Tuple[str, str, str]] = [
+                (key, query_hash, result.model_dump_json())
+                for key, (query_hash, result) in self._pending.items()
+            ]
+            self._pending.clear()
+            try:
+                with self._conn:
+                    self._conn.executemany(
+                        "INSERT OR REPLACE INTO kql_parse_cache (key, query_hash, result) "
+                        "VALUES (?, ?, ?)",
+                        rows,
+                    )
+            except sqlite3.Error as e:
+                logger.warning(f"[KQL] Parse cache write failed: {str(e)}")
+
+    def clear(self):
+        """Drop every cached result (memory and disk)"""
+        with self._lock:
+            self._entries.clear()
+            self._pending.clear()
+            self.hits = self.misses = 0
+            if self._conn is not None:
+                with self._conn:
+                    self._conn.execute("DELETE FROM kql_parse_cache")
+
+
+# ===== SINGLETON INSTANCE =====
+kql_parse_cache = KqlParseCache()
@@ -2,18 +2,35 @@
 KQL Parser Service
 
 Extracts table names from KQL queries using:
-1. AST parsing (python-kql library) - High confidence
+1. Structural parsing (single-pass lexer, see kql_lexer) - High confidence
 2. Regex fallback - Medium/Low confidence
 
-All parsing results include confidence scores and parsing method.
+All parsing results include confidence scores and parsing method. Results
+are memoized by normalized query (see kql_parse_cache), so rules built from
+the same template are parsed once.
+
+Given the workspace's saved functions and table catalog, results are then
+expanded (functions, wildcard unions - see kql_resolver) and restricted to
+tables that exist; queries the structural parser cannot attribute are
+matched against the catalog directly (parsing_method "CATALOG").
 """
 
 import re
 import logging
-from typing import List, Set, Tuple
+import multiprocessing
+import os
+import sys
+import threading
+from concurrent.futures import BrokenExecutor, Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, List, Optional, Set, Tuple
 from enum import Enum
 
-from src.models.schemas import KqlParseResult, ConfidenceLevel
+from src.config import settings
+from src.models.schemas import KqlParseResult, KqlTableReference, ConfidenceLevel
+from src.services.kql_lexer import extract_table_references
+from src.services.kql_parse_cache import KqlParseCache, kql_parse_cache
+from src.services.kql_resolver import KqlResolver
+from src.services.table_catalog import TableCatalog
 
 logger = logging.getLogger(__name__)
 
@@ -21,41 +38,163 @@ logger = logging.getLogger(__name__)
 class KqlParser:
     """KQL query parser for table extraction"""
 
-    # Common table name patterns in Sentinel
-    COMMON_TABLES = {
-        "SecurityEvent", "SigninLogs", "AuditLogs", "AADManagedIdentitySignInLogs",
-        "AADNonInteractiveUserSignInLogs", "AADServicePrincipalSignInLogs",
-        "AADUserRiskEvents", "AADIdentityProtectionAllRiskEvents",
-        "CommonSecurityLog", "Syslog", "CiscoASAConnection", "CiscoASADns",
-        "CiscoASAFirewall", "Fortinet_FortiGate_log", "PaloAltoNetworks_PAN_OS",
-        "WindowsEvent", "WaaSUpdateStatus", "Update", "UpdateRunProgress",
-        "OfficeActivity", "DnsEvents", "HTTPProxy", "URLFilter",
-        "HealthStateChangeEvents", "WAFLogs", "AppServiceHTTPLogs",
-        "ApiManagementGatewayLogs", "ApplicationInsights", "ExceptionEvents",
-        "Heartbeat", "Perf", "ContainerLog", "ContainerLogV2",
-        "Kubernetes Events", "KubeEvents", "KubeNodeInventory", "KubePodInventory",
-        "AzureActivity", "AzureDiagnostics", "StorageBlob", "StorageQueue",
-        "StorageTable", "StorageFile"
-    }
-
-    # Regex patterns for table references
+    # Regex patterns for table references, compiled once:
+    # (pattern, base confidence, keyword the query must contain)
+    # Possessive quantifiers and explicit letter classes (instead of
+    # IGNORECASE) keep each pattern a single scan without backtracking.
     REGEX_PATTERNS = [
         # Simple table reference: TableName
-        (r'\b([A-Z][a-zA-Z0-9_]*)\b(?=\s*[\|\;]|$)', 1.0),
+        (re.compile(r'\b([A-Za-z][A-Za-z0-9_]*+)(?=\s*+[|;]|$)', re.MULTILINE), 1.0, None),
         # workspace() qualified: workspace("name").TableName
-        (r'workspace\s*\(\s*["\']([^"\']+)["\']\s*\)\s*\.\s*([A-Z][a-zA-Z0-9_]*)', 0.9),
+        (re.compile(
+            r'(?i:workspace)\s*\(\s*["\']([^"\']+)["\']\s*\)\s*\.\s*([A-Za-z][A-Za-z0-9_]*)'
+        ), 0.9, "workspace"),
         # union statements: union Table1, Table2, ...
-        (r'union\s+\(?([A-Z][a-zA-Z0-9_]*(?:\s*,\s*[A-Z][a-zA-Z0-9_]*)*)\)?', 0.85),
+        (re.compile(
+            r'(?i:union)\s+\(?([A-Za-z][A-Za-z0-9_]*(?:\s*,\s*[A-Za-z][A-Za-z0-9_]*)*)\)?'
+        ), 0.85, "union"),
         # datatable references
-        (r'datatable\s*\([^)]+\)\s*\[\s*([A-Z][a-zA-Z0-9_]*)', 0.75),
+        (re.compile(
+            r'(?i:datatable)\s*\([^)]+\)\s*\[\s*([A-Za-z][A-Za-z0-9_]*)'
+        ), 0.75, "datatable"),
     ]
 
-    def parse(self, kql_query: str) -> KqlParseResult:
+    LINE_COMMENT = re.compile(r'//.*$', re.MULTILINE)
+    BLOCK_COMMENT = re.compile(r'/\*.*?\*/', re.DOTALL)
+    VALID_TABLE_NAME = re.compile(r'[A-Za-z_][A-Za-z0-9_]*+')
+
+    # KQL keywords that are never table names (lowercase)
+    KQL_KEYWORDS = frozenset({
+        'where', 'project', 'summarize', 'count', 'sum', 'avg', 'min', 'max',
+        'sort', 'limit', 'take', 'union', 'join', 'let', 'print', 'extend',
+        'distinct', 'top', 'range', 'as', 'by', 'on', 'with', 'between',
+        'in', 'and', 'or', 'not', 'has', 'contains', 'startswith', 'endswith',
+        'matches', 'regex', 'timespan', 'ago', 'now', 'datetime',
+        'strcat', 'tolower', 'toupper', 'split', 'parse', 'select'
+    })
+
+    def __init__(
+        self,
+        cache: Optional[KqlParseCache] = None,
+        workers: Optional[int] = None,
+        parallel_threshold: Optional[int] = None,
+        chunk_size: Optional[int] = None
+    ):
+        """
+        Args:
+            cache: Parse result cache (defaults to the shared instance)
+            workers: Parse worker pool size (0 = one per CPU, 1 = always serial)
+            parallel_threshold: Uncached queries below which a batch stays serial
+            chunk_size: Queries sent to a worker at a time
+        """
+        self.cache = kql_parse_cache if cache is None else cache
+        workers = settings.KQL_PARSE_WORKERS if workers is None else workers
+        self.workers = workers or os.cpu_count() or 1
+        self.parallel_threshold = parallel_threshold or settings.KQL_PARSE_PARALLEL_THRESHOLD
+        self.chunk_size = chunk_size or settings.KQL_PARSE_CHUNK_SIZE
+        self._executor: Optional[Executor] = None
+        self._executor_lock = threading.Lock()  # rule and artifact batches parse concurrently
+
+    def parse(
+        self,
+        kql_query: str,
+        catalog: Optional[TableCatalog] = None,
+        resolver: Optional[KqlResolver] = None
+    ) -> KqlParseResult:
+        """
+        Parse KQL query and extract table names, using the parse cache.
+
+        Args:
+            kql_query: Raw KQL query string
+            catalog: Workspace tables (restricts the result to known tables)
+            resolver: Saved function / wildcard expansion for this audit
+
+        Returns:
+            KqlParseResult with extracted tables and confidence
+        """
+        result = self._parse_cached(kql_query)
+        self.cache.flush()
+        return self._attribute(kql_query, result, catalog, resolver)
+
+    def _attribute(
+        self,
+        kql_query: str,
+        result: KqlParseResult,
+        catalog: Optional[TableCatalog],
+        resolver: Optional[KqlResolver] = None
+    ) -> KqlParseResult:
+        """
+        Resolve functions/wildcards and restrict a parse result to tables in
+        the workspace catalog.
+
+        Structural (AST) results keep their known tables. Anything else - regex
+        results, failures, or AST results naming only unknown sources - is
+        replaced by a one-pass catalog match over the query text.
+
+        Args:
+            kql_query: Raw KQL query string
+            result: Catalog-independent (cacheable) parse result
+            catalog: Workspace tables, or None to skip the restriction
+            resolver: Saved function / wildcard expansion, if any
+
+        Returns:
+            Attributed parse result
+        """
+        if resolver is not None:
+            result = resolver.resolve(result)
+        if catalog is None or not kql_query or not kql_query.strip():
+            return result
+
+        if result.parsing_method == "AST":
+            tables = [table for table in result.tables if table in catalog]
+            if tables:
+                return result.model_copy(update={
+                    "tables": tables,
+                    "table_references": [
+                        reference for reference in result.table_references
+                        if reference.wildcard or reference.table_name in catalog
+                    ]
+                })
+
+        matches = catalog.find(kql_query)
+        if not matches:
+            return result.model_copy(update={
+                "tables": [],
+                "confidence": ConfidenceLevel.LOW,
+                "success": False,
+                "error_message": "No workspace tables referenced"
+            })
+
+        return result.model_copy(update={
+            "tables": list(dict.fromkeys(name for name, _, _ in matches)),
+            "confidence": ConfidenceLevel.MEDIUM,
+            "parsing_method": "CATALOG",
+            "success": True,
+            "error_message": None,
+            "table_references": [
+                KqlTableReference(table_name=name, start=start, end=end)
+                for name, start, end in matches
+            ]
+        })
+
+    def _parse_cached(self, kql_query: str) -> KqlParseResult:
+        """Cached result for a query, parsing (and caching) it on a miss"""
+        if not kql_query or not kql_query.strip():
+            return self._parse_uncached(kql_query)
+
+        normalized_query = self._clean_kql(kql_query)
+        result = self.cache.get(kql_query, normalized_query)
+        if result is None:
+            result = self._parse_uncached(kql_query)
+            self.cache.put(kql_query, normalized_query, result)
+        return result
+
+    def _parse_uncached(self, kql_query: str) -> KqlParseResult:
         """
         Parse KQL query and extract table names.
 
         Strategy:
-        1. Try AST parsing (python-kql)
+        1. Try structural parsing (kql_lexer)
         2. Fall back to regex matching
         3. Return results with confidence scores
 
@@ -75,15 +214,36 @@ class KqlParser:
             )
 
         try:
-            # Attempt 1: Try python-kql AST parsing
-            tables = self._parse_with_ast(kql_query)
+            # Attempt 1: Structural parsing
+            references = self._parse_with_ast(kql_query)
+            tables = list(dict.fromkeys(
+                reference.table_name for reference in references
+                if not reference.wildcard and not reference.function_call
+            ))
+            unresolved_sources = list(dict.fromkeys(
+                reference.table_name for reference in references
+                if reference.wildcard or reference.function_call
+            ))
             if tables:
                 logger.debug(f"[KQL] AST parsing found {len(tables)} tables")
                 return KqlParseResult(
-                    tables=list(tables),
+                    tables=tables,
                     confidence=ConfidenceLevel.HIGH,
                     parsing_method="AST",
-                    success=True
+                    success=True,
+                    table_references=references,
+                    unresolved_sources=unresolved_sources
+                )
+            if unresolved_sources:
+                # Only functions/wildcards: tables are known once they are resolved
+                return KqlParseResult(
+                    tables=[],
+                    confidence=ConfidenceLevel.LOW,
+                    parsing_method="AST",
+                    success=False,
+                    error_message="Only functions or wildcard unions referenced",
+                    table_references=references,
+                    unresolved_sources=unresolved_sources
                 )
 
         except Exception as e:
@@ -91,11 +251,14 @@ class KqlParser:
 
         try:
             # Attempt 2: Regex fallback
-            tables, confidence = self._parse_with_regex(kql_query)
-            if tables:
-                logger.debug(f"[KQL] Regex parsing found {len(tables)} tables (confidence: {confidence})")
+            regex_tables, confidence = self._parse_with_regex(kql_query)
+            if regex_tables:
+                logger.debug(
+                    f"[KQL] Regex parsing found {len(regex_tables)} tables "
+                    f"(confidence: {confidence})"
+                )
                 return KqlParseResult(
-                    tables=list(tables),
+                    tables=list(regex_tables),
                     confidence=confidence,
                     parsing_method="REGEX",
                     success=True
@@ -113,27 +276,17 @@ class KqlParser:
             error_message="No tables extracted"
         )
 
-    def _parse_with_ast(self, kql_query: str) -> Set[str]:
+    def _parse_with_ast(self, kql_query: str) -> List[KqlTableReference]:
         """
-        Parse KQL using python-kql AST parser.
+        Parse KQL with the single-pass structural lexer.
 
         Returns:
-            Set of table names found
-        """
-        try:
-            # This is a simplified implementation
-            # In production, use the actual python-kql library
-            # from kql_ast_parser import Parser
-            # parser = Parser()
-            # ast = parser.parse(kql_query)
-            # return self._extract_tables_from_ast(ast)
+            Table references in order of appearance
 
-            # For now, just use regex as fallback
-            return set()
-
-        except Exception as e:
-            logger.debug(f"[KQL] AST parsing error: {str(e)}")
-            return set()
+        Raises:
+            KqlParseException: If the query is not well-formed
+        """
+        return extract_table_references(kql_query)
 
     def _parse_with_regex(self, kql_query: str) -> Tuple[Set[str], ConfidenceLevel]:
         """
@@ -147,31 +300,24 @@ class KqlParser:
 
         # Clean up query (remove comments, normalize whitespace)
         cleaned_query = self._clean_kql(kql_query)
-
-        # Try each regex pattern
-        for pattern, base_confidence in self.REGEX_PATTERNS:
-            try:
-                matches = re.findall(pattern, cleaned_query, re.MULTILINE | re.IGNORECASE)
-                for match in matches:
-                    # Handle tuple returns from groups
-                    if isinstance(match, tuple):
-                        for group in match:
-                            if group and group.strip():
-                                table_name = group.strip().split()[0]  # Get first word if multiple
-                                if self._is_valid_table_name(table_name):
-                                    tables.add(table_name)
-                    else:
-                        if match and match.strip():
-                            table_name = match.strip().split()[0]
-                            if self._is_valid_table_name(table_name):
-                                tables.add(table_name)
-
-                    # Track max numeric confidence score
-                    if base_confidence > max_confidence_score:
-                        max_confidence_score = base_confidence
-
-            except Exception as e:
-                logger.debug(f"[KQL] Regex pattern failed: {str(e)}")
+        lowered_query = cleaned_query.lower()
+
+        # Try each regex pattern (skipping those whose keyword is absent)
+        for pattern, base_confidence, keyword in self.REGEX_PATTERNS:
+            if keyword is not None and keyword not in lowered_query:
+                continue
+            matches = pattern.findall(cleaned_query)
+            for match in matches:
+                # Handle tuple returns from groups
+                for group in (match if isinstance(match, tuple) else (match,)):
+                    if group and group.strip():
+                        table_name = group.strip().split()[0]  # Get first word if multiple
+                        if self._is_valid_table_name(table_name):
+                            tables.add(table_name)
+
+            # Track max numeric confidence score
+            if matches and base_confidence > max_confidence_score:
+                max_confidence_score = base_confidence
 
         # Convert numeric score to confidence level
         if not tables:
@@ -186,75 +332,196 @@ class KqlParser:
     def _clean_kql(self, kql_query: str) -> str:
         """Clean KQL query for parsing"""
         # Remove comments
-        kql = re.sub(r'//.*$', '', kql_query, flags=re.MULTILINE)
-        kql = re.sub(r'/\*.*?\*/', '', kql, flags=re.DOTALL)
-
-        # Normalize whitespace
-        kql = re.sub(r'\s+', ' ', kql)
+        kql = self.LINE_COMMENT.sub('', kql_query) if '//' in kql_query else kql_query
+        kql = self.BLOCK_COMMENT.sub('', kql) if '/*' in kql else kql
 
-        return kql.strip()
+        # Normalize whitespace (str.split() and re's \s agree on whitespace)
+        return ' '.join(kql.split())
 
     def _is_valid_table_name(self, name: str) -> bool:
         """Check if string is a valid table name"""
-        if not name:
-            return False
-
         # Table names should:
         # - Start with letter or underscore
         # - Contain alphanumeric and underscores only
         # - Not be a KQL keyword
-        if not re.match(r'^[A-Za-z_][A-Za-z0-9_]*$', name):
-            return False
-
-        # Check against KQL keywords
-        kql_keywords = {
-            'where', 'project', 'summarize', 'count', 'sum', 'avg', 'min', 'max',
-            'sort', 'limit', 'take', 'union', 'join', 'let', 'print', 'extend',
-            'distinct', 'top', 'range', 'as', 'by', 'on', 'with', 'between',
-            'in', 'and', 'or', 'not', 'has', 'contains', 'startswith', 'endswith',
-            'matches', 'regex', 'timespan', 'ago', 'now', 'datetime',
-            'strcat', 'tolower', 'toupper', 'split', 'parse', 'select'
-        }
-
-        return name.lower() not in kql_keywords
-
-    def batch_parse(self, kql_queries: List[str]) -> List[KqlParseResult]:
+        return (
+            bool(name)
+            and self.VALID_TABLE_NAME.fullmatch(name) is not None
+            and name.lower() not in self.KQL_KEYWORDS
+        )
+
+    def _parse_isolated(self, kql_query: str) -> KqlParseResult:
+        """Parse one query; any failure becomes an unsuccessful result"""
+        try:
+            return self._parse_uncached(kql_query)
+        except Exception as e:
+            logger.error(f"[KQL] Query parsing failed: {str(e)}")
+            return KqlParseResult(
+                tables=[],
+                confidence=ConfidenceLevel.LOW,
+                parsing_method="REGEX",
+                success=False,
+                error_message=str(e)
+            )
+
+    @property
+    def executor(self) -> Optional[Executor]:
+        """
+        Worker pool for large batches (created on first use).
+
+        Processes sidestep the GIL; on a free-threaded interpreter threads
+        do the same without pickling. None if parallelism is disabled or the
+        pool cannot be created.
+        """
+        with self._executor_lock:
+            if self._executor is None and self.workers > 1:
+                try:
+                    if not getattr(sys, "_is_gil_enabled", lambda: True)():
+                        self._executor = ThreadPoolExecutor(
+                            max_workers=self.workers, thread_name_prefix="kql-parse"
+                        )
+                    else:
+                        # spawn: batch_parse runs on a thread, and forking a
+                        # threaded process is unsafe
+                        self._executor = ProcessPoolExecutor(
+                            max_workers=self.workers,
+                            mp_context=multiprocessing.get_context("spawn"),
+                        )
+                    logger.info(f"[KQL] Parse worker pool started ({self.workers} workers)")
+                except (OSError, NotImplementedError) as e:
+                    logger.warning(
+                        f"[KQL] Parse worker pool unavailable, parsing serially: {str(e)}"
+                    )
+                    self.workers = 1
+            return self._executor
+
+    def _parse_many(self, kql_queries: List[str]) -> List[KqlParseResult]:
+        """
+        Parse queries (no cache), in chunks across the worker pool for large batches.
+
+        Returns:
+            Results in input order
+        """
+        executor = self.executor if len(kql_queries) >= self.parallel_threshold else None
+        if executor is None:
+            return [self._parse_isolated(query) for query in kql_queries]
+
+        chunk_size = self.chunk_size
+        chunks = [kql_queries[i:i + chunk_size] for i in range(0, len(kql_queries), chunk_size)]
+        try:
+            futures = [executor.submit(_parse_chunk, chunk) for chunk in chunks]
+        except (BrokenExecutor, RuntimeError) as e:
+            logger.warning(f"[KQL] Parse worker pool unusable, parsing serially: {str(e)}")
+            self.shutdown()
+            return [self._parse_isolated(query) for query in kql_queries]
+
+        results: List[KqlParseResult] = []
+        for chunk, future in zip(chunks, futures):
+            try:
+                results.extend(future.result())
+            except Exception as e:
+                # Worker crashed (e.g. killed): parse this chunk here instead
+                logger.warning(f"[KQL] Parse worker failed, parsing chunk serially: {str(e)}")
+                if isinstance(e, BrokenExecutor):
+                    self.shutdown()  # a fresh pool is started for the next batch
+                results.extend(self._parse_isolated(query) for query in chunk)
+        return results
+
+    def batch_parse(
+        self,
+        kql_queries: List[str],
+        catalog: Optional[TableCatalog] = None,
+        resolver: Optional[KqlResolver] = None,
+        write_cache: bool = True
+    ) -> List[KqlParseResult]:
         """
         Parse multiple KQL queries.
 
+        Cached results are served first; each distinct uncached query is
+        parsed once, across the worker pool when there are at least
+        parallel_threshold of them. A query that fails to parse yields an
+        unsuccessful result without affecting the others.
+
         Args:
             kql_queries: List of KQL query strings
+            catalog: Workspace tables (restricts results to known tables)
+            resolver: Saved function / wildcard expansion for this audit
+            write_cache: Store fresh results in the parse cache (off for
+                one-off queries, which would evict rule entries)
 
         Returns:
-            List of parse results
+            List of parse results (same order as kql_queries)
         """
         logger.info(f"[KQL] Batch parsing {len(kql_queries)} queries")
 
-        results = []
+        parsed: List[Optional[KqlParseResult]] = [None] * len(kql_queries)
+        pending: Dict[str, List[int]] = {}  # normalized query -> indices waiting on it
+        uncacheable: List[int] = []
+
         for i, query in enumerate(kql_queries):
-            try:
-                result = self.parse(query)
-                results.append(result)
-            except Exception as e:
-                logger.error(f"[KQL] Query {i} parsing failed: {str(e)}")
-                results.append(
-                    KqlParseResult(
-                        tables=[],
-                        confidence=ConfidenceLevel.LOW,
-                        parsing_method="REGEX",
-                        success=False,
-                        error_message=str(e)
-                    )
-                )
+            if not query or not query.strip():
+                uncacheable.append(i)
+                continue
+            normalized_query = self._clean_kql(query)
+            if normalized_query in pending:
+                pending[normalized_query].append(i)
+                continue
+            result = self.cache.get(query, normalized_query)
+            if result is None:
+                pending[normalized_query] = [i]
+            else:
+                parsed[i] = result
+
+        # One parse per distinct query; later copies in the batch are cache hits
+        first_indices = [indices[0] for indices in pending.values()] + uncacheable
+        first_results = self._parse_many([kql_queries[i] for i in first_indices])
+        for i, result in zip(first_indices, first_results):
+            parsed[i] = result
+
+        for normalized_query, indices in pending.items():
+            first = parsed[indices[0]]
+            assert first is not None
+            if write_cache:
+                self.cache.put(kql_queries[indices[0]], normalized_query, first)
+            for i in indices[1:]:
+                # Re-parse if not cached, or a large batch already evicted the entry
+                cached = self.cache.get(kql_queries[i], normalized_query) if write_cache else None
+                parsed[i] = cached or self._parse_uncached(kql_queries[i])
+
+        self.cache.flush()
+
+        # Every slot is filled by now: a cache hit, a parse, or a copy of one
+        results: List[KqlParseResult] = [result for result in parsed if result is not None]
+
+        if catalog is not None or resolver is not None:
+            results = [
+                self._attribute(query, result, catalog, resolver)
+                for query, result in zip(kql_queries, results)
+            ]
 
         # Calculate overall success rate
         success_count = sum(1 for r in results if r.success)
         success_rate = success_count / len(results) if results else 0.0
+        cache_hits = sum(1 for r in results if r.from_cache)
 
-        logger.info(f"[KQL] Batch parse completed: {success_rate:.1%} success rate")
+        logger.info(
+            f"[KQL] Batch parse completed: {success_rate:.1%} success rate, "
+            f"{cache_hits}/{len(results)} from cache"
+        )
 
         return results
 
+    def shutdown(self):
+        """Stop the parse worker pool"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+def _parse_chunk(kql_queries: List[str]) -> List[KqlParseResult]:
+    """Worker pool entry point: parse a chunk of queries without the cache"""
+    return [kql_parser._parse_isolated(query) for query in kql_queries]
+
 
 # ===== SINGLETON INSTANCE =====
 kql_parser = KqlParser()
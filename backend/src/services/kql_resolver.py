@@ -0,0 +1,151 @@
+"""
+KQL Function and Wildcard Resolver
+
+Rules that read through saved workspace functions (ASIM parsers such as
+`_Im_Dns`, or custom parsers) or wildcard unions (`union withsource=T
+Syslog*`) name no table directly. The resolver expands them for one audit:
+- saved functions are fetched once (saved_searches.list_by_workspace) and
+  their bodies expanded recursively, with cycle detection
+- wildcards are matched against the workspace table catalog
+
+Each function body is parsed at most once per audit, however many rules
+call it. `let` bindings are already resolved in place by the lexer.
+"""
+
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from src.models.schemas import ConfidenceLevel, KqlParseResult, WorkspaceFunction
+from src.services.kql_lexer import PARAMETER, extract_table_references
+from src.services.table_catalog import TableCatalog
+from src.utils.errors import KqlParseException
+
+logger = logging.getLogger(__name__)
+
+
+class KqlResolver:
+    """Per-audit expansion of saved functions and wildcard unions"""
+
+    def __init__(
+        self,
+        functions: Iterable[WorkspaceFunction] = (),
+        catalog: Optional[TableCatalog] = None,
+    ):
+        """
+        Args:
+            functions: Saved functions of the workspace
+            catalog: Workspace tables (wildcards expand to nothing without it)
+        """
+        self.functions: Dict[str, WorkspaceFunction] = {
+            function.function_alias: function for function in functions
+        }
+        self.catalog = catalog
+        self.bodies_parsed = 0
+        self._resolved: Dict[str, List[str]] = {}
+        self._resolving: Set[str] = set()
+
+    def _expand(self, name: str, wildcard: bool) -> Optional[List[str]]:
+        """Tables behind a source name, or None if it is not expandable"""
+        if wildcard:
+            return self.catalog.expand(name) if self.catalog is not None else []
+        if name in self.functions:
+            return self.resolve_function(name)
+        return None
+
+    def resolve_function(self, alias: str) -> List[str]:
+        """
+        Tables read by a saved function, following nested functions.
+
+        Args:
+            alias: Function alias
+
+        Returns:
+            Table names (memoized; [] for a cyclic reference)
+        """
+        resolved = self._resolved.get(alias)
+        if resolved is not None:
+            return resolved
+        if alias in self._resolving:
+            logger.warning(f"[KQL] Cyclic function reference: {alias}")
+            return []
+
+        self._resolving.add(alias)
+        try:
+            resolved = self._resolve_body(self.functions[alias])
+        finally:
+            self._resolving.discard(alias)
+
+        self._resolved[alias] = resolved
+        return resolved
+
+    def _resolve_body(self, function: WorkspaceFunction) -> List[str]:
+        self.bodies_parsed += 1
+        parameters = set(PARAMETER.findall(function.function_parameters or ""))
+
+        try:
+            references = extract_table_references(function.query)
+        except KqlParseException as e:
+            logger.warning(
+                f"[KQL] Could not parse function {function.function_alias}: {str(e)}"
+            )
+            if self.catalog is None:
+                return []
+            return list(
+                dict.fromkeys(name for name, _, _ in self.catalog.find(function.query))
+            )
+
+        tables: List[str] = []
+        for reference in references:
+            if reference.table_name in parameters and not reference.function_call:
+                continue  # tabular parameter, bound by the caller
+            expanded = self._expand(reference.table_name, reference.wildcard)
+            if expanded is not None:
+                tables.extend(expanded)
+            elif not reference.function_call:
+                tables.append(reference.table_name)
+        return list(dict.fromkeys(tables))
+
+    def resolve(self, result: KqlParseResult) -> KqlParseResult:
+        """
+        Expand the functions and wildcards of a parse result into tables.
+
+        Args:
+            result: Parse result (from the parser or the cache)
+
+        Returns:
+            Result with expanded tables; sources that cannot be expanded
+            (built-in functions, unknown names) stay in unresolved_sources
+        """
+        if not result.unresolved_sources and not any(
+            table in self.functions for table in result.tables
+        ):
+            return result
+
+        tables: List[str] = []
+        for table in result.tables:
+            expanded = self._expand(table, wildcard=False)
+            tables.extend([table] if expanded is None else expanded)
+
+        unresolved: List[str] = []
+        for source in result.unresolved_sources:
+            expanded = self._expand(source, wildcard="*" in source)
+            if expanded is None:
+                unresolved.append(source)
+            else:
+                tables.extend(expanded)
+
+        update: Dict[str, Any] = {
+            "tables": list(dict.fromkeys(tables)),
+            "unresolved_sources": unresolved,
+        }
+        if tables and not result.success:
+            update.update(
+                success=True,
+                error_message=None,
+                confidence=(
+                    ConfidenceLevel.HIGH
+                    if result.parsing_method == "AST"
+                    else result.confidence
+                ),
+            )
+        return result.model_copy(update=update)
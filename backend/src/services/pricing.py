@@ -0,0 +1,363 @@
+"""
+Pricing Service
+
+Log Analytics retail prices for cost calculations.
+
+Prices are prefetched from the Azure Retail Prices API at startup (following
+NextPageLink paging), held in a PriceIndex keyed by
+(region, currency, tier, commitment), and refreshed in the background when
+the TTL expires. Each successful fetch is written to a JSON snapshot on disk, which is loaded
+first on startup so offline and air-gapped deployments still get real prices.
+
+Lookups are plain dict reads - audits never wait on the network.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import re
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+from src.config import settings
+
+logger = logging.getLogger(__name__)
+
+RETAIL_PRICES_URL = "https://prices.azure.com/api/retail/prices"
+RETAIL_PRICES_API_VERSION = "2023-01-01-preview"
+
+# Table tier -> (meter name, sku name) of its pay-as-you-go meter
+TIER_METERS = {
+    "Hot": ("Analytics Logs Data Ingestion", "Analytics Logs"),
+    "Basic": ("Basic Logs Data Ingestion", "Basic Logs"),
+    "Archive": ("Data Archive", "Pay-as-you-go"),
+}
+_PAYG_METERS = {meter: tier for tier, meter in TIER_METERS.items()}
+
+# Commitment tiers are billed per day for a fixed GB/day (Analytics logs only)
+_COMMITMENT_SKU = re.compile(r"^(\d+) GB Commitment Tier$")
+
+PriceKey = Tuple[str, str, str, int]  # (region, currency, tier, commitment GB/day)
+
+
+def classify_price_item(item: Dict) -> Optional[Tuple[str, int, float]]:
+    """
+    Map a Retail Prices API item to (tier, commitment, price per GB).
+
+    Returns:
+        None for meters that are not used in cost calculations
+    """
+    # Tiered meters have several rows; the first (lowest) tier is the list price
+    if item.get("tierMinimumUnits", 0) > 0:
+        return None
+
+    price = float(item["unitPrice"])
+    commitment = _COMMITMENT_SKU.match(item["skuName"])
+    if commitment:
+        if not item["meterName"].endswith("Capacity Reservation"):
+            return None
+        level = int(commitment.group(1))
+        # Daily reservation price -> effective per-GB rate
+        return "Hot", level, price / level
+
+    tier = _PAYG_METERS.get((item["meterName"], item["skuName"]))
+    if tier is None:
+        return None
+    return tier, 0, price
+
+
+class PriceIndex:
+    """
+    Per-GB prices keyed by (region, currency, tier, commitment).
+
+    commitment is the commitment tier in GB/day, 0 for pay-as-you-go.
+    """
+
+    def __init__(self):
+        self._prices: Dict[PriceKey, float] = {}
+
+    @classmethod
+    def from_items(
+        cls, items: List[Dict], default_currency: str = "USD"
+    ) -> "PriceIndex":
+        """Build an index from Retail Prices API items"""
+        index = cls()
+        for item in items:
+            classified = classify_price_item(item)
+            if classified is None:
+                continue
+            tier, commitment, price = classified
+            index.add(
+                item["armRegionName"],
+                item.get("currencyCode", default_currency),
+                tier,
+                commitment,
+                price,
+            )
+        return index
+
+    def add(self, region: str, currency: str, tier: str, commitment: int, price: float):
+        """Add a price (the first price for a key wins)"""
+        self._prices.setdefault(
+            (region.lower(), currency.upper(), tier, commitment), price
+        )
+
+    def get(
+        self, region: str, currency: str, tier: str, commitment: int = 0
+    ) -> Optional[float]:
+        """Per-GB price for an exact key, or None"""
+        return self._prices.get((region.lower(), currency.upper(), tier, commitment))
+
+    def commitment_levels(self, region: str, currency: str) -> List[int]:
+        """Commitment tiers (GB/day) priced for a region, ascending"""
+        region, currency = region.lower(), currency.upper()
+        return sorted(
+            key[3]
+            for key in self._prices
+            if key[0] == region and key[1] == currency and key[3] > 0
+        )
+
+    def __len__(self) -> int:
+        return len(self._prices)
+
+
+class PricingService:
+    """In-memory retail price index with TTL refresh and disk snapshot"""
+
+    def __init__(
+        self,
+        region: Optional[str] = None,
+        currency: Optional[str] = None,
+        regions: Optional[List[str]] = None,
+        currencies: Optional[List[str]] = None,
+        ttl_seconds: Optional[int] = None,
+        snapshot_path: Optional[str] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        """
+        Args:
+            region: Default ARM region when a workspace's region is unknown
+            currency: Default currency code
+            regions: Regions to fetch (empty = all regions)
+            currencies: Currencies to fetch
+            ttl_seconds: Age after which prices are refreshed
+            snapshot_path: JSON snapshot file ("" disables the snapshot)
+            transport: Optional httpx transport (tests)
+        """
+        self.region = (region or settings.PRICING_REGION).lower()
+        self.currency = (currency or settings.PRICING_CURRENCY).upper()
+        self.regions = [
+            r.lower()
+            for r in (settings.PRICING_REGIONS if regions is None else regions)
+        ]
+        self.currencies = [
+            c.upper() for c in (currencies or settings.PRICING_CURRENCIES)
+        ]
+        self.ttl_seconds = ttl_seconds or settings.PRICING_CACHE_TTL_SECONDS
+        self.snapshot_path = (
+            settings.PRICING_SNAPSHOT_PATH if snapshot_path is None else snapshot_path
+        )
+        self._transport = transport
+
+        self.index = PriceIndex()
+        self.fetched_at: Optional[float] = None  # epoch seconds of the loaded prices
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._refresh_lock = asyncio.Lock()
+
+    # ----- lookups (never touch the network) -----
+
+    def get_price(
+        self,
+        tier: str,
+        region: Optional[str] = None,
+        currency: Optional[str] = None,
+        commitment: int = 0,
+    ) -> Optional[float]:
+        """
+        Per-GB price for a table tier.
+
+        Commitment tiers only apply to Analytics (Hot) ingestion; other tiers,
+        and commitment levels missing from the index, use pay-as-you-go rates.
+
+        Returns:
+            Unit price, or None if the tier/region/currency is not in the index
+        """
+        region = region or self.region
+        currency = currency or self.currency
+
+        if commitment and tier == "Hot":
+            price = self.index.get(region, currency, tier, commitment)
+            if price is not None:
+                return price
+
+        return self.index.get(region, currency, tier)
+
+    @property
+    def is_stale(self) -> bool:
+        return (
+            self.fetched_at is None or time.time() - self.fetched_at >= self.ttl_seconds
+        )
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    # ----- loading -----
+
+    def _load_items(self, items: List[Dict], fetched_at: float):
+        """Swap in a new index built from API/snapshot items"""
+        self.index = PriceIndex.from_items(items, self.currency)
+        self.fetched_at = fetched_at
+
+    async def fetch_prices(self) -> List[Dict]:
+        """
+        Fetch Log Analytics consumption prices for every configured currency.
+
+        Follows NextPageLink until the last page.
+        """
+        price_filter = "serviceName eq 'Log Analytics' and priceType eq 'Consumption'"
+        if self.regions:
+            region_filter = " or ".join(f"armRegionName eq '{r}'" for r in self.regions)
+            price_filter += f" and ({region_filter})"
+
+        items: List[Dict] = []
+
+        async with httpx.AsyncClient(
+            transport=self._transport, timeout=settings.PRICING_FETCH_TIMEOUT_SECONDS
+        ) as client:
+            for currency in self.currencies:
+                params: Optional[Dict[str, str]] = {
+                    "api-version": RETAIL_PRICES_API_VERSION,
+                    "currencyCode": currency,
+                    "$filter": price_filter,
+                }
+                url: Optional[str] = RETAIL_PRICES_URL
+                while url:
+                    response = await client.get(url, params=params)
+                    response.raise_for_status()
+                    page = response.json()
+                    for item in page.get("Items", []):
+                        item.setdefault("currencyCode", currency)
+                        items.append(item)
+                    # NextPageLink already carries the query string
+                    url, params = page.get("NextPageLink"), None
+
+        return items
+
+    async def refresh(self) -> bool:
+        """
+        Re-fetch prices and persist a snapshot.
+
+        Returns:
+            True on success; on failure the previous prices stay in place
+        """
+        async with self._refresh_lock:
+            try:
+                items = await self.fetch_prices()
+            except Exception as e:
+                logger.warning(
+                    f"[PRICING] Price refresh failed, keeping current prices: {str(e)}"
+                )
+                return False
+
+            if not items:
+                logger.warning(
+                    "[PRICING] Retail Prices API returned no items, keeping current prices"
+                )
+                return False
+
+            fetched_at = time.time()
+            self._load_items(items, fetched_at)
+            logger.info(
+                f"[PRICING] Loaded {len(self.index)} prices "
+                f"({', '.join(self.currencies)}; {', '.join(self.regions) or 'all regions'})"
+            )
+
+            if self.snapshot_path:
+                try:
+                    await asyncio.to_thread(self._write_snapshot, items, fetched_at)
+                except OSError as e:
+                    logger.warning(
+                        f"[PRICING] Failed to write price snapshot: {str(e)}"
+                    )
+            return True
+
+    def _write_snapshot(self, items: List[Dict], fetched_at: float):
+        directory = os.path.dirname(self.snapshot_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.snapshot_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "fetched_at": datetime.utcfromtimestamp(fetched_at).isoformat(),
+                    "items": items,
+                },
+                f,
+            )
+        os.replace(tmp_path, self.snapshot_path)
+
+    def load_snapshot(self) -> bool:
+        """
+        Load prices from the snapshot file.
+
+        Returns:
+            True if a snapshot was loaded
+        """
+        if not self.snapshot_path or not os.path.exists(self.snapshot_path):
+            return False
+
+        try:
+            with open(self.snapshot_path, encoding="utf-8") as f:
+                snapshot = json.load(f)
+            fetched_at = datetime.fromisoformat(snapshot["fetched_at"])
+            self._load_items(
+                snapshot["items"], (fetched_at - datetime(1970, 1, 1)).total_seconds()
+            )
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"[PRICING] Failed to load price snapshot: {str(e)}")
+            return False
+
+        logger.info(
+            f"[PRICING] Loaded {len(self.index)} prices from snapshot {self.snapshot_path}"
+        )
+        return True
+
+    # ----- lifecycle -----
+
+    async def start(self):
+        """Load the snapshot and start background prefetch/refresh"""
+        self.load_snapshot()
+        if settings.PRICING_OFFLINE:
+            logger.info("[PRICING] Offline mode - using snapshot prices only")
+            return
+        if self._refresh_task is None:
+            self._refresh_task = asyncio.create_task(self._refresh_loop())
+
+    async def _refresh_loop(self):
+        """Refresh whenever prices are older than the TTL"""
+        while True:
+            if self.is_stale:
+                refreshed = await self.refresh()
+                # Retry failed fetches sooner than a full TTL
+                delay = self.ttl_seconds if refreshed else min(self.ttl_seconds, 300)
+            else:
+                delay = self.ttl_seconds - (time.time() - self.fetched_at)
+            await asyncio.sleep(max(delay, 1))
+
+    async def stop(self):
+        """Stop the background refresh task"""
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+            self._refresh_task = None
+
+
+# ===== SINGLETON INSTANCE =====
+pricing_service = PricingService()
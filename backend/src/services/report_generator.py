@@ -8,18 +8,64 @@ All outputs validated against Pydantic schemas.
 import logging
 from typing import List, Dict, Optional
 from datetime import datetime
-from collections import defaultdict
 
+from src.config import settings
 from src.models.schemas import (
     Report, ReportSummary, TableRecommendation, ConnectorCoverageItem,
     ReportWarning, ExecutionMetadata, TierType, ConfidenceLevel,
-    AnalyticsRule, DataConnector, TableIngestionData, KqlParseResult
+    AnalyticsRule, DataConnector, TableIngestionData, KqlParseResult,
+    Workbook, HuntQuery
 )
-from src.services.cost_calculator import cost_calculator
+from src.services.cost_calculator import CostTable, cost_calculator
+from src.services.commitment_optimizer import commitment_optimizer
+from src.services.forecasting import DailyIngestionRow, savings_forecaster
+from src.services.usage_index import QueryLogUsage, QueryUsageRow, UsageIndex
 
 logger = logging.getLogger(__name__)
 
 
+class SummaryAccumulator:
+    """
+    Running totals for the executive summary.
+
+    Recommendations are added as they are produced, so the summary is
+    built in a single pass without re-walking the recommendation lists.
+    """
+
+    def __init__(self):
+        self.total_gb_month = 0.0
+        self.total_cost_hot = 0.0
+        self.total_cost_archive = 0.0
+        self.tier_counts = {tier: 0 for tier in TierType}
+        self.confidence_counts = {level: 0 for level in ConfidenceLevel}
+
+    def add(self, rec: TableRecommendation):
+        """Fold one recommendation into the totals"""
+        self.total_gb_month += rec.ingestion_gb_per_month
+        self.total_cost_hot += rec.monthly_cost_hot
+        self.total_cost_archive += rec.monthly_cost_archive
+        self.tier_counts[rec.current_tier] += 1
+        self.confidence_counts[rec.confidence] += 1
+
+    def to_summary(self, total_tables: int) -> ReportSummary:
+        """Build the ReportSummary from the accumulated totals"""
+        total_monthly_savings = self.total_cost_hot - self.total_cost_archive
+        total_annual_savings = total_monthly_savings * 12
+
+        return ReportSummary(
+            total_tables_analyzed=total_tables,
+            total_ingestion_gb_per_month=round(self.total_gb_month, 2),
+            total_monthly_cost_hot=round(self.total_cost_hot, 2),
+            total_monthly_cost_archive=round(self.total_cost_archive, 2),
+            total_monthly_savings=round(total_monthly_savings, 2),
+            total_annual_savings=round(total_annual_savings, 2),
+            tables_by_tier={tier.value: count for tier, count in self.tier_counts.items()},
+            tables_by_confidence={
+                level.value: count for level, count in self.confidence_counts.items()
+            }
+        )
+
+
 class ReportGenerator:
     """Generate optimization reports"""
 
@@ -35,7 +81,13 @@ class ReportGenerator:
         kql_parse_results: List[KqlParseResult],
         agent_tokens_used: int,
         agent_max_tokens: int,
-        agent_run_seconds: float
+        agent_run_seconds: float,
+        cost_table: Optional[CostTable] = None,
+        daily_ingestion: Optional[List[DailyIngestionRow]] = None,
+        workbooks: Optional[List[Workbook]] = None,
+        hunt_queries: Optional[List[HuntQuery]] = None,
+        reparsed_results: Optional[List[KqlParseResult]] = None,
+        query_usage: Optional[List[QueryUsageRow]] = None
     ) -> Report:
         """
         Generate optimization report.
@@ -45,13 +97,20 @@ class ReportGenerator:
             workspace_id: Sentinel workspace ID
             workspace_name: Workspace display name
             tables: All tables in workspace
-            rules: All analytics rules
+            rules: All analytics rules (tables_referenced populated)
             ingestion_data: Ingestion GB/day per table
             connectors: All data connectors
             kql_parse_results: KQL parsing results
             agent_tokens_used: Tokens consumed by agent
             agent_max_tokens: Max tokens allowed
             agent_run_seconds: Agent execution time
+            cost_table: Per-audit table costs (computed here if not provided)
+            daily_ingestion: (day, table, GB) history for the savings forecast
+            workbooks: Parsed workbooks (tables_referenced populated)
+            hunt_queries: Parsed hunt queries (tables_referenced populated)
+            reparsed_results: Results of the rules parsed this audit (None = all
+                of kql_parse_results; incremental audits reuse the rest)
+            query_usage: (day, table, queries) rows from LAQueryLogs
 
         Returns:
             Assembled Report object
@@ -59,43 +118,63 @@ class ReportGenerator:
         try:
             logger.info(f"[REPORT] Generating report for job {job_id}")
 
-            # Build table usage map from rules
-            table_usage_map = ReportGenerator._build_table_usage_map(rules, kql_parse_results)
+            workbooks = workbooks or []
+            hunt_queries = hunt_queries or []
+            if reparsed_results is None:
+                reparsed_results = kql_parse_results
+
+            # One index answers every per-table usage question below
+            usage_index = UsageIndex.build(rules, workbooks, hunt_queries)
+
+            # What analysts and automation actually queried
+            query_log_usage = QueryLogUsage(query_usage or [])
 
             # Categorize tables by usage and recommendations
             archive_candidates = []
             low_usage_candidates = []
             active_tables = []
+            summary_accumulator = SummaryAccumulator()
+
+            if cost_table is None:
+                cost_table = cost_calculator.build_cost_table(
+                    [table.table_name for table in tables],
+                    ingestion_data,
+                    [table.current_tier for table in tables],
+                    "Archive"
+                )
+
+            # Tier each table may move to, for the commitment tier optimizer
+            move_targets: List[Optional[str]] = []
 
             for table in tables:
-                usage_count = len(table_usage_map.get(table.table_name, []))
-                ingestion_gb_day = ingestion_data.get(table.table_name, 0.0)
+                # Hunting and workbook use count as usage, not just rules
+                usage_count = usage_index.count(table.table_name)
+                query_days = query_log_usage.days.get(table.table_name, 0)
+                costs = cost_table.get(table.table_name)
+                assert costs is not None  # Built from this same table list
+                ingestion_gb_day = costs["ingestion_gb_per_day"]
 
                 # Determine recommendation
-                if usage_count == 0:
-                    # No rule coverage = HIGH confidence archive candidate
+                if usage_count == 0 and query_days == 0:
+                    # Nothing reads the table = HIGH confidence archive candidate
                     confidence = ConfidenceLevel.HIGH
                     parsing_confidence = 1.0
                     recommendation_list = archive_candidates
+                    move_targets.append(TierType.ARCHIVE.value)
 
-                elif usage_count <= 2:
-                    # Low coverage = MEDIUM confidence
+                elif usage_count <= 2 and query_days < settings.QUERY_USAGE_ACTIVE_DAYS:
+                    # Low coverage or occasional ad hoc queries = MEDIUM confidence
                     confidence = ConfidenceLevel.MEDIUM
                     parsing_confidence = 0.7
                     recommendation_list = low_usage_candidates
+                    move_targets.append(TierType.BASIC.value)
 
                 else:
                     # Active coverage = DO NOT TOUCH
                     confidence = ConfidenceLevel.HIGH
                     parsing_confidence = 1.0
                     recommendation_list = active_tables
-
-                # Calculate costs
-                costs = cost_calculator.calculate_table_costs(
-                    ingestion_gb_day,
-                    table.current_tier,
-                    "Archive"
-                )
+                    move_targets.append(None)
 
                 # Build recommendation
                 rec = TableRecommendation(
@@ -103,8 +182,12 @@ class ReportGenerator:
                     current_tier=table.current_tier,
                     ingestion_gb_per_day=round(ingestion_gb_day, 4),
                     ingestion_gb_per_month=round(ingestion_gb_day * 30, 2),
-                    rule_coverage_count=usage_count,
-                    rule_names=table_usage_map.get(table.table_name, [])[:5],  # Top 5
+                    rule_coverage_count=usage_index.count(table.table_name, "rule"),
+                    rule_names=usage_index.rule_names(table.table_name)[:5],  # Top 5
+                    workbook_count=usage_index.count(table.table_name, "workbook"),
+                    hunt_query_count=usage_index.count(table.table_name, "hunt_query"),
+                    query_count=query_log_usage.queries.get(table.table_name, 0),
+                    query_days=query_days,
                     confidence=confidence,
                     parsing_confidence=parsing_confidence,
                     monthly_cost_hot=costs["monthly_cost_hot"],
@@ -112,20 +195,42 @@ class ReportGenerator:
                     monthly_savings=costs["monthly_savings"],
                     annual_savings=costs["annual_savings"],
                     notes=ReportGenerator._generate_notes(
-                        table.table_name, usage_count, ingestion_gb_day, table.retention_days
+                        table.table_name, usage_index, ingestion_gb_day, table.retention_days,
+                        query_log_usage
                     )
                 )
 
                 recommendation_list.append(rec)
+                summary_accumulator.add(rec)
 
             # Sort by savings
             archive_candidates.sort(key=lambda x: x.annual_savings, reverse=True)
             low_usage_candidates.sort(key=lambda x: x.annual_savings, reverse=True)
             active_tables.sort(key=lambda x: x.annual_savings, reverse=True)
 
+            # Cheapest commitment tier together with the archive/basic moves
+            commitment_plan = commitment_optimizer.optimize(
+                [table.table_name for table in tables],
+                [ingestion_data.get(table.table_name, 0.0) for table in tables],
+                [table.current_tier for table in tables],
+                move_targets,
+                cost_table.pricing_profile
+            )
+
+            # Range of next-quarter savings from the same moves
+            savings_forecast = None
+            if daily_ingestion:
+                savings_forecast = savings_forecaster.forecast(
+                    [table.table_name for table in tables],
+                    [table.current_tier for table in tables],
+                    move_targets,
+                    daily_ingestion,
+                    cost_calculator.get_tier_rates(cost_table.pricing_profile)
+                )
+
             # Build connector coverage map
             connector_coverage = ReportGenerator._build_connector_coverage(
-                connectors, table_usage_map
+                connectors, usage_index
             )
 
             # Identify warnings
@@ -133,10 +238,8 @@ class ReportGenerator:
                 tables, kql_parse_results, archive_candidates
             )
 
-            # Calculate summary
-            summary = ReportGenerator._calculate_summary(
-                tables, archive_candidates, low_usage_candidates, active_tables
-            )
+            # Summary totals were accumulated while building recommendations
+            summary = summary_accumulator.to_summary(total_tables=len(tables))
 
             # Build metadata
             metadata = ExecutionMetadata(
@@ -145,10 +248,16 @@ class ReportGenerator:
                 kql_parsing_success_rate=ReportGenerator._calculate_parse_success_rate(kql_parse_results),
                 tables_analyzed=len(tables),
                 rules_analyzed=len(rules),
-                workbooks_analyzed=0,  # Set by caller
-                hunt_queries_analyzed=0,  # Set by caller
+                workbooks_analyzed=len(workbooks),
+                hunt_queries_analyzed=len(hunt_queries),
                 agent_tokens_used=agent_tokens_used,
-                agent_tokens_limit=agent_max_tokens
+                agent_tokens_limit=agent_max_tokens,
+                pricing_profile=cost_table.pricing_profile,
+                tier_rates=cost_table.tier_rates,
+                kql_parse_cache_hits=sum(1 for r in reparsed_results if r.from_cache),
+                kql_parse_cache_misses=sum(1 for r in reparsed_results if not r.from_cache),
+                rules_reparsed=len(reparsed_results),
+                query_log_tables=len(query_log_usage)
             )
 
             # Assemble report
@@ -162,7 +271,10 @@ class ReportGenerator:
                 low_usage_candidates=low_usage_candidates,
                 active_tables=active_tables,
                 connector_coverage=connector_coverage,
+                usage_index=usage_index.to_dict(),
                 warnings=warnings,
+                commitment_plan=commitment_plan,
+                savings_forecast=savings_forecast,
                 metadata=metadata
             )
 
@@ -177,30 +289,16 @@ class ReportGenerator:
             logger.error(f"[REPORT] Report generation failed: {str(e)}")
             raise
 
-    @staticmethod
-    def _build_table_usage_map(
-        rules: List[AnalyticsRule], kql_parse_results: List[KqlParseResult]
-    ) -> Dict[str, List[str]]:
-        """Build mapping of tables to rules that reference them"""
-        usage_map = defaultdict(list)
-
-        for rule, parse_result in zip(rules, kql_parse_results):
-            if parse_result.success:
-                for table in parse_result.tables:
-                    usage_map[table].append(rule.rule_name)
-
-        return dict(usage_map)
-
     @staticmethod
     def _build_connector_coverage(
-        connectors: List[DataConnector], table_usage_map: Dict[str, List[str]]
+        connectors: List[DataConnector], usage_index: UsageIndex
     ) -> List[ConnectorCoverageItem]:
         """Build connector to table coverage mapping"""
         coverage_items = []
 
         for connector in connectors:
             tables_with_coverage = sum(
-                1 for table in connector.tables_fed if table in table_usage_map
+                1 for table in connector.tables_fed if table in usage_index
             )
 
             coverage_items.append(
@@ -250,59 +348,37 @@ class ReportGenerator:
 
         return warnings
 
-    @staticmethod
-    def _calculate_summary(
-        tables: List[TableIngestionData],
-        archive_candidates: List[TableRecommendation],
-        low_usage_candidates: List[TableRecommendation],
-        active_tables: List[TableRecommendation]
-    ) -> ReportSummary:
-        """Calculate executive summary"""
-        # Total ingestion
-        total_gb_month = sum(r.ingestion_gb_per_month for r in (archive_candidates + low_usage_candidates + active_tables))
-
-        # Total costs
-        total_cost_hot = sum(r.monthly_cost_hot for r in (archive_candidates + low_usage_candidates + active_tables))
-        total_cost_archive = sum(r.monthly_cost_archive for r in (archive_candidates + low_usage_candidates + active_tables))
-        total_monthly_savings = total_cost_hot - total_cost_archive
-        total_annual_savings = total_monthly_savings * 12
-
-        # Tier breakdown
-        tier_breakdown = {
-            "Hot": len([r for r in (archive_candidates + low_usage_candidates + active_tables) if r.current_tier == TierType.HOT]),
-            "Basic": len([r for r in (archive_candidates + low_usage_candidates + active_tables) if r.current_tier == TierType.BASIC]),
-            "Archive": len([r for r in (archive_candidates + low_usage_candidates + active_tables) if r.current_tier == TierType.ARCHIVE])
-        }
-
-        # Confidence breakdown
-        confidence_breakdown = {
-            "HIGH": len([r for r in (archive_candidates + low_usage_candidates + active_tables) if r.confidence == ConfidenceLevel.HIGH]),
-            "MEDIUM": len([r for r in (archive_candidates + low_usage_candidates + active_tables) if r.confidence == ConfidenceLevel.MEDIUM]),
-            "LOW": len([r for r in (archive_candidates + low_usage_candidates + active_tables) if r.confidence == ConfidenceLevel.LOW])
-        }
-
-        return ReportSummary(
-            total_tables_analyzed=len(tables),
-            total_ingestion_gb_per_month=round(total_gb_month, 2),
-            total_monthly_cost_hot=round(total_cost_hot, 2),
-            total_monthly_cost_archive=round(total_cost_archive, 2),
-            total_monthly_savings=round(total_monthly_savings, 2),
-            total_annual_savings=round(total_annual_savings, 2),
-            tables_by_tier=tier_breakdown,
-            tables_by_confidence=confidence_breakdown
-        )
-
     @staticmethod
     def _generate_notes(
-        table_name: str, usage_count: int, ingestion_gb_day: float, retention_days: int
+        table_name: str,
+        usage_index: UsageIndex,
+        ingestion_gb_day: float,
+        retention_days: int,
+        query_log_usage: Optional[QueryLogUsage] = None
     ) -> str:
         """Generate notes for a table recommendation"""
         notes = []
 
+        usage_count = usage_index.count(table_name)
         if usage_count == 0:
-            notes.append("No analytics rules reference this table")
+            notes.append("No analytics rules, workbooks or hunt queries reference this table")
         elif usage_count <= 2:
-            notes.append(f"Only {usage_count} rule(s) reference this table")
+            readers = [
+                f"{count} {label}"
+                for label, count in (
+                    ("rule(s)", usage_index.count(table_name, "rule")),
+                    ("workbook(s)", usage_index.count(table_name, "workbook")),
+                    ("hunt query(ies)", usage_index.count(table_name, "hunt_query")),
+                )
+                if count
+            ]
+            notes.append(f"Only {' and '.join(readers)} reference this table")
+
+        if query_log_usage is not None and table_name in query_log_usage.queries:
+            notes.append(
+                f"Queried {query_log_usage.queries[table_name]} times on "
+                f"{query_log_usage.days[table_name]} day(s)"
+            )
 
         if ingestion_gb_day < 0.01:
             notes.append("Minimal ingestion volume")
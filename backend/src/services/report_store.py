@@ -0,0 +1,305 @@
+"""
+Audit Report Store
+
+Persists generated reports as gzip-compressed JSON, keyed by job_id and
+content hash ("<job_id>/<sha256>.json.gz"). The hash doubles as the HTTP
+ETag, so dashboards can revalidate without downloading the report.
+
+Backends:
+- FilesystemReportStore (default): local directory, for dev/offline use
+- BlobReportStore: the provisioned "reports" blob container via Managed Identity
+
+Recently served reports are kept compressed in an in-memory LRU, so repeated
+loads of a large report skip both the backend and re-serialization.
+"""
+
+import asyncio
+import gzip
+import hashlib
+import logging
+import os
+from collections import OrderedDict
+from typing import Optional
+
+from src.config import settings
+from src.models.schemas import AuditJobRequest, JobStatus, Report
+
+logger = logging.getLogger(__name__)
+
+
+class StoredReport:
+    """A serialized report and its content hash"""
+
+    def __init__(self, job_id: str, content_hash: str, compressed: bytes):
+        """
+        Args:
+            job_id: Audit job ID
+            content_hash: SHA-256 of the uncompressed JSON body
+            compressed: gzip-compressed JSON body
+        """
+        self.job_id = job_id
+        self.content_hash = content_hash
+        self.compressed = compressed
+
+    @property
+    def etag(self) -> str:
+        return f'"{self.content_hash}"'
+
+    def json_bytes(self) -> bytes:
+        return gzip.decompress(self.compressed)
+
+
+class ReportStore:
+    """Base class: serialization, hashing and the in-memory LRU"""
+
+    def __init__(self, cache_size: Optional[int] = None):
+        """
+        Args:
+            cache_size: Max reports kept in memory
+        """
+        self.cache_size = cache_size or settings.REPORT_CACHE_MAX_ENTRIES
+        self._cache: "OrderedDict[str, StoredReport]" = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    # ----- backend hooks -----
+
+    async def _write(self, job_id: str, content_hash: str, compressed: bytes):
+        raise NotImplementedError
+
+    async def _find(self, job_id: str) -> Optional[str]:
+        """Content hash of the latest stored report for a job"""
+        raise NotImplementedError
+
+    async def _read(self, job_id: str, content_hash: str) -> bytes:
+        raise NotImplementedError
+
+    async def close(self):
+        """Release backend resources"""
+
+    # ----- cache -----
+
+    def _remember(self, stored: StoredReport):
+        self._cache[stored.job_id] = stored
+        self._cache.move_to_end(stored.job_id)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def _cached(self, job_id: str) -> Optional[StoredReport]:
+        stored = self._cache.get(job_id)
+        if stored is not None:
+            self._cache.move_to_end(job_id)
+            self.cache_hits += 1
+        else:
+            self.cache_misses += 1
+        return stored
+
+    # ----- public API -----
+
+    @staticmethod
+    def _key(job_id: str, content_hash: str) -> str:
+        return f"{job_id}/{content_hash}.json.gz"
+
+    async def save(self, job_id: str, report: Report) -> StoredReport:
+        """Serialize, compress and persist a report"""
+        body = report.model_dump_json().encode("utf-8")
+        content_hash = hashlib.sha256(body).hexdigest()
+        # mtime=0 keeps the compressed bytes deterministic for identical reports
+        compressed = gzip.compress(body, compresslevel=6, mtime=0)
+        stored = StoredReport(job_id, content_hash, compressed)
+
+        # Cache first, so the report is servable even if the upload fails
+        self._remember(stored)
+        await self._write(job_id, content_hash, compressed)
+
+        logger.info(
+            f"[REPORTS] Saved report {self._key(job_id, content_hash)} "
+            f"({len(body)} -> {len(compressed)} bytes)"
+        )
+        return stored
+
+    async def get_etag(self, job_id: str) -> Optional[str]:
+        """ETag of the stored report without downloading it"""
+        stored = self._cached(job_id)
+        if stored is not None:
+            return stored.etag
+        content_hash = await self._find(job_id)
+        return f'"{content_hash}"' if content_hash else None
+
+    async def get(self, job_id: str) -> Optional[StoredReport]:
+        """Stored report for a job, or None if none was saved"""
+        stored = self._cached(job_id)
+        if stored is not None:
+            return stored
+
+        content_hash = await self._find(job_id)
+        if content_hash is None:
+            return None
+
+        stored = StoredReport(
+            job_id, content_hash, await self._read(job_id, content_hash)
+        )
+        self._remember(stored)
+        return stored
+
+    async def on_job_status(
+        self,
+        job: AuditJobRequest,
+        status: JobStatus,
+        report: Optional[Report] = None,
+        error_message: Optional[str] = None,
+    ):
+        """Job runner listener: persist the report of a completed job"""
+        if status == JobStatus.COMPLETED and report is not None:
+            await self.save(job.job_id, report)
+
+
+class FilesystemReportStore(ReportStore):
+    """Local directory report store (default)"""
+
+    def __init__(self, root: Optional[str] = None, cache_size: Optional[int] = None):
+        """
+        Args:
+            root: Directory holding one sub-directory per job
+            cache_size: Max reports kept in memory
+        """
+        super().__init__(cache_size)
+        self.root = root or settings.REPORT_STORE_PATH
+        logger.info(f"[REPORTS] Filesystem report store: {self.root}")
+
+    def _job_dir(self, job_id: str) -> str:
+        # Job IDs come from the URL path
+        if os.sep in job_id or job_id in ("", ".", ".."):
+            raise ValueError(f"Invalid job_id: {job_id!r}")
+        return os.path.join(self.root, job_id)
+
+    async def _write(self, job_id: str, content_hash: str, compressed: bytes):
+        def write():
+            job_dir = self._job_dir(job_id)
+            os.makedirs(job_dir, exist_ok=True)
+            path = os.path.join(job_dir, f"{content_hash}.json.gz")
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(compressed)
+            os.replace(tmp_path, path)
+
+        await asyncio.to_thread(write)
+
+    async def _find(self, job_id: str) -> Optional[str]:
+        def find():
+            job_dir = self._job_dir(job_id)
+            if not os.path.isdir(job_dir):
+                return None
+            entries = [
+                entry
+                for entry in os.scandir(job_dir)
+                if entry.name.endswith(".json.gz")
+            ]
+            if not entries:
+                return None
+            latest = max(entries, key=lambda entry: entry.stat().st_mtime)
+            return latest.name[: -len(".json.gz")]
+
+        return await asyncio.to_thread(find)
+
+    async def _read(self, job_id: str, content_hash: str) -> bytes:
+        def read():
+            with open(
+                os.path.join(self._job_dir(job_id), f"{content_hash}.json.gz"), "rb"
+            ) as f:
+                return f.read()
+
+        return await asyncio.to_thread(read)
+
+
+class BlobReportStore(ReportStore):
+    """Azure Blob Storage report store"""
+
+    def __init__(
+        self,
+        account_url: Optional[str] = None,
+        container_name: Optional[str] = None,
+        cache_size: Optional[int] = None,
+    ):
+        """
+        Args:
+            account_url: Blob endpoint, e.g. https://<account>.blob.core.windows.net
+            container_name: Container holding the reports
+            cache_size: Max reports kept in memory
+        """
+        super().__init__(cache_size)
+        self.account_url = account_url or (
+            f"https://{settings.AZURE_STORAGE_ACCOUNT_NAME}.blob.core.windows.net"
+        )
+        self.container_name = container_name or settings.REPORT_STORE_CONTAINER
+        self._service_client = None
+        self._container_client = None
+        self._init_lock = asyncio.Lock()
+
+        logger.info(
+            f"[REPORTS] Blob report store: {self.account_url}/{self.container_name}"
+        )
+
+    async def _container(self):
+        """Create the container client on first use (must run inside the event loop)"""
+        if self._container_client is not None:
+            return self._container_client
+
+        async with self._init_lock:
+            if self._container_client is None:
+                from azure.storage.blob.aio import BlobServiceClient
+
+                self._service_client = BlobServiceClient(
+                    account_url=self.account_url, credential=settings.async_credential
+                )
+                self._container_client = self._service_client.get_container_client(
+                    self.container_name
+                )
+
+        return self._container_client
+
+    async def _write(self, job_id: str, content_hash: str, compressed: bytes):
+        from azure.storage.blob import ContentSettings
+
+        container = await self._container()
+        await container.upload_blob(
+            self._key(job_id, content_hash),
+            compressed,
+            overwrite=True,
+            content_settings=ContentSettings(
+                content_type="application/json", content_encoding="gzip"
+            ),
+        )
+
+    async def _find(self, job_id: str) -> Optional[str]:
+        container = await self._container()
+        latest = None
+        async for blob in container.list_blobs(name_starts_with=f"{job_id}/"):
+            if latest is None or blob.last_modified > latest.last_modified:
+                latest = blob
+        if latest is None:
+            return None
+        return latest.name[len(job_id) + 1 : -len(".json.gz")]
+
+    async def _read(self, job_id: str, content_hash: str) -> bytes:
+        container = await self._container()
+        # Download the stored gzip bytes as-is, without transparent decoding
+        downloader = await container.download_blob(
+            self._key(job_id, content_hash), decompress=False
+        )
+        return await downloader.readall()
+
+    async def close(self):
+        if self._service_client is not None:
+            await self._service_client.close()
+
+
+def create_report_store() -> ReportStore:
+    """Build the report store selected by REPORT_STORE_BACKEND"""
+    if settings.REPORT_STORE_BACKEND == "blob":
+        return BlobReportStore()
+    return FilesystemReportStore()
+
+
+# ===== SINGLETON INSTANCE =====
+report_store = create_report_store()
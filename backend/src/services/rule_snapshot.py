@@ -0,0 +1,199 @@
+"""
+Rule Snapshot Store
+
+Per-workspace record of every analytics rule's parse result from the last
+audit, so an incremental audit re-parses only new or modified rules.
+
+A rule is unchanged when its ARM etag matches, or, when the etag moved for
+an edit that does not touch the query (rename, enable/disable), when the
+hash of its query text matches. Results were attributed against the
+workspace's tables and saved functions, so a snapshot is discarded when
+either changes (fingerprint mismatch).
+
+Each workspace is one gzip-compressed JSON file ("<workspace>.json.gz").
+"""
+
+import asyncio
+import gzip
+import hashlib
+import json
+import logging
+import os
+from typing import Dict, Iterable, Optional, Sequence
+
+from src.config import settings
+from src.models.schemas import (
+    AnalyticsRule,
+    KqlParseResult,
+    RuleSnapshotEntry,
+    WorkspaceFunction,
+)
+from src.services.ingestion_cache import IngestionCache
+from src.services.kql_parse_cache import CACHE_VERSION
+from src.services.table_catalog import TableCatalog
+
+logger = logging.getLogger(__name__)
+
+
+def query_hash(query: str) -> str:
+    """SHA-256 of a rule's query text"""
+    return hashlib.sha256(query.encode()).hexdigest()
+
+
+class RuleSnapshot:
+    """Parse results of one workspace's rules"""
+
+    def __init__(
+        self, fingerprint: str = "", entries: Iterable[RuleSnapshotEntry] = ()
+    ):
+        """
+        Args:
+            fingerprint: Tables and functions the results were attributed against
+            entries: Parse result per rule
+        """
+        self.fingerprint = fingerprint
+        self.entries: Dict[str, RuleSnapshotEntry] = {
+            entry.rule_id: entry for entry in entries
+        }
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    @staticmethod
+    def fingerprint_of(
+        catalog: TableCatalog, functions: Sequence[WorkspaceFunction]
+    ) -> str:
+        """Fingerprint of the parser version, workspace tables and saved functions"""
+        digest = hashlib.sha256(f"{CACHE_VERSION}\n".encode())
+        for name in sorted(catalog.table_names):
+            digest.update(f"{name}\n".encode())
+        for function in sorted(functions, key=lambda f: f.function_alias):
+            digest.update(
+                f"{function.function_alias}\0{function.function_parameters}\0".encode()
+            )
+            digest.update(f"{function.query}\n".encode())
+        return digest.hexdigest()
+
+    def lookup(self, rule: AnalyticsRule) -> Optional[KqlParseResult]:
+        """Last audit's result for a rule, or None if it is new or its query changed"""
+        entry = self.entries.get(rule.rule_id)
+        if entry is None:
+            return None
+        if rule.etag and rule.etag == entry.etag:
+            return entry.result
+        if query_hash(rule.kql_query) == entry.query_hash:
+            return entry.result
+        return None
+
+    def update(self, rules: Sequence[AnalyticsRule], results: Sequence[KqlParseResult]):
+        """
+        Replace the snapshot with this audit's rules (deleted rules drop out).
+
+        Args:
+            rules: Every rule in the workspace
+            results: Parse result per rule
+        """
+        self.entries = {
+            rule.rule_id: RuleSnapshotEntry(
+                rule_id=rule.rule_id,
+                etag=rule.etag,
+                query_hash=query_hash(rule.kql_query),
+                # Reused results were not served by the parse cache this time
+                result=result.model_copy(update={"from_cache": False}),
+            )
+            for rule, result in zip(rules, results)
+        }
+
+
+class RuleSnapshotStore:
+    """On-disk store of RuleSnapshot, one file per workspace"""
+
+    # Same file naming as the ingestion cache
+    workspace_key = staticmethod(IngestionCache.workspace_key)
+
+    def __init__(self, root: Optional[str] = None):
+        """
+        Args:
+            root: Snapshot directory ("" disables persistence)
+        """
+        self.root = settings.RULE_SNAPSHOT_PATH if root is None else root
+        self._snapshots: Dict[str, RuleSnapshot] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    def lock(self, key: str) -> asyncio.Lock:
+        """Per-workspace lock, so concurrent audits do not interleave updates"""
+        return self._locks.setdefault(key, asyncio.Lock())
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, f"{key}.json.gz")
+
+    def _read(self, key: str) -> RuleSnapshot:
+        path = self._path(key)
+        if not self.root or not os.path.exists(path):
+            return RuleSnapshot()
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                data = json.load(f)
+            return RuleSnapshot(
+                data["fingerprint"],
+                [RuleSnapshotEntry.model_validate(entry) for entry in data["entries"]],
+            )
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(
+                f"[AUDIT] Ignoring unreadable rule snapshot {path}: {str(e)}"
+            )
+            return RuleSnapshot()
+
+    def _write(self, key: str, snapshot: RuleSnapshot):
+        os.makedirs(self.root, exist_ok=True)
+        path = self._path(key)
+        tmp_path = f"{path}.tmp"
+        body = {
+            "fingerprint": snapshot.fingerprint,
+            "entries": [
+                entry.model_dump(mode="json") for entry in snapshot.entries.values()
+            ],
+        }
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            json.dump(body, f)
+        os.replace(tmp_path, path)
+
+    async def load(self, key: str, fingerprint: str) -> RuleSnapshot:
+        """
+        Last audit's snapshot for a workspace.
+
+        Args:
+            key: Workspace key
+            fingerprint: Fingerprint of the current tables and functions
+
+        Returns:
+            The snapshot, or an empty one if there is none or it was taken
+            against different tables or functions
+        """
+        snapshot = self._snapshots.get(key)
+        if snapshot is None:
+            snapshot = await asyncio.to_thread(self._read, key)
+
+        if snapshot.fingerprint != fingerprint:
+            if len(snapshot):
+                logger.info(
+                    f"[AUDIT] Workspace tables or functions changed, "
+                    f"re-parsing all {len(snapshot)} rules"
+                )
+            snapshot = RuleSnapshot(fingerprint)
+
+        self._snapshots[key] = snapshot
+        return snapshot
+
+    async def save(self, key: str, snapshot: RuleSnapshot):
+        """Keep a snapshot for the next audit and persist it"""
+        self._snapshots[key] = snapshot
+        if self.root:
+            try:
+                await asyncio.to_thread(self._write, key, snapshot)
+            except OSError as e:
+                logger.warning(f"[AUDIT] Failed to write rule snapshot: {str(e)}")
+
+
+# ===== SINGLETON INSTANCE =====
+rule_snapshot_store = RuleSnapshotStore()
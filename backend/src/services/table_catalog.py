@@ -0,0 +1,119 @@
+"""
+Workspace Table Catalog
+
+The tables that actually exist in a workspace (from list_workspace_tables),
+compiled once per audit into a trie-shaped regular expression - a
+multi-pattern automaton that finds every known table name in a query in a
+single linear pass, run by the C regex engine.
+
+Used by the KQL parser to attribute tables by exact lookup: names that are
+not in the catalog (columns, functions, let bindings that look like tables)
+are never reported, and string literals and comments are skipped.
+"""
+
+import logging
+import re
+from typing import Dict, Iterable, List, Tuple
+
+from src.services.kql_lexer import STRING
+
+logger = logging.getLogger(__name__)
+
+CatalogMatch = Tuple[str, int, int]  # (table name, start, end)
+
+
+def _trie_pattern(names: Iterable[str]) -> str:
+    """
+    Regex alternation shaped like a trie of the names.
+
+    Shared prefixes are matched once, and longer names are tried before
+    their prefixes (e.g. ContainerLogV2 before ContainerLog).
+    """
+    trie: Dict[str, dict] = {}
+    for name in names:
+        node = trie
+        for char in name:
+            node = node.setdefault(char, {})
+        node[""] = {}  # end of a name
+
+    def build(node: Dict[str, dict]) -> str:
+        branches = [
+            re.escape(char) + build(child)
+            for char, child in sorted(node.items())
+            if char
+        ]
+        if not branches:
+            return ""
+        is_end = "" in node
+        if len(branches) == 1 and not is_end:
+            return branches[0]
+        group = "(?:" + "|".join(branches) + ")"
+        return group + "?" if is_end else group
+
+    return build(trie)
+
+
+class TableCatalog:
+    """Known table names of one workspace, with a one-pass matcher"""
+
+    def __init__(self, table_names: Iterable[str]):
+        """
+        Args:
+            table_names: Tables in the workspace (case-sensitive, as in KQL)
+        """
+        self.table_names = frozenset(name for name in table_names if name)
+        self._expansions: Dict[str, List[str]] = {}
+        self._scanner = None
+        if self.table_names:
+            # Strings and comments are consumed (and ignored) so table-like
+            # text inside them never matches
+            self._scanner = re.compile(
+                rf"""
+                (?:{STRING.pattern}|//[^\n]*+)
+              | (?<![\w$])(?P<table>{_trie_pattern(self.table_names)})(?![\w$])
+                """,
+                re.VERBOSE | re.DOTALL,
+            )
+        logger.debug(f"[KQL] Table catalog built: {len(self.table_names)} tables")
+
+    def __contains__(self, table_name: str) -> bool:
+        return table_name in self.table_names
+
+    def __len__(self) -> int:
+        return len(self.table_names)
+
+    def expand(self, pattern: str) -> List[str]:
+        """
+        Tables matching a wildcard union argument (e.g. Syslog*, *_CL).
+
+        Returns:
+            Matching table names, sorted
+        """
+        expanded = self._expansions.get(pattern)
+        if expanded is None:
+            regex = re.compile(
+                ".*".join(re.escape(part) for part in pattern.split("*")), re.DOTALL
+            )
+            expanded = sorted(
+                name for name in self.table_names if regex.fullmatch(name)
+            )
+            self._expansions[pattern] = expanded
+        return expanded
+
+    def find(self, query: str) -> List[CatalogMatch]:
+        """
+        Known tables named anywhere in a query, in order of appearance.
+
+        Args:
+            query: Raw KQL query
+
+        Returns:
+            (table name, start, end) per occurrence
+        """
+        if self._scanner is None:
+            return []
+        return [
+            (match.group("table"), match.start(), match.end())
+            for match in self._scanner.finditer(query)
+            if match.lastgroup == "table"
+        ]
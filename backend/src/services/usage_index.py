@@ -0,0 +1,189 @@
+"""
+Table Usage Index
+
+Inverted index from table name to the analytics rules, workbooks and hunt
+queries that read it, built in one pass over the parsed artifacts.
+
+Per-kind counts and rule names are maintained as postings are added, so
+every per-table question the report asks (coverage counts, rule names,
+connector coverage) is a dictionary lookup. The postings themselves are
+serialized into the report for drill-down.
+
+QueryLogUsage complements the index with what analysts and automation
+actually ran, from the workspace's LAQueryLogs.
+"""
+
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from src.models.schemas import (
+    AnalyticsRule,
+    ArtifactKind,
+    HuntQuery,
+    KqlParseResult,
+    UsagePosting,
+    Workbook,
+)
+
+KINDS = ("rule", "workbook", "hunt_query")
+
+QueryUsageRow = Tuple[date, str, int]  # (day, table name, queries)
+
+# (query hash -> query text, query hash -> [(day, queries)]), as aggregated by LAQueryLogs
+QueryLogAggregate = Tuple[Dict[str, str], Dict[str, List[Tuple[date, int]]]]
+
+
+class UsageIndex:
+    """table -> postings of the artifacts that read it"""
+
+    def __init__(self):
+        self.postings: Dict[str, List[UsagePosting]] = {}
+        self._counts: Dict[str, Dict[str, int]] = {}
+        self._rule_names: Dict[str, List[str]] = {}
+
+    @classmethod
+    def build(
+        cls,
+        rules: Sequence[AnalyticsRule],
+        workbooks: Sequence[Workbook] = (),
+        hunt_queries: Sequence[HuntQuery] = (),
+    ) -> "UsageIndex":
+        """
+        Index parsed artifacts.
+
+        Only artifacts whose KQL parsed successfully (parsing_confidence > 0)
+        are indexed, as their table lists are otherwise unreliable.
+
+        Args:
+            rules: Analytics rules with tables_referenced populated
+            workbooks: Workbooks with tables_referenced populated
+            hunt_queries: Hunt queries with tables_referenced populated
+
+        Returns:
+            Populated index
+        """
+        index = cls()
+        for rule in rules:
+            index.add(
+                "rule",
+                rule.rule_id,
+                rule.rule_name,
+                rule.tables_referenced,
+                rule.parsing_confidence,
+            )
+        for workbook in workbooks:
+            index.add(
+                "workbook",
+                workbook.workbook_id,
+                workbook.workbook_name,
+                workbook.tables_referenced,
+                workbook.parsing_confidence,
+            )
+        for query in hunt_queries:
+            index.add(
+                "hunt_query",
+                query.query_id,
+                query.query_name,
+                query.tables_referenced,
+                query.parsing_confidence,
+            )
+        return index
+
+    def add(
+        self,
+        kind: ArtifactKind,
+        artifact_id: str,
+        artifact_name: str,
+        tables: Sequence[str],
+        parsing_confidence: float,
+    ):
+        """
+        Post one artifact under every table it reads.
+
+        Args:
+            kind: "rule", "workbook" or "hunt_query"
+            artifact_id: Azure resource ID
+            artifact_name: Display name
+            tables: Tables the artifact reads
+            parsing_confidence: Confidence (0-1) in the table list; 0 skips it
+        """
+        if parsing_confidence <= 0:
+            return
+
+        posting = UsagePosting(
+            artifact_id=artifact_id,
+            artifact_name=artifact_name,
+            kind=kind,
+            parsing_confidence=parsing_confidence,
+        )
+        for table in dict.fromkeys(tables):
+            self.postings.setdefault(table, []).append(posting)
+            counts = self._counts.setdefault(table, dict.fromkeys(KINDS, 0))
+            counts[kind] += 1
+            if kind == "rule":
+                self._rule_names.setdefault(table, []).append(artifact_name)
+
+    def __contains__(self, table: str) -> bool:
+        return table in self.postings
+
+    def __len__(self) -> int:
+        return len(self.postings)
+
+    def count(self, table: str, kind: Optional[str] = None) -> int:
+        """Artifacts reading a table (of one kind, or all kinds)"""
+        if kind is None:
+            return len(self.postings.get(table, ()))
+        counts = self._counts.get(table)
+        return counts[kind] if counts else 0
+
+    def rule_names(self, table: str) -> List[str]:
+        """Names of the rules reading a table, in rule order"""
+        return self._rule_names.get(table, [])
+
+    def to_dict(self) -> Dict[str, List[UsagePosting]]:
+        """Postings per table, for the report"""
+        return self.postings
+
+
+def attribute_query_log(
+    daily_counts: Dict[str, List[Tuple[date, int]]],
+    query_hashes: Sequence[str],
+    results: Sequence[KqlParseResult],
+) -> List[QueryUsageRow]:
+    """
+    Spread each distinct query's daily counts over the tables it reads.
+
+    Args:
+        daily_counts: Query hash -> [(day, queries)]
+        query_hashes: Hashes of the parsed queries
+        results: Parse result per hash
+
+    Returns:
+        (day, table name, queries) rows, one per table and day
+    """
+    usage: Dict[Tuple[date, str], int] = {}
+    for query_hash, result in zip(query_hashes, results):
+        if not result.success:
+            continue
+        for table in result.tables:
+            for day, count in daily_counts[query_hash]:
+                usage[(day, table)] = usage.get((day, table), 0) + count
+    return [(day, table, count) for (day, table), count in usage.items()]
+
+
+class QueryLogUsage:
+    """Per-table query counts and active days from LAQueryLogs"""
+
+    def __init__(self, rows: Iterable[QueryUsageRow] = ()):
+        """
+        Args:
+            rows: (day, table name, queries) rows, one per table and day
+        """
+        self.queries: Dict[str, int] = {}
+        self.days: Dict[str, int] = {}
+        for _, table, count in rows:
+            self.queries[table] = self.queries.get(table, 0) + count
+            self.days[table] = self.days.get(table, 0) + 1
+
+    def __len__(self) -> int:
+        return len(self.queries)
@@ -0,0 +1,175 @@
+"""
+What-If Simulation Service
+
+Lets analysts toggle tables between Hot/Basic/Archive on a completed audit
+and see the workspace totals change, without re-running the audit.
+
+Each audit's report is turned once into a cost matrix (tables x tiers, monthly
+cost) plus baseline totals at the current tiers. A simulation only touches the
+changed rows - O(changed tables) - and never mutates the cached model, so
+concurrent analysts can share it.
+"""
+
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+from src.config import settings
+from src.models.schemas import Report, TierType, WhatIfResult
+from src.services.cost_calculator import cost_calculator
+from src.services.report_store import report_store
+from src.utils.errors import UnknownTableException
+
+logger = logging.getLogger(__name__)
+
+TIERS = [tier.value for tier in TierType]
+TIER_INDEX = {tier: i for i, tier in enumerate(TIERS)}
+
+
+class WhatIfModel:
+    """Per-audit cost matrix with baseline totals"""
+
+    def __init__(
+        self,
+        job_id: str,
+        table_names: Sequence[str],
+        ingestion_gb_per_day: Sequence[float],
+        current_tiers: Sequence[str],
+        rates: Dict[str, float],
+    ):
+        """
+        Args:
+            job_id: Audit job ID
+            table_names: Table names
+            ingestion_gb_per_day: Daily ingestion per table (aligned)
+            current_tiers: Current tier per table (aligned)
+            rates: Tier -> price per GB
+        """
+        self.job_id = job_id
+        self._index = {name: i for i, name in enumerate(table_names)}
+
+        gb = np.asarray(ingestion_gb_per_day, dtype=np.float64)
+        rate_vector = np.array([rates[tier] for tier in TIERS], dtype=np.float64)
+        matrix = np.outer(gb, rate_vector) * 30
+        baseline = np.array(
+            [TIER_INDEX[tier] for tier in current_tiers], dtype=np.int64
+        )
+
+        # Plain lists: scalar reads in simulate() are cheaper than numpy indexing
+        self._costs: List[List[float]] = matrix.tolist()
+        self._baseline: List[int] = baseline.tolist()
+        self.baseline_cost = float(matrix[np.arange(len(baseline)), baseline].sum())
+        self._baseline_counts = np.bincount(baseline, minlength=len(TIERS)).tolist()
+
+    @classmethod
+    def from_report(cls, report: Report, rates: Dict[str, float]) -> "WhatIfModel":
+        """Build the model from a report's table recommendations"""
+        recommendations = (
+            report.archive_candidates
+            + report.low_usage_candidates
+            + report.active_tables
+        )
+        return cls(
+            report.job_id,
+            [rec.table_name for rec in recommendations],
+            [rec.ingestion_gb_per_day for rec in recommendations],
+            [rec.current_tier.value for rec in recommendations],
+            rates,
+        )
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def simulate(self, changes: Mapping[str, str]) -> WhatIfResult:
+        """
+        Apply tier changes (relative to the current tiers) and return totals.
+
+        Raises:
+            UnknownTableException: If a table is not part of the audit
+        """
+        unknown = [name for name in changes if name not in self._index]
+        if unknown:
+            raise UnknownTableException(
+                f"Tables not in audit: {', '.join(sorted(unknown)[:10])}"
+            )
+
+        delta = 0.0
+        counts = list(self._baseline_counts)
+        changed = 0
+
+        for name, tier in changes.items():
+            i = self._index[name]
+            old, new = self._baseline[i], TIER_INDEX[tier]
+            if old == new:
+                continue
+            delta += self._costs[i][new] - self._costs[i][old]
+            counts[old] -= 1
+            counts[new] += 1
+            changed += 1
+
+        scenario_cost = self.baseline_cost + delta
+        monthly_savings = self.baseline_cost - scenario_cost
+
+        return WhatIfResult(
+            job_id=self.job_id,
+            changed_tables=changed,
+            baseline_monthly_cost=round(self.baseline_cost, 2),
+            scenario_monthly_cost=round(scenario_cost, 2),
+            monthly_savings=round(monthly_savings, 2),
+            annual_savings=round(monthly_savings * 12, 2),
+            tables_by_tier=dict(zip(TIERS, counts)),
+        )
+
+
+class WhatIfService:
+    """LRU of per-audit what-if models, keyed by report content hash"""
+
+    def __init__(self, cache_size: Optional[int] = None):
+        """
+        Args:
+            cache_size: Max audit models kept in memory
+        """
+        self.cache_size = cache_size or settings.REPORT_CACHE_MAX_ENTRIES
+        self._models: "OrderedDict[str, tuple]" = OrderedDict()
+
+    async def get_model(self, job_id: str) -> Optional[WhatIfModel]:
+        """
+        What-if model for a completed audit.
+
+        Returns:
+            None if the audit has no stored report
+        """
+        stored = await report_store.get(job_id)
+        if stored is None:
+            return None
+
+        cached = self._models.get(job_id)
+        if cached is not None and cached[0] == stored.content_hash:
+            self._models.move_to_end(job_id)
+            return cached[1]
+
+        def build() -> WhatIfModel:
+            report = Report.model_validate_json(stored.json_bytes())
+            # Price scenarios at the audit's own rates, not today's; reports
+            # saved before rates were recorded fall back to current rates
+            rates = report.metadata.tier_rates or cost_calculator.get_tier_rates(
+                report.metadata.pricing_profile
+            )
+            return WhatIfModel.from_report(report, rates)
+
+        # Parsing a large report is CPU work; keep it off the event loop
+        model = await asyncio.to_thread(build)
+        logger.info(f"[COST] What-if model built for {job_id} ({len(model)} tables)")
+
+        self._models[job_id] = (stored.content_hash, model)
+        self._models.move_to_end(job_id)
+        while len(self._models) > self.cache_size:
+            self._models.popitem(last=False)
+        return model
+
+
+# ===== SINGLETON INSTANCE =====
+what_if_service = WhatIfService()
@@ -31,3 +31,23 @@ class AuthenticationException(SentinelLensException):
 class ReportGenerationException(SentinelLensException):
     """Report generation failed"""
     pass
+
+
+class JobQueueFullException(SentinelLensException):
+    """Audit job backlog is full"""
+    pass
+
+
+class InvalidJobTransitionException(SentinelLensException):
+    """Audit job status change is not allowed"""
+    pass
+
+
+class UnknownTableException(SentinelLensException):
+    """Table is not part of the audit"""
+    pass
+
+
+class JobConflictException(SentinelLensException):
+    """Audit job kept changing under a conditional update"""
+    pass
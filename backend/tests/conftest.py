@@ -6,6 +6,10 @@ import pytest
 import os
 from pathlib import Path
 
+# Unit tests never read parse results persisted by an earlier run
+os.environ.setdefault("KQL_PARSE_CACHE_PATH", "")
+os.environ.setdefault("RULE_SNAPSHOT_PATH", "")
+
 
 @pytest.fixture(scope="session")
 def test_data_dir():
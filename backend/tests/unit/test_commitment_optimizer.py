@@ -0,0 +1,75 @@
+"""
+Unit tests for the commitment tier optimizer
+"""
+
+import time
+
+import pytest
+from src.models.schemas import WorkspacePricingProfile
+from src.services.commitment_optimizer import CommitmentOptimizer
+from src.services.pricing import PricingService
+
+
+@pytest.fixture
+def optimizer():
+    """Optimizer over a small eastus price index"""
+    pricing = PricingService(region="eastus", currency="USD", snapshot_path="")
+    pricing.index.add("eastus", "USD", "Hot", 0, 2.0)
+    pricing.index.add("eastus", "USD", "Basic", 0, 0.5)
+    pricing.index.add("eastus", "USD", "Archive", 0, 0.02)
+    pricing.index.add("eastus", "USD", "Hot", 100, 1.6)
+    pricing.index.add("eastus", "USD", "Hot", 200, 1.5)
+    return CommitmentOptimizer(pricing)
+
+
+class TestCommitmentOptimizer:
+    """Test plan selection across commitment tiers and table moves"""
+
+    def test_small_workspace_stays_pay_as_you_go(self, optimizer):
+        """Below the smallest commitment level, pay-as-you-go is cheapest"""
+        plan = optimizer.optimize(["A", "B"], [10.0, 5.0], ["Hot", "Hot"], [None, None])
+
+        assert plan.commitment_gb_per_day == 0
+        assert plan.monthly_savings == 0.0
+        assert plan.plans_evaluated == 3  # one move plan x three tiers
+
+    def test_high_volume_buys_commitment_tier(self, optimizer):
+        """A 210 GB/day workspace is cheapest on the 200 GB/day tier"""
+        plan = optimizer.optimize(["A", "B"], [150.0, 60.0], ["Hot", "Hot"], [None, None])
+
+        assert plan.commitment_gb_per_day == 200
+        # 200 * 1.5 + 10 * 1.5 = 315/day vs 420/day pay-as-you-go
+        assert plan.optimized_monthly_cost == 315.0 * 30
+        assert plan.monthly_savings == (420.0 - 315.0) * 30
+
+    def test_moves_and_tier_chosen_together(self, optimizer):
+        """Archiving an unused table can drop the workspace to a lower tier"""
+        plan = optimizer.optimize(
+            ["Active", "Unused", "Rare", "Basic"],
+            [100.0, 110.0, 5.0, 20.0],
+            ["Hot", "Hot", "Hot", "Basic"],
+            [None, "Archive", "Basic", None],
+            WorkspacePricingProfile(region="eastus", commitment_gb_per_day=200)
+        )
+
+        assert plan.current_commitment_gb_per_day == 200
+        assert plan.tables_to_archive == ["Unused"]
+        # Basic (0.5/GB) beats the 100 GB/day tier's overage rate (1.6/GB)
+        assert plan.tables_to_basic == ["Rare"]
+        assert plan.commitment_gb_per_day == 100
+        assert plan.analytics_gb_per_day == 100.0
+        assert plan.optimized_monthly_cost < plan.current_monthly_cost
+
+    def test_thousands_of_tables_vectorized(self, optimizer):
+        """Every plan for 5k tables is evaluated in one array pass"""
+        count = 5_000
+        names = [f"T{i}" for i in range(count)]
+        volumes = [(i % 50) / 10 for i in range(count)]
+        targets = ["Archive" if i % 3 == 0 else None for i in range(count)]
+
+        started = time.perf_counter()
+        plan = optimizer.optimize(names, volumes, ["Hot"] * count, targets)
+        elapsed = time.perf_counter() - started
+
+        assert plan.plans_evaluated == (len([t for t in targets if t]) + 1) * 3
+        assert elapsed < 1.0
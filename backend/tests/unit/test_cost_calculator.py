@@ -4,6 +4,8 @@ Unit tests for cost calculator
 These tests verify REAL cost calculations based on actual Azure pricing.
 """
 
+import time
+
 import pytest
 from src.services.cost_calculator import cost_calculator
 from src.models.schemas import TierType
@@ -154,3 +156,71 @@ class TestCostCalculator:
 
         # Annual should be exactly 12 * monthly
         assert abs(costs["annual_savings"] - (costs["monthly_savings"] * 12)) < 0.01
+
+    def test_batch_costs_match_single_table(self):
+        """Vectorized batch costing matches per-table costing"""
+        volumes = [0.0, 0.01, 1.0, 10.0, 50.0]
+        batch = cost_calculator.calculate_batch_costs(
+            [f"Table{i}" for i in range(len(volumes))], volumes, ["Hot"] * len(volumes)
+        )
+
+        for i, volume in enumerate(volumes):
+            single = cost_calculator.calculate_table_costs(volume, "Hot", "Archive")
+            for column, value in single.items():
+                assert abs(batch[column][i] - value) < 1e-9
+
+        assert list(batch["table_name"]) == [f"Table{i}" for i in range(len(volumes))]
+
+    def test_batch_costs_large_workspace(self):
+        """Costing 100k tables is a single vectorized pass"""
+        count = 100_000
+        started = time.perf_counter()
+        batch = cost_calculator.calculate_batch_costs(
+            [f"Table{i}" for i in range(count)], [1.0] * count, ["Hot"] * count
+        )
+        elapsed = time.perf_counter() - started
+
+        assert len(batch["annual_savings"]) == count
+        assert elapsed < 1.0
+
+    def test_cost_table_keyed_by_table_name(self):
+        """The per-audit cost table is computed once and read by name"""
+        cost_table = cost_calculator.build_cost_table(
+            ["SecurityEvent", "Syslog"], {"SecurityEvent": 10.0}, ["Hot", "Hot"]
+        )
+
+        assert len(cost_table) == 2
+        assert "Syslog" in cost_table
+        assert cost_table.get("Missing") is None
+
+        row = cost_table.get("SecurityEvent")
+        single = cost_calculator.calculate_table_costs(10.0, "Hot", "Archive")
+        assert row["ingestion_gb_per_day"] == 10.0
+        assert all(abs(row[column] - value) < 1e-9 for column, value in single.items())
+        assert cost_table.get("Syslog")["annual_savings"] == 0.0
+
+        rows = list(cost_table.rows())
+        assert [r["table_name"] for r in rows] == ["SecurityEvent", "Syslog"]
+        assert cost_table.total("monthly_savings") == row["monthly_savings"]
+
+    def test_workspace_specific_rates(self, monkeypatch):
+        """Costs use the workspace's regional rate, resolved once per batch"""
+        from src.models.schemas import WorkspacePricingProfile
+        from src.services import cost_calculator as cost_module
+        from src.services.pricing import PricingService
+
+        service = PricingService(region="eastus", snapshot_path="")
+        service.index.add("westeurope", "USD", "Hot", 0, 3.0)
+        service.index.add("westeurope", "USD", "Archive", 0, 0.03)
+        monkeypatch.setattr(cost_module, "pricing_service", service)
+
+        profile = WorkspacePricingProfile(region="westeurope")
+        batch = cost_calculator.calculate_batch_costs(["T"], [1.0], ["Hot"], pricing_profile=profile)
+        single = cost_calculator.calculate_table_costs(1.0, "Hot", "Archive", pricing_profile=profile)
+
+        assert batch["daily_cost_hot"][0] == single["daily_cost_hot"] == 3.0
+        assert batch["daily_cost_archive"][0] == single["daily_cost_archive"] == 0.03
+        # Regions missing from the index fall back to approximate pricing
+        unknown = WorkspacePricingProfile(region="mars")
+        fallback = cost_calculator.calculate_table_costs(1.0, "Hot", pricing_profile=unknown)
+        assert fallback["daily_cost_hot"] == 0.10
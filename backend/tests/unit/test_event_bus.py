@@ -0,0 +1,100 @@
+"""
+Unit tests for the audit progress event bus
+"""
+
+import asyncio
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from src.models.schemas import JobStatus, ToolExecutionEvent
+from src.services.event_bus import EventBus
+
+
+def make_event(step: int) -> ToolExecutionEvent:
+    """Build a tool_completed event for a step"""
+    return ToolExecutionEvent(
+        event_type="tool_completed",
+        step_number=step,
+        tool_name=f"tool_{step}",
+        details="done",
+        timestamp=datetime.utcnow()
+    )
+
+
+async def collect(bus, job_id, last_event_id=0, heartbeat=5.0):
+    """Read a subscription until the stream closes"""
+    received = []
+    async for event_id, event in bus.subscribe(job_id, last_event_id, heartbeat):
+        received.append(event_id)
+    return received
+
+
+class TestEventBus:
+    """Test fan-out, resume and heartbeats"""
+
+    @pytest.mark.asyncio
+    async def test_fan_out_to_many_subscribers(self):
+        """Every subscriber sees every event from one shared buffer"""
+        bus = EventBus(max_events_per_job=100, retention_seconds=60)
+        subscribers = [asyncio.create_task(collect(bus, "job-1")) for _ in range(20)]
+        await asyncio.sleep(0)
+
+        for step in range(1, 6):
+            bus.publish("job-1", make_event(step))
+            await asyncio.sleep(0)
+        bus.close("job-1")
+
+        results = await asyncio.gather(*subscribers)
+
+        assert all(ids == [1, 2, 3, 4, 5] for ids in results)
+        assert len(bus._streams) == 1
+
+    @pytest.mark.asyncio
+    async def test_resume_from_last_event_id(self):
+        """A reconnecting client only receives events it has not seen"""
+        bus = EventBus(max_events_per_job=100, retention_seconds=60)
+        for step in range(1, 6):
+            bus.publish("job-1", make_event(step))
+        bus.close("job-1")
+
+        assert await collect(bus, "job-1", last_event_id=3) == [4, 5]
+
+    @pytest.mark.asyncio
+    async def test_ring_buffer_is_bounded(self):
+        """Old events fall off the buffer; IDs keep increasing"""
+        bus = EventBus(max_events_per_job=3, retention_seconds=60)
+        for step in range(1, 11):
+            bus.publish("job-1", make_event(step))
+        bus.close("job-1")
+
+        assert await collect(bus, "job-1") == [8, 9, 10]
+        assert await collect(bus, "job-1", last_event_id=8) == [9, 10]
+
+    @pytest.mark.asyncio
+    async def test_heartbeat_when_idle(self):
+        """Idle subscribers receive heartbeat markers"""
+        bus = EventBus(max_events_per_job=10, retention_seconds=60)
+        subscription = bus.subscribe("job-1", 0, heartbeat_seconds=0.01)
+
+        event_id, event = await subscription.__anext__()
+        await subscription.aclose()
+
+        assert event_id is None and event is None
+
+    @pytest.mark.asyncio
+    async def test_job_status_follows_the_runner(self):
+        """A failed tool leaves the job running; the runner's status closes the stream"""
+        bus = EventBus(max_events_per_job=10, retention_seconds=60)
+        job = SimpleNamespace(job_id="job-1")
+
+        await bus.on_job_status(job, JobStatus.RUNNING)
+        bus.publish("job-1", make_event(1).model_copy(update={"event_type": "tool_failed"}))
+        assert bus.job_status("job-1") == JobStatus.RUNNING
+        assert not bus._streams["job-1"].closed
+
+        await bus.on_job_status(job, JobStatus.COMPLETED)
+
+        assert bus.job_status("job-1") == JobStatus.COMPLETED
+        assert await collect(bus, "job-1") == [1]
+        assert bus.job_status("job-2") is None
@@ -0,0 +1,93 @@
+"""
+Unit tests for the Monte Carlo savings forecaster
+"""
+
+import time
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+from src.services.forecasting import SavingsForecaster, build_daily_matrix
+
+RATES = {"Hot": 2.0, "Basic": 0.5, "Archive": 0.02}
+START = date(2026, 1, 1)
+
+
+def daily_rows(table_name: str, values) -> list:
+    """(day, table, GB) rows for consecutive days"""
+    return [(START + timedelta(days=i), table_name, float(gb)) for i, gb in enumerate(values)]
+
+
+class TestSavingsForecaster:
+    """Test the daily matrix and the P10/P50/P90 forecast"""
+
+    def test_daily_matrix_fills_missing_days(self):
+        """Days without a row count as zero ingestion"""
+        rows = daily_rows("A", [1.0, 2.0, 3.0]) + [(START + timedelta(days=2), "B", 5.0)]
+        matrix = build_daily_matrix(rows, ["B", "A", "C"])
+
+        assert matrix.tolist() == [[0.0, 0.0, 5.0], [1.0, 2.0, 3.0], [0.0, 0.0, 0.0]]
+
+    def test_constant_ingestion_has_no_spread(self):
+        """A flat series forecasts exactly volume x horizon x saving"""
+        forecaster = SavingsForecaster(simulations=1000, horizon_days=90, seed=1)
+        forecast = forecaster.forecast(
+            ["A"], ["Hot"], ["Archive"], daily_rows("A", [10.0] * 30), RATES
+        )
+
+        expected = 10.0 * 90 * (2.0 - 0.02)
+        assert forecast.p10_savings == pytest.approx(expected)
+        assert forecast.p90_savings == pytest.approx(expected)
+        assert forecast.tables_forecast == 1
+        assert forecast.history_days == 30
+
+    def test_noisy_ingestion_widens_interval(self):
+        """Percentiles are ordered around the mean volume"""
+        rng = np.random.default_rng(0)
+        forecaster = SavingsForecaster(simulations=5000, horizon_days=90, seed=1)
+        forecast = forecaster.forecast(
+            ["A"], ["Hot"], ["Basic"], daily_rows("A", rng.normal(10.0, 3.0, 60)), RATES
+        )
+
+        assert forecast.p10_savings < forecast.p50_savings < forecast.p90_savings
+        # The fitted trend is noisy too, so only a loose bound on the median
+        assert forecast.p50_savings == pytest.approx(10.0 * 90 * 1.5, rel=0.3)
+
+    def test_only_moved_tables_are_forecast(self):
+        """Tables that stay on their tier contribute no savings"""
+        rows = daily_rows("Moved", [1.0] * 10) + daily_rows("Kept", [100.0] * 10)
+        forecaster = SavingsForecaster(simulations=100, horizon_days=30, seed=1)
+        forecast = forecaster.forecast(
+            ["Moved", "Kept"], ["Hot", "Hot"], ["Archive", None], rows, RATES
+        )
+
+        assert forecast.tables_forecast == 1
+        assert forecast.p50_savings == pytest.approx(30 * 1.98)
+
+    def test_no_moves_or_history_returns_none(self):
+        """Nothing to forecast yields no forecast"""
+        forecaster = SavingsForecaster(simulations=100, seed=1)
+
+        assert forecaster.forecast(["A"], ["Hot"], [None], daily_rows("A", [1.0]), RATES) is None
+        assert forecaster.forecast(["A"], ["Hot"], ["Archive"], [], RATES) is None
+
+    @pytest.mark.slow
+    def test_large_workspace_forecasts_in_seconds(self):
+        """5,000 tables x 5,000 simulations stays well inside the audit budget"""
+        rng = np.random.default_rng(0)
+        names = [f"Table{i}" for i in range(5000)]
+        history = rng.gamma(2.0, 5.0, size=(len(names), 30))
+        rows = [
+            (START + timedelta(days=d), name, float(history[i, d]))
+            for i, name in enumerate(names) for d in range(30)
+        ]
+        forecaster = SavingsForecaster(simulations=5000, horizon_days=90, seed=1)
+
+        start = time.perf_counter()
+        forecast = forecaster.forecast(
+            names, ["Hot"] * len(names), ["Archive"] * len(names), rows, RATES
+        )
+        elapsed = time.perf_counter() - start
+
+        assert forecast.tables_forecast == len(names)
+        assert elapsed < 10.0
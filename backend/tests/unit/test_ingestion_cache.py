@@ -0,0 +1,113 @@
+"""
+Unit tests for the daily ingestion cache
+"""
+
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from src.services import azure_api as azure_api_module
+from src.services.azure_api import AzureApiService
+from src.services.ingestion_cache import IngestionCache, IngestionSeries
+
+TODAY = datetime.utcnow().date()
+
+
+def day(offset: int):
+    """UTC day `offset` days ago"""
+    return TODAY - timedelta(days=offset)
+
+
+class FakeLogsClient:
+    """Serves Usage rows of 1 GB/day for SecurityEvent, recording each query"""
+
+    def __init__(self):
+        self.timespans = []
+
+    async def query_workspace(self, workspace_id, query, timespan):
+        start, end = timespan
+        self.timespans.append((start.date(), end.date()))
+        rows = []
+        current = start
+        while current < end:
+            rows.append([current, "SecurityEvent", 1.0])
+            current += timedelta(days=1)
+        return SimpleNamespace(tables=[SimpleNamespace(rows=rows)])
+
+
+@pytest.fixture
+def api(tmp_path, monkeypatch):
+    """AzureApiService over a fake logs client and a temporary cache"""
+    cache = IngestionCache(root=str(tmp_path), settle_days=2)
+    monkeypatch.setattr(azure_api_module, "ingestion_cache", cache)
+
+    service = AzureApiService()
+    service.logs_query_client = FakeLogsClient()
+
+    async def ready():
+        pass
+
+    service._ensure_clients = ready
+    return service
+
+
+class TestIngestionSeries:
+    """Test merging and windowing the columnar series"""
+
+    def test_merge_adds_days_and_tables(self):
+        """Queried days without rows are recorded as zero ingestion"""
+        series = IngestionSeries().merge([day(3), day(2)], [(day(3), "A", 2.0)])
+        series = series.merge([day(1)], [(day(1), "B", 5.0)])
+
+        tables, gb = series.window([day(3), day(2), day(1)])
+        assert tables == ["A", "B"]
+        assert gb.tolist() == [[2.0, 0.0, 0.0], [0.0, 0.0, 5.0]]
+        assert series.missing_days([day(4), day(2)]) == [day(4)]
+
+    def test_requery_replaces_cached_day(self):
+        """A re-queried day overwrites, not adds to, the cached value"""
+        series = IngestionSeries().merge([day(1)], [(day(1), "A", 2.0)])
+        series = series.merge([day(1)], [(day(1), "A", 3.0)])
+
+        assert series.window([day(1)])[1].tolist() == [[3.0]]
+
+
+class TestIngestionCache:
+    """Test persistence and incremental Usage queries"""
+
+    @pytest.mark.asyncio
+    async def test_only_settled_days_are_persisted(self, tmp_path):
+        """Recent days stay out of the cache file"""
+        cache = IngestionCache(root=str(tmp_path), settle_days=2)
+        key = cache.workspace_key("sub", "rg", "ws")
+        merged = await cache.update(
+            key, [day(3), day(2), day(1)], [(day(d), "A", 1.0) for d in (3, 2, 1)]
+        )
+
+        assert len(merged) == 3
+        reloaded = IngestionCache(root=str(tmp_path), settle_days=2)
+        assert (await reloaded.load(key)).missing_days([day(3), day(2), day(1)]) == [day(1)]
+
+    @pytest.mark.asyncio
+    async def test_second_audit_queries_only_missing_days(self, api):
+        """Cached days are not re-queried; averages are computed locally"""
+        volume = await api.get_ingestion_volume("rg", "ws", days_lookback=10)
+        assert volume == {"SecurityEvent": pytest.approx(1.0)}
+        assert api.logs_query_client.timespans == [(day(10), TODAY)]
+
+        # A longer lookback only needs the older days and the unsettled ones
+        volume = await api.get_ingestion_volume("rg", "ws", days_lookback=20)
+        assert volume == {"SecurityEvent": pytest.approx(1.0)}
+        assert api.logs_query_client.timespans[1] == (day(20), TODAY)
+
+        daily = await api.get_daily_ingestion("rg", "ws", days_lookback=20)
+        assert len(daily) == 20
+        assert api.logs_query_client.timespans[2] == (day(1), TODAY)
+
+    @pytest.mark.asyncio
+    async def test_shorter_lookback_is_partly_cached(self, api):
+        """Only the unsettled days are queried when the window is cached"""
+        await api.get_ingestion_volume("rg", "ws", days_lookback=30)
+        await api.get_ingestion_volume("rg", "ws", days_lookback=7)
+
+        assert api.logs_query_client.timespans[1] == (day(1), TODAY)
@@ -0,0 +1,114 @@
+"""
+Unit tests for the audit job runner
+"""
+
+import asyncio
+
+import pytest
+from src.agents import job_runner
+from src.agents.job_runner import AuditJobRunner
+from src.models.schemas import AuditJobRequest, JobStatus
+from src.utils.errors import JobQueueFullException
+
+
+def make_job(job_id: str, tenant_id: str = "tenant-a") -> AuditJobRequest:
+    """Build a minimal audit job request"""
+    return AuditJobRequest(
+        job_id=job_id,
+        tenant_id=tenant_id,
+        workspace_id="ws",
+        subscription_id="sub",
+        resource_group="rg",
+        workspace_name="ws"
+    )
+
+
+class FakeOrchestrator:
+    """Orchestrator stand-in that records concurrency per tenant"""
+
+    running = {}
+    peak = {}
+    instances = []
+
+    def __init__(self):
+        self.agent_id = None
+        FakeOrchestrator.instances.append(self)
+
+    async def execute_audit(self, job_id, **kwargs):
+        self.agent_id = job_id
+        tenant = job_id.split("-")[0]
+        FakeOrchestrator.running[tenant] = FakeOrchestrator.running.get(tenant, 0) + 1
+        FakeOrchestrator.peak[tenant] = max(
+            FakeOrchestrator.peak.get(tenant, 0), FakeOrchestrator.running[tenant]
+        )
+        await asyncio.sleep(0.05)
+        FakeOrchestrator.running[tenant] -= 1
+        return job_id
+
+    def get_execution_summary(self):
+        return {}
+
+
+@pytest.fixture
+def fake_orchestrator(monkeypatch):
+    """Swap in the fake orchestrator and reset its counters"""
+    FakeOrchestrator.running = {}
+    FakeOrchestrator.peak = {}
+    FakeOrchestrator.instances = []
+    monkeypatch.setattr(job_runner, "AgentOrchestrator", FakeOrchestrator)
+    return FakeOrchestrator
+
+
+class TestAuditJobRunner:
+    """Test worker pool isolation, tenant caps and backpressure"""
+
+    @pytest.mark.asyncio
+    async def test_each_job_gets_its_own_orchestrator(self, fake_orchestrator):
+        """Jobs never share orchestrator state"""
+        runner = AuditJobRunner(worker_count=4, max_pending=10, max_per_tenant=4)
+        completed = []
+
+        async def on_status(job, status, report, error):
+            if status == JobStatus.COMPLETED:
+                completed.append(report)
+
+        runner.add_listener(on_status)
+        await runner.start()
+        for i in range(4):
+            runner.submit(make_job(f"a-{i}"))
+        await runner._queue.join()
+        await runner.stop()
+
+        assert sorted(completed) == [f"a-{i}" for i in range(4)]
+        assert len({id(o) for o in fake_orchestrator.instances}) == 4
+        assert sorted(o.agent_id for o in fake_orchestrator.instances) == sorted(completed)
+
+    @pytest.mark.asyncio
+    async def test_per_tenant_cap(self, fake_orchestrator):
+        """A tenant never exceeds its concurrency cap, other tenants still run"""
+        runner = AuditJobRunner(worker_count=4, max_pending=20, max_per_tenant=1)
+
+        await runner.start()
+        for i in range(3):
+            runner.submit(make_job(f"a-{i}", "a"))
+        runner.submit(make_job("b-0", "b"))
+        await runner._queue.join()
+        await runner.stop()
+
+        assert fake_orchestrator.peak == {"a": 1, "b": 1}
+        assert len(fake_orchestrator.instances) == 4
+        assert runner.stats["pending"] == 0
+
+    @pytest.mark.asyncio
+    async def test_backpressure(self, fake_orchestrator):
+        """Submissions beyond the backlog limit are rejected"""
+        runner = AuditJobRunner(worker_count=1, max_pending=2, max_per_tenant=1)
+
+        await runner.start()
+        runner.submit(make_job("a-0"))
+        runner.submit(make_job("a-1"))
+
+        with pytest.raises(JobQueueFullException):
+            runner.submit(make_job("a-2"))
+
+        await runner.stop()
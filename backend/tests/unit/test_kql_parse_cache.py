@@ -0,0 +1,65 @@
+"""
+Unit tests for the KQL parse cache
+"""
+
+import pytest
+from src.services.kql_parse_cache import KqlParseCache
+from src.services.kql_parser import KqlParser
+
+QUERY = "SecurityEvent | where EventID == 4625 | join (SigninLogs) on Account"
+
+
+@pytest.fixture
+def parser():
+    """Parser over a fresh in-memory cache"""
+    return KqlParser(cache=KqlParseCache(max_entries=10, path=""))
+
+
+class TestKqlParseCache:
+    """Test memoization of parse results"""
+
+    def test_template_copies_hit_the_cache(self, parser):
+        """Formatting and comment differences share one entry"""
+        reformatted = "// Copy of the template\nSecurityEvent\n| where EventID == 4625\n| join (SigninLogs) on Account"
+        first, second = parser.batch_parse([QUERY, reformatted])
+
+        assert not first.from_cache and second.from_cache
+        assert second.tables == first.tables == ["SecurityEvent", "SigninLogs"]
+        assert (parser.cache.hits, parser.cache.misses) == (1, 1)
+
+    def test_one_off_queries_are_not_cached(self, parser):
+        """write_cache=False parses every copy and leaves the cache untouched"""
+        reformatted = f"// ad hoc\n{QUERY}"
+        first, second = parser.batch_parse([QUERY, reformatted], write_cache=False)
+
+        assert first.tables == second.tables == ["SecurityEvent", "SigninLogs"]
+        assert not first.from_cache and not second.from_cache
+        assert len(parser.cache._entries) == 0
+
+    def test_positions_only_reused_for_identical_text(self, parser):
+        """Offsets from another formatting of the query are dropped"""
+        parser.parse(QUERY)
+
+        assert parser.parse(QUERY).table_references
+        assert parser.parse(f"  {QUERY}").table_references == []
+
+    def test_lru_evicts_oldest(self):
+        """Entries beyond max_entries are evicted least-recently-used first"""
+        parser = KqlParser(cache=KqlParseCache(max_entries=2, path=""))
+        for query in ["TableA | count", "TableB | count", "TableA | count", "TableC | count"]:
+            parser.parse(query)
+
+        assert parser.parse("TableA | count").from_cache
+        assert not parser.parse("TableB | count").from_cache
+
+    def test_results_survive_restart(self, tmp_path):
+        """A new cache over the same file serves earlier results"""
+        path = str(tmp_path / "kql_parse_cache.db")
+        KqlParser(cache=KqlParseCache(path=path)).batch_parse([QUERY])
+
+        restarted = KqlParser(cache=KqlParseCache(path=path))
+        result = restarted.parse(QUERY)
+
+        assert result.from_cache
+        assert result.tables == ["SecurityEvent", "SigninLogs"]
+        assert [r.table_name for r in result.table_references] == ["SecurityEvent", "SigninLogs"]
@@ -2,8 +2,14 @@
 Unit tests for KQL parser
 """
 
+import os
+import re
+import time
+from concurrent.futures import Future
+
 import pytest
-from src.services.kql_parser import kql_parser
+from src.services.kql_parse_cache import KqlParseCache
+from src.services.kql_parser import KqlParser, kql_parser
 from src.models.schemas import ConfidenceLevel
 
 
@@ -17,7 +23,7 @@ class TestKqlParser:
 
         assert result.success
         assert "SecurityEvent" in result.tables
-        assert result.parsing_method == "REGEX"
+        assert result.parsing_method == "AST"
 
     def test_multiple_tables_union(self):
         """Test parsing union statement"""
@@ -106,3 +112,134 @@ class TestKqlParser:
         assert result.success
         assert "SecurityEvent" in result.tables
         assert result.confidence in [ConfidenceLevel.HIGH, ConfidenceLevel.MEDIUM]
+
+
+class TestParallelBatchParse:
+    """Test chunked batch parsing across the worker pool"""
+
+    QUERIES = [
+        f"Table{i} | where EventID == {i}" if i % 7 else 'Broken | where x == "unterminated'
+        for i in range(60)
+    ] + [""]
+
+    def test_pool_keeps_order_and_isolates_errors(self):
+        """Parallel results line up with the serial ones, failures included"""
+        serial = KqlParser(cache=KqlParseCache(path=""), workers=1)
+        parallel = KqlParser(
+            cache=KqlParseCache(path=""), workers=2, parallel_threshold=10, chunk_size=8
+        )
+        try:
+            expected = serial.batch_parse(self.QUERIES)
+            results = parallel.batch_parse(self.QUERIES)
+        finally:
+            parallel.shutdown()
+
+        assert [set(r.tables) for r in results] == [set(r.tables) for r in expected]
+        assert [r.parsing_method for r in results] == [r.parsing_method for r in expected]
+        assert results[7].parsing_method == "REGEX" and not results[-1].success
+
+    def test_crashed_worker_falls_back_to_serial(self):
+        """A chunk whose worker dies is parsed in-process"""
+        class BrokenExecutor:
+            def submit(self, func, *args):
+                future = Future()
+                future.set_exception(RuntimeError("worker died"))
+                return future
+
+            def shutdown(self, **kwargs):
+                pass
+
+        parser = KqlParser(cache=KqlParseCache(path=""), workers=2, parallel_threshold=1)
+        parser._executor = BrokenExecutor()
+
+        results = parser.batch_parse(["SecurityEvent | count", "SigninLogs | count"])
+        assert [r.tables for r in results] == [["SecurityEvent"], ["SigninLogs"]]
+
+    @pytest.mark.slow
+    @pytest.mark.skipif((os.cpu_count() or 1) < 4, reason="needs at least 4 cores")
+    def test_scales_with_cores(self):
+        """Parsing 20,000 distinct queries scales close to linearly with workers"""
+        workers = min(os.cpu_count(), 8)
+        queries = [
+            f"let t = {i}d; union Table{i}, (SigninLogs | where TimeGenerated > ago(t)) "
+            f"| join kind=inner (AuditLogs | project Id{i}) on Id{i}"
+            for i in range(20000)
+        ]
+        serial = KqlParser(cache=KqlParseCache(path=""), workers=1)
+        parallel = KqlParser(cache=KqlParseCache(path=""), workers=workers, parallel_threshold=1)
+        try:
+            parallel.batch_parse(queries[:workers * 200])  # start the pool
+
+            start = time.perf_counter()
+            serial.batch_parse(queries)
+            serial_elapsed = time.perf_counter() - start
+
+            parallel.cache = KqlParseCache(path="")
+            start = time.perf_counter()
+            parallel.batch_parse(queries)
+            parallel_elapsed = time.perf_counter() - start
+        finally:
+            parallel.shutdown()
+
+        assert serial_elapsed / parallel_elapsed > workers * 0.5
+
+
+class TestRegexFallback:
+    """Test the precompiled regex path"""
+
+    # The regex path as originally written: string patterns, IGNORECASE
+    REFERENCE_PATTERNS = [
+        r'\b([A-Z][a-zA-Z0-9_]*)\b(?=\s*[\|\;]|$)',
+        r'workspace\s*\(\s*["\']([^"\']+)["\']\s*\)\s*\.\s*([A-Z][a-zA-Z0-9_]*)',
+        r'union\s+\(?([A-Z][a-zA-Z0-9_]*(?:\s*,\s*[A-Z][a-zA-Z0-9_]*)*)\)?',
+        r'datatable\s*\([^)]+\)\s*\[\s*([A-Z][a-zA-Z0-9_]*)',
+    ]
+
+    QUERIES = [
+        "SecurityEvent | where EventID == 4625",
+        "// failed logons\nlet threshold = 5;\nSigninLogs\n| where ResultType != 0\n| summarize n = count() by User;",
+        'union SecurityEvent, Syslog | project Computer',
+        'UNION (AuditLogs) | take 10',
+        'workspace("prod").Heartbeat | summarize max(TimeGenerated) by Computer',
+        "datatable(Name: string)['a', 'b'] | join kind=inner (Perf | where CounterValue > 90) on Name",
+    ]
+
+    @classmethod
+    def reference_tables(cls, kql):
+        """Tables found by the original per-call re.findall implementation"""
+        cleaned = re.sub(r'\s+', ' ', re.sub(r'/\*.*?\*/', '', re.sub(r'//.*$', '', kql, flags=re.M), flags=re.S)).strip()
+        tables = set()
+        for pattern in cls.REFERENCE_PATTERNS:
+            for match in re.findall(pattern, cleaned, re.MULTILINE | re.IGNORECASE):
+                for group in (match if isinstance(match, tuple) else (match,)):
+                    if group and group.strip() and kql_parser._is_valid_table_name(group.strip().split()[0]):
+                        tables.add(group.strip().split()[0])
+        return tables
+
+    def test_matches_reference_implementation(self):
+        """Compiled patterns find exactly what the original patterns did"""
+        for kql in self.QUERIES:
+            assert kql_parser._parse_with_regex(kql)[0] == self.reference_tables(kql)
+
+    def test_keywords_are_rejected(self):
+        """The keyword table is case-insensitive"""
+        assert not kql_parser._is_valid_table_name("Summarize")
+        assert not kql_parser._is_valid_table_name("Security-Event")
+        assert kql_parser._is_valid_table_name("SecurityEvent")
+
+    @pytest.mark.slow
+    def test_faster_than_reference_implementation(self):
+        """Micro-benchmark: precompiled scan beats per-call re.findall"""
+        corpus = [f"{kql}\n| extend Marker{i} = {i}" for i in range(500) for kql in self.QUERIES]
+
+        start = time.perf_counter()
+        for kql in corpus:
+            self.reference_tables(kql)
+        reference_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for kql in corpus:
+            kql_parser._parse_with_regex(kql)
+        elapsed = time.perf_counter() - start
+
+        assert elapsed * 1.5 < reference_elapsed
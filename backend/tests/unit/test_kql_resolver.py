@@ -0,0 +1,67 @@
+"""
+Unit tests for saved function and wildcard resolution
+"""
+
+import pytest
+from src.models.schemas import WorkspaceFunction
+from src.services.kql_parse_cache import KqlParseCache
+from src.services.kql_parser import KqlParser
+from src.services.kql_resolver import KqlResolver
+from src.services.table_catalog import TableCatalog
+
+CATALOG = TableCatalog(["DnsEvents", "Syslog", "SyslogArchive_CL", "SecurityEvent", "ASimDnsActivityLogs"])
+
+FUNCTIONS = [
+    WorkspaceFunction(function_alias="_Im_Dns", query="union isfuzzy=true _ASim_Dns_Microsoft(), ASimDnsActivityLogs"),
+    WorkspaceFunction(function_alias="_ASim_Dns_Microsoft", query="DnsEvents | where SubType == 'LookupQuery'"),
+    WorkspaceFunction(
+        function_alias="FilterEvents",
+        query="T | where EventID == id",
+        function_parameters="T:(EventID:int), id:int"
+    ),
+    WorkspaceFunction(function_alias="LoopA", query="LoopB | count"),
+    WorkspaceFunction(function_alias="LoopB", query="LoopA | union SecurityEvent"),
+]
+
+
+@pytest.fixture
+def parser():
+    """Parser over a fresh in-memory cache"""
+    return KqlParser(cache=KqlParseCache(path=""))
+
+
+class TestKqlResolver:
+    """Test function and wildcard expansion"""
+
+    def test_nested_functions_expand_to_tables(self, parser):
+        """ASIM-style parsers resolve through nested functions"""
+        resolver = KqlResolver(FUNCTIONS, CATALOG)
+        result = parser.parse("_Im_Dns(starttime=ago(1d)) | where ResponseCode != 0", CATALOG, resolver)
+
+        assert result.success
+        assert result.tables == ["DnsEvents", "ASimDnsActivityLogs"]
+
+    def test_wildcard_union_expands_against_catalog(self, parser):
+        """union Syslog* reads every matching workspace table"""
+        resolver = KqlResolver([], CATALOG)
+        result = parser.parse("union withsource=TableName Syslog* | count", CATALOG, resolver)
+
+        assert result.tables == ["Syslog", "SyslogArchive_CL"]
+
+    def test_tabular_parameters_are_not_tables(self):
+        """A function's tabular parameter is bound by the caller"""
+        assert KqlResolver(FUNCTIONS, CATALOG).resolve_function("FilterEvents") == []
+
+    def test_cycles_terminate(self):
+        """Mutually recursive functions resolve to what they read directly"""
+        assert KqlResolver(FUNCTIONS, CATALOG).resolve_function("LoopA") == ["SecurityEvent"]
+
+    def test_function_bodies_parsed_once(self, parser):
+        """Hundreds of rules calling one function parse its body once"""
+        resolver = KqlResolver(FUNCTIONS, CATALOG)
+        queries = [f"_Im_Dns | where DnsQuery has 'host{i}'" for i in range(200)]
+
+        results = parser.batch_parse(queries, CATALOG, resolver)
+
+        assert all(r.tables == ["DnsEvents", "ASimDnsActivityLogs"] for r in results)
+        assert resolver.bodies_parsed == 2
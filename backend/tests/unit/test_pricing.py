@@ -0,0 +1,110 @@
+"""
+Unit tests for the retail pricing service
+"""
+
+import httpx
+import pytest
+from src.services.pricing import PricingService
+
+
+def price_item(meter: str, sku: str, price: float, region: str = "eastus") -> dict:
+    """Build a Retail Prices API item"""
+    return {
+        "armRegionName": region,
+        "meterName": meter,
+        "skuName": sku,
+        "unitPrice": price,
+        "tierMinimumUnits": 0.0,
+    }
+
+
+PAGES = {
+    None: {
+        "Items": [price_item("Analytics Logs Data Ingestion", "Analytics Logs", 2.3)],
+        "NextPageLink": "https://prices.azure.com/api/retail/prices?$skip=100",
+    },
+    "100": {
+        "Items": [
+            price_item("Basic Logs Data Ingestion", "Basic Logs", 0.5),
+            price_item("Data Archive", "Pay-as-you-go", 0.02),
+        ],
+        "NextPageLink": None,
+    },
+}
+
+
+def paged_transport(requests_seen: list) -> httpx.MockTransport:
+    """Serve PAGES, keyed by the $skip query parameter"""
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests_seen.append(str(request.url))
+        return httpx.Response(200, json=PAGES[request.url.params.get("$skip")])
+
+    return httpx.MockTransport(handler)
+
+
+class TestPricingService:
+    """Test paging, lookups and the disk snapshot"""
+
+    @pytest.mark.asyncio
+    async def test_refresh_follows_next_page_link(self, tmp_path):
+        """All pages are fetched and indexed by (region, meter, sku)"""
+        seen = []
+        service = PricingService(
+            region="eastus", snapshot_path=str(tmp_path / "prices.json"),
+            transport=paged_transport(seen)
+        )
+
+        assert await service.refresh()
+
+        assert len(seen) == 2
+        assert service.get_price("Hot") == 2.3
+        assert service.get_price("Basic") == 0.5
+        assert service.get_price("Archive") == 0.02
+        assert service.get_price("Hot", region="westeurope") is None
+        assert not service.is_stale
+
+    @pytest.mark.asyncio
+    async def test_snapshot_serves_offline_runs(self, tmp_path):
+        """A fresh process loads prices from the snapshot without the network"""
+        snapshot = str(tmp_path / "prices.json")
+        online = PricingService(region="eastus", snapshot_path=snapshot, transport=paged_transport([]))
+        await online.refresh()
+
+        offline = PricingService(region="eastus", snapshot_path=snapshot)
+        assert offline.load_snapshot()
+        assert offline.get_price("Hot") == 2.3
+        assert offline.fetched_at == pytest.approx(online.fetched_at, abs=1e-3)
+
+    @pytest.mark.asyncio
+    async def test_failed_refresh_keeps_prices(self, tmp_path):
+        """API errors never clear the index"""
+        service = PricingService(
+            region="eastus", snapshot_path="", transport=paged_transport([])
+        )
+        await service.refresh()
+
+        service._transport = httpx.MockTransport(lambda request: httpx.Response(503))
+        assert not await service.refresh()
+        assert service.get_price("Hot") == 2.3
+
+    def test_index_by_region_currency_tier_commitment(self):
+        """Regional, currency and commitment-tier prices are kept apart"""
+        items = [
+            price_item("Analytics Logs Data Ingestion", "Analytics Logs", 2.3),
+            price_item("Analytics Logs Data Ingestion", "Analytics Logs", 2.99, region="westeurope"),
+            dict(price_item("Analytics Logs Data Ingestion", "Analytics Logs", 2.1), currencyCode="EUR"),
+            price_item("100 GB Commitment Tier Capacity Reservation", "100 GB Commitment Tier", 196.0),
+            price_item("Basic Logs Data Ingestion", "Basic Logs", 0.5),
+        ]
+        service = PricingService(region="eastus", currency="USD", snapshot_path="")
+        service._load_items(items, fetched_at=0)
+
+        assert service.get_price("Hot") == 2.3
+        assert service.get_price("Hot", region="westeurope") == 2.99
+        assert service.get_price("Hot", currency="EUR") == 2.1
+        assert service.get_price("Hot", commitment=100) == 1.96
+        # Commitment tiers only discount Analytics ingestion
+        assert service.get_price("Basic", commitment=100) == 0.5
+        # Unknown commitment levels fall back to pay-as-you-go
+        assert service.get_price("Hot", commitment=500) == 2.3
+        assert service.index.commitment_levels("eastus", "USD") == [100]
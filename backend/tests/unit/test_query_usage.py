@@ -0,0 +1,129 @@
+"""
+Unit tests for LAQueryLogs table usage
+"""
+
+from datetime import date, datetime
+from types import SimpleNamespace
+
+import pytest
+from src.models.schemas import TableIngestionData, TierType
+from src.services.azure_api import AzureApiService
+from src.services.kql_parse_cache import KqlParseCache
+from src.services.kql_parser import KqlParser
+from src.services.report_generator import ReportGenerator
+from src.services.table_catalog import TableCatalog
+from src.services.usage_index import QueryLogUsage, attribute_query_log
+
+DAY_1 = datetime(2026, 3, 1)
+DAY_2 = datetime(2026, 3, 2)
+
+
+class FakeLogsClient:
+    """Serves server-side aggregated LAQueryLogs rows, recording each query"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = []
+
+    async def query_workspace(self, workspace_id, query, timespan):
+        self.queries.append(query)
+        return SimpleNamespace(tables=[SimpleNamespace(rows=self.rows)])
+
+
+def api_with_rows(rows):
+    """AzureApiService over a fake logs client"""
+    service = AzureApiService()
+    service.logs_query_client = FakeLogsClient(rows)
+
+    async def ready():
+        pass
+
+    service._ensure_clients = ready
+    return service
+
+
+class TestQueryUsageFetch:
+    """Test fetching and attributing LAQueryLogs aggregates"""
+
+    @pytest.mark.asyncio
+    async def test_rows_grouped_by_query_hash(self):
+        """Rows for the same query hash on several days share one text"""
+        api = api_with_rows([
+            [DAY_1, "h1", 40, "SigninLogs | where ResultType != 0"],
+            [DAY_2, "h1", 25, "SigninLogs | where ResultType != 0"],
+            [DAY_2, "h2", 3, "union SigninLogs, AuditLogs | count"],
+        ])
+
+        texts, daily_counts = await api.get_query_usage("rg", "ws", 30, max_queries=500)
+
+        assert texts == {
+            "h1": "SigninLogs | where ResultType != 0",
+            "h2": "union SigninLogs, AuditLogs | count",
+        }
+        assert daily_counts["h1"] == [(date(2026, 3, 1), 40), (date(2026, 3, 2), 25)]
+        assert "hash_sha256(QueryText)" in api.logs_query_client.queries[0]
+        # The long tail of one-off queries is cut server-side
+        assert "top 500 by QueryCount" in api.logs_query_client.queries[0]
+
+    @pytest.mark.asyncio
+    async def test_no_query_logs(self):
+        """An empty result yields no queries"""
+        assert await api_with_rows([]).get_query_usage("rg", "ws", 30) == ({}, {})
+
+    def test_daily_counts_spread_over_tables(self):
+        """Each table a query reads gets that query's daily counts"""
+        texts = {
+            "h1": "SigninLogs | where ResultType != 0",
+            "h2": "union SigninLogs, AuditLogs | count",
+            "h3": "print now()",
+        }
+        daily_counts = {
+            "h1": [(date(2026, 3, 1), 40), (date(2026, 3, 2), 25)],
+            "h2": [(date(2026, 3, 2), 3)],
+            "h3": [(date(2026, 3, 2), 9)],
+        }
+        parser = KqlParser(cache=KqlParseCache(path=""), workers=1)
+        results = parser.batch_parse(list(texts.values()), TableCatalog(["SigninLogs", "AuditLogs"]))
+
+        rows = attribute_query_log(daily_counts, list(texts), results)
+
+        assert sorted(rows) == [
+            (date(2026, 3, 1), "SigninLogs", 40),
+            (date(2026, 3, 2), "AuditLogs", 3),
+            (date(2026, 3, 2), "SigninLogs", 28),
+        ]
+
+
+class TestQueryUsageScoring:
+    """Test query log usage in recommendations"""
+
+    def test_queried_tables_are_not_archived(self):
+        """Occasionally queried tables move to Basic; daily ones stay Hot"""
+        names = ["Unused", "AdHoc", "Daily"]
+        query_usage = [(date(2026, 3, 1), "AdHoc", 2)]
+        query_usage += [(date(2026, 3, day), "Daily", 10) for day in range(1, 11)]
+
+        report = ReportGenerator.generate_report(
+            job_id="job", workspace_id="ws", workspace_name="ws",
+            tables=[
+                TableIngestionData(
+                    table_name=name, ingestion_gb_per_day=1.0, ingestion_gb_per_month=30.0,
+                    current_tier=TierType.HOT, retention_days=90
+                )
+                for name in names
+            ],
+            rules=[], ingestion_data=dict.fromkeys(names, 1.0), connectors=[],
+            kql_parse_results=[], agent_tokens_used=0, agent_max_tokens=1, agent_run_seconds=0.0,
+            query_usage=query_usage
+        )
+
+        assert [r.table_name for r in report.archive_candidates] == ["Unused"]
+        assert [(r.table_name, r.query_count) for r in report.low_usage_candidates] == [("AdHoc", 2)]
+        assert [(r.table_name, r.query_days) for r in report.active_tables] == [("Daily", 10)]
+        assert report.metadata.query_log_tables == 2
+
+    def test_query_log_usage_totals(self):
+        """Queries are summed and days counted per table"""
+        usage = QueryLogUsage([(date(2026, 3, 1), "A", 2), (date(2026, 3, 2), "A", 3)])
+
+        assert (usage.queries["A"], usage.days["A"], len(usage)) == (5, 2, 1)
@@ -0,0 +1,97 @@
+"""
+Unit tests for the filesystem report store
+"""
+
+import gzip
+import json
+import os
+from datetime import datetime
+
+import pytest
+from src.models.schemas import ExecutionMetadata, Report, ReportSummary
+from src.services.report_store import FilesystemReportStore
+
+
+def make_report(job_id: str, tables: int = 10) -> Report:
+    """Build a minimal report"""
+    return Report(
+        job_id=job_id,
+        workspace_id="ws",
+        workspace_name="ws",
+        timestamp=datetime(2026, 1, 1),
+        summary=ReportSummary(
+            total_tables_analyzed=tables,
+            total_ingestion_gb_per_month=1.0,
+            total_monthly_cost_hot=1.0,
+            total_monthly_cost_archive=0.5,
+            total_monthly_savings=0.5,
+            total_annual_savings=6.0,
+            tables_by_tier={"Hot": tables},
+            tables_by_confidence={"HIGH": tables}
+        ),
+        metadata=ExecutionMetadata(
+            agent_run_timestamp=datetime(2026, 1, 1),
+            agent_completion_time_seconds=1.0,
+            kql_parsing_success_rate=1.0,
+            tables_analyzed=tables,
+            rules_analyzed=0,
+            workbooks_analyzed=0,
+            hunt_queries_analyzed=0,
+            agent_tokens_used=0,
+            agent_tokens_limit=50000
+        )
+    )
+
+
+class TestFilesystemReportStore:
+    """Test persistence, content hashing and the LRU"""
+
+    @pytest.mark.asyncio
+    async def test_round_trip_from_disk(self, tmp_path):
+        """A fresh store (empty LRU) reads the compressed report back"""
+        saved = await FilesystemReportStore(str(tmp_path)).save("job-1", make_report("job-1"))
+
+        fresh = FilesystemReportStore(str(tmp_path))
+        loaded = await fresh.get("job-1")
+
+        assert os.path.exists(tmp_path / "job-1" / f"{saved.content_hash}.json.gz")
+        assert loaded.etag == saved.etag
+        assert json.loads(loaded.json_bytes())["job_id"] == "job-1"
+        assert gzip.decompress(loaded.compressed) == loaded.json_bytes()
+        assert await fresh.get("missing") is None
+
+    @pytest.mark.asyncio
+    async def test_etag_is_content_hash(self, tmp_path):
+        """Identical reports share an ETag; different content changes it"""
+        store = FilesystemReportStore(str(tmp_path))
+
+        first = await store.save("job-1", make_report("job-1"))
+        again = await store.save("job-1", make_report("job-1"))
+        changed = await store.save("job-1", make_report("job-1", tables=11))
+
+        assert first.etag == again.etag
+        assert first.compressed == again.compressed
+        assert changed.etag != first.etag
+        assert await store.get_etag("job-1") == changed.etag
+
+    @pytest.mark.asyncio
+    async def test_lru_serves_without_backend(self, tmp_path, monkeypatch):
+        """Cached reports skip the backend; the LRU stays bounded"""
+        store = FilesystemReportStore(str(tmp_path), cache_size=2)
+        for i in range(3):
+            await store.save(f"job-{i}", make_report(f"job-{i}"))
+
+        reads = []
+        original_read = store._read
+
+        async def counting_read(job_id, content_hash):
+            reads.append(job_id)
+            return await original_read(job_id, content_hash)
+
+        monkeypatch.setattr(store, "_read", counting_read)
+
+        await store.get("job-2")
+        await store.get("job-0")
+
+        assert reads == ["job-0"]
+        assert list(store._cache) == ["job-2", "job-0"]
@@ -0,0 +1,97 @@
+"""
+Unit tests for incremental re-audit snapshots
+"""
+
+import pytest
+from src.models.schemas import AnalyticsRule, KqlParseResult, WorkspaceFunction
+from src.services.rule_snapshot import RuleSnapshot, RuleSnapshotStore
+from src.services.table_catalog import TableCatalog
+
+CATALOG = TableCatalog(["SecurityEvent", "SigninLogs", "Syslog"])
+
+
+def rule(rule_id, query, etag=None):
+    """Scheduled analytics rule"""
+    return AnalyticsRule(
+        rule_id=rule_id, rule_name=rule_id, rule_type="Scheduled",
+        kql_query=query, enabled=True, etag=etag
+    )
+
+
+def result(*tables):
+    """Successful AST parse result"""
+    return KqlParseResult(tables=list(tables), confidence="HIGH", parsing_method="AST", success=True)
+
+
+@pytest.fixture
+def snapshot():
+    """Snapshot of two rules"""
+    snapshot = RuleSnapshot("fp")
+    snapshot.update(
+        [rule("r1", "SecurityEvent | count", etag="1"), rule("r2", "Syslog | count", etag="1")],
+        [result("SecurityEvent"), result("Syslog")]
+    )
+    return snapshot
+
+
+class TestRuleSnapshot:
+    """Test change detection"""
+
+    def test_unchanged_rules_are_reused(self, snapshot):
+        """Matching etag, or matching query under a new etag, reuses the result"""
+        assert snapshot.lookup(rule("r1", "SecurityEvent | count", etag="1")).tables == ["SecurityEvent"]
+        assert snapshot.lookup(rule("r2", "Syslog | count", etag="2")).tables == ["Syslog"]
+
+    def test_new_and_edited_rules_are_reparsed(self, snapshot):
+        """A new rule or a changed query has no reusable result"""
+        assert snapshot.lookup(rule("r3", "SigninLogs")) is None
+        assert snapshot.lookup(rule("r2", "Syslog | take 1", etag="2")) is None
+
+    def test_update_replaces_entries(self, snapshot):
+        """Deleted rules drop out; edited rules are stored with their new hash"""
+        snapshot.update(
+            [rule("r1", "SigninLogs | count", etag="2"), rule("r3", "SigninLogs")],
+            [result("SigninLogs"), result("SigninLogs")]
+        )
+
+        assert sorted(snapshot.entries) == ["r1", "r3"]
+        assert snapshot.lookup(rule("r1", "SigninLogs | count", etag="2")).tables == ["SigninLogs"]
+        assert snapshot.lookup(rule("r2", "Syslog | count", etag="1")) is None
+
+    def test_reused_results_are_not_cache_hits(self, snapshot):
+        """A parse-cache hit from the audit that stored it is not one on reuse"""
+        cached = result("SigninLogs").model_copy(update={"from_cache": True})
+        snapshot.update([rule("r3", "SigninLogs", etag="1")], [cached])
+
+        assert snapshot.lookup(rule("r3", "SigninLogs", etag="1")).from_cache is False
+
+    def test_fingerprint_covers_tables_and_functions(self):
+        """Results attributed against other tables or functions are not reused"""
+        functions = [WorkspaceFunction(function_alias="Fn", query="Syslog")]
+        base = RuleSnapshot.fingerprint_of(CATALOG, functions)
+
+        assert base == RuleSnapshot.fingerprint_of(TableCatalog(["Syslog", "SigninLogs", "SecurityEvent"]), functions)
+        assert base != RuleSnapshot.fingerprint_of(TableCatalog(["SecurityEvent"]), functions)
+        assert base != RuleSnapshot.fingerprint_of(CATALOG, [WorkspaceFunction(function_alias="Fn", query="SigninLogs")])
+
+
+class TestRuleSnapshotStore:
+    """Test persistence of snapshots"""
+
+    @pytest.mark.asyncio
+    async def test_snapshot_survives_restart(self, tmp_path, snapshot):
+        """A new store over the same directory serves the last audit's results"""
+        await RuleSnapshotStore(root=str(tmp_path)).save("ws", snapshot)
+
+        restored = await RuleSnapshotStore(root=str(tmp_path)).load("ws", "fp")
+
+        assert len(restored) == 2
+        assert restored.lookup(rule("r2", "Syslog | count", etag="1")).tables == ["Syslog"]
+
+    @pytest.mark.asyncio
+    async def test_fingerprint_mismatch_discards_snapshot(self, tmp_path, snapshot):
+        """A snapshot taken against other tables starts over empty"""
+        store = RuleSnapshotStore(root=str(tmp_path))
+        await store.save("ws", snapshot)
+
+        assert len(await store.load("ws", "other")) == 0
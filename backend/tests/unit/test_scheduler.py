@@ -0,0 +1,83 @@
+"""
+Unit tests for the audit step scheduler
+"""
+
+import asyncio
+import time
+
+import pytest
+from src.agents.scheduler import StepScheduler
+
+
+class TestStepScheduler:
+    """Test dependency-aware step execution"""
+
+    @pytest.mark.asyncio
+    async def test_independent_steps_run_concurrently(self):
+        """Total time should track the slowest step, not the sum"""
+        async def fetch(value):
+            await asyncio.sleep(0.2)
+            return value
+
+        scheduler = StepScheduler()
+        for i in range(5):
+            scheduler.add_step(f"fetch_{i}", lambda i=i: fetch(i))
+
+        start = time.time()
+        results = await scheduler.run()
+        elapsed = time.time() - start
+
+        assert results == {f"fetch_{i}": i for i in range(5)}
+        assert elapsed < 0.6
+        assert set(scheduler.step_times) == set(results)
+
+    @pytest.mark.asyncio
+    async def test_dependent_step_receives_results(self):
+        """Dependent steps start after, and receive, their dependencies"""
+        async def rules():
+            return ["rule-1", "rule-2"]
+
+        async def parse(rule_list):
+            return len(rule_list)
+
+        scheduler = StepScheduler()
+        scheduler.add_step("rules", rules)
+        scheduler.add_step("parse", parse, depends_on=["rules"])
+
+        results = await scheduler.run()
+
+        assert results["parse"] == 2
+
+    @pytest.mark.asyncio
+    async def test_failure_cancels_pending_steps(self):
+        """A failing step cancels the rest and re-raises"""
+        cancelled = asyncio.Event()
+
+        async def slow():
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        async def broken():
+            raise RuntimeError("No tables found in workspace")
+
+        scheduler = StepScheduler()
+        scheduler.add_step("slow", slow)
+        scheduler.add_step("broken", broken)
+
+        with pytest.raises(RuntimeError):
+            await scheduler.run()
+
+        assert cancelled.is_set()
+
+    def test_unknown_dependency_rejected(self):
+        """Dependencies must be registered first"""
+        async def step():
+            return None
+
+        scheduler = StepScheduler()
+
+        with pytest.raises(ValueError):
+            scheduler.add_step("parse", step, depends_on=["rules"])
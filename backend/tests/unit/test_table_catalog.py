@@ -0,0 +1,70 @@
+"""
+Unit tests for the workspace table catalog
+"""
+
+import pytest
+from src.services.kql_parse_cache import KqlParseCache
+from src.services.kql_parser import KqlParser
+from src.services.table_catalog import TableCatalog
+
+CATALOG = TableCatalog(["SecurityEvent", "SigninLogs", "ContainerLog", "ContainerLogV2", "Syslog"])
+
+
+@pytest.fixture
+def parser():
+    """Parser over a fresh in-memory cache"""
+    return KqlParser(cache=KqlParseCache(path=""))
+
+
+class TestTableCatalog:
+    """Test the one-pass catalog matcher"""
+
+    def test_finds_whole_names_longest_first(self):
+        """Prefixes and identifiers that merely contain a table name do not match"""
+        query = "ContainerLogV2 | join (ContainerLog) on Id | extend SyslogCount = 1, MySecurityEvent = 2"
+
+        assert CATALOG.find(query) == [("ContainerLogV2", 0, 14), ("ContainerLog", 23, 35)]
+
+    def test_strings_and_comments_are_skipped(self):
+        """Table names inside literals and comments are not references"""
+        query = 'Syslog // from SigninLogs\n| where Message has "SecurityEvent"'
+
+        assert [name for name, _, _ in CATALOG.find(query)] == ["Syslog"]
+
+    def test_empty_catalog_matches_nothing(self):
+        """A workspace without tables attributes nothing"""
+        assert TableCatalog([]).find("SecurityEvent | count") == []
+
+
+class TestCatalogAttribution:
+    """Test parse results restricted to the workspace catalog"""
+
+    def test_unknown_sources_are_dropped(self, parser):
+        """Tables missing from the workspace are not attributed"""
+        result = parser.parse("union SecurityEvent, AWSCloudTrail | count", catalog=CATALOG)
+
+        assert result.parsing_method == "AST"
+        assert result.tables == ["SecurityEvent"]
+
+    def test_regex_fallback_replaced_by_catalog_match(self, parser):
+        """Malformed queries are attributed by exact catalog lookup, not capitalised words"""
+        result = parser.parse('SigninLogs | where UserPrincipalName == "x', catalog=CATALOG)
+
+        assert result.parsing_method == "CATALOG"
+        assert result.tables == ["SigninLogs"]
+
+    def test_no_known_tables_is_unsuccessful(self, parser):
+        """A query over unknown sources only is flagged for review"""
+        result = parser.parse("_Im_Dns | where ResponseCode != 0", catalog=CATALOG)
+
+        assert not result.success
+        assert result.parsing_confidence == 0.0
+
+    def test_cached_results_are_catalog_independent(self, parser):
+        """The same query is attributed per workspace"""
+        query = "union SecurityEvent, WindowsEvent | count"
+        other = TableCatalog(["WindowsEvent"])
+
+        assert parser.batch_parse([query], catalog=CATALOG)[0].tables == ["SecurityEvent"]
+        result = parser.batch_parse([query], catalog=other)[0]
+        assert result.from_cache and result.tables == ["WindowsEvent"]
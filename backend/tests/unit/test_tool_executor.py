@@ -0,0 +1,61 @@
+"""
+Unit tests for the agent tool execution engine
+"""
+
+import asyncio
+import threading
+
+import pytest
+from src.agents.tool_executor import ToolExecutor
+
+
+class TestToolExecutor:
+    """Test async/CPU-bound tool execution and deadlines"""
+
+    @pytest.mark.asyncio
+    async def test_async_tool_is_awaited(self):
+        """Async tools return their real result, not a coroutine"""
+        async def list_tables(resource_group, workspace_name):
+            await asyncio.sleep(0)
+            return [resource_group, workspace_name]
+
+        executor = ToolExecutor(max_workers=1)
+        result = await executor.run("list_workspace_tables", list_tables, "rg", "ws")
+
+        assert result == ["rg", "ws"]
+
+    @pytest.mark.asyncio
+    async def test_cpu_tool_runs_off_loop(self):
+        """CPU-bound tools run on the executor, not the event loop thread"""
+        loop_thread = threading.get_ident()
+
+        def parse(queries):
+            return threading.get_ident(), len(queries)
+
+        executor = ToolExecutor(max_workers=2)
+        thread_id, count = await executor.run(
+            "parse_kql_tables", parse, ["SecurityEvent | count"], cpu_bound=True
+        )
+        executor.shutdown()
+
+        assert count == 1
+        assert thread_id != loop_thread
+
+    @pytest.mark.asyncio
+    async def test_deadline_cancels_tool(self):
+        """A tool that misses its deadline is cancelled and raises"""
+        cancelled = asyncio.Event()
+
+        async def hang():
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        executor = ToolExecutor(max_workers=1)
+
+        with pytest.raises(asyncio.TimeoutError):
+            await executor.run("list_workbooks", hang, timeout=0.05)
+
+        assert cancelled.is_set()
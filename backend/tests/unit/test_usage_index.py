@@ -0,0 +1,92 @@
+"""
+Unit tests for the table usage index
+"""
+
+from src.models.schemas import (
+    AnalyticsRule, DataConnector, HuntQuery, TableIngestionData, TierType, Workbook
+)
+from src.services.report_generator import ReportGenerator
+from src.services.usage_index import UsageIndex
+
+RULES = [
+    AnalyticsRule(
+        rule_id="r1", rule_name="Brute force", rule_type="Scheduled", kql_query="SigninLogs",
+        enabled=True, tables_referenced=["SigninLogs", "IdentityInfo"], parsing_confidence=1.0
+    ),
+    AnalyticsRule(
+        rule_id="r2", rule_name="Unparsed", rule_type="Scheduled", kql_query="Syslog | where (",
+        enabled=True, tables_referenced=["Syslog"], parsing_confidence=0.0
+    ),
+]
+WORKBOOKS = [
+    Workbook(
+        workbook_id="w1", workbook_name="Sign-ins", kql_queries=["SigninLogs"],
+        tables_referenced=["SigninLogs"], parsing_confidence=0.7
+    )
+]
+HUNT_QUERIES = [
+    HuntQuery(
+        query_id="h1", query_name="Rare processes", kql_query="DeviceProcessEvents",
+        tables_referenced=["DeviceProcessEvents"], parsing_confidence=1.0
+    )
+]
+
+
+def table(name):
+    """Hot table ingesting 1 GB/day"""
+    return TableIngestionData(
+        table_name=name, ingestion_gb_per_day=1.0, ingestion_gb_per_month=30.0,
+        current_tier=TierType.HOT, retention_days=90
+    )
+
+
+class TestUsageIndex:
+    """Test postings and per-table lookups"""
+
+    def test_postings_cover_every_artifact_kind(self):
+        """Rules, workbooks and hunt queries are indexed in one structure"""
+        index = UsageIndex.build(RULES, WORKBOOKS, HUNT_QUERIES)
+
+        assert [(p.kind, p.artifact_id) for p in index.postings["SigninLogs"]] == [
+            ("rule", "r1"), ("workbook", "w1")
+        ]
+        assert index.count("SigninLogs") == 2
+        assert index.count("SigninLogs", "workbook") == 1
+        assert index.count("DeviceProcessEvents", "hunt_query") == 1
+        assert index.rule_names("IdentityInfo") == ["Brute force"]
+
+    def test_failed_parses_are_not_indexed(self):
+        """Tables of artifacts that did not parse are not counted as usage"""
+        index = UsageIndex.build(RULES)
+
+        assert "Syslog" not in index
+        assert index.count("Syslog") == 0
+        assert index.rule_names("Syslog") == []
+
+
+class TestReportUsage:
+    """Test the index as used by the report"""
+
+    def test_hunted_tables_are_not_archive_candidates(self):
+        """A table read only by a hunt query is low usage, not unused"""
+        report = ReportGenerator.generate_report(
+            job_id="job", workspace_id="ws", workspace_name="ws",
+            tables=[table("DeviceProcessEvents"), table("Syslog")],
+            rules=RULES,
+            ingestion_data={"DeviceProcessEvents": 1.0, "Syslog": 1.0},
+            connectors=[DataConnector(
+                connector_name="MDE", connector_id="c1", connector_type="MicrosoftDefender",
+                tables_fed=["DeviceProcessEvents", "Syslog"]
+            )],
+            kql_parse_results=[],
+            agent_tokens_used=0, agent_max_tokens=1, agent_run_seconds=0.0,
+            workbooks=WORKBOOKS, hunt_queries=HUNT_QUERIES
+        )
+
+        hunted, = report.low_usage_candidates
+        assert hunted.table_name == "DeviceProcessEvents"
+        assert (hunted.rule_coverage_count, hunted.hunt_query_count) == (0, 1)
+        assert [c.table_name for c in report.archive_candidates] == ["Syslog"]
+        assert report.connector_coverage[0].tables_with_coverage == 1
+        assert report.usage_index["DeviceProcessEvents"][0].artifact_name == "Rare processes"
+        assert report.metadata.hunt_queries_analyzed == 1
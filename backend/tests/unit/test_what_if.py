@@ -0,0 +1,104 @@
+"""
+Unit tests for what-if tier simulation
+"""
+
+import time
+from types import SimpleNamespace
+
+import pytest
+from src.models.schemas import TableIngestionData, TierType
+from src.services import what_if
+from src.services.report_generator import ReportGenerator
+from src.services.what_if import WhatIfModel, WhatIfService
+from src.utils.errors import UnknownTableException
+
+RATES = {"Hot": 2.0, "Basic": 0.5, "Archive": 0.02}
+
+
+def make_model(count: int) -> WhatIfModel:
+    """Model with count Hot tables at 1 GB/day"""
+    return WhatIfModel(
+        "job-1", [f"T{i}" for i in range(count)], [1.0] * count, ["Hot"] * count, RATES
+    )
+
+
+class TestWhatIfModel:
+    """Test incremental what-if totals"""
+
+    def test_incremental_totals_match_recompute(self):
+        """Applying changes gives the same totals as recomputing every table"""
+        model = WhatIfModel(
+            "job-1", ["A", "B", "C"], [10.0, 5.0, 2.0], ["Hot", "Hot", "Basic"], RATES
+        )
+
+        result = model.simulate({"A": "Archive", "B": "Hot", "C": "Hot"})
+
+        baseline = (10 * 2.0 + 5 * 2.0 + 2 * 0.5) * 30
+        scenario = (10 * 0.02 + 5 * 2.0 + 2 * 2.0) * 30
+        assert result.baseline_monthly_cost == round(baseline, 2)
+        assert result.scenario_monthly_cost == round(scenario, 2)
+        assert result.monthly_savings == round(baseline - scenario, 2)
+        assert result.changed_tables == 2
+        assert result.tables_by_tier == {"Hot": 2, "Basic": 0, "Archive": 1}
+
+    def test_simulations_do_not_mutate_model(self):
+        """Each simulation is relative to the audited tiers"""
+        model = make_model(3)
+
+        model.simulate({"T0": "Archive"})
+        result = model.simulate({})
+
+        assert result.monthly_savings == 0.0
+        assert result.tables_by_tier == {"Hot": 3, "Basic": 0, "Archive": 0}
+
+    def test_unknown_table_rejected(self):
+        """Tables outside the audit are reported"""
+        with pytest.raises(UnknownTableException):
+            make_model(3).simulate({"Missing": "Archive"})
+
+    def test_large_workspace_under_budget(self):
+        """A 10k-table simulation stays well inside the 50 ms UI budget"""
+        model = make_model(10_000)
+        changes = {f"T{i}": "Archive" for i in range(0, 10_000, 10)}
+
+        started = time.perf_counter()
+        result = model.simulate(changes)
+        elapsed = time.perf_counter() - started
+
+        assert result.changed_tables == 1_000
+        assert elapsed < 0.05
+
+
+class TestWhatIfService:
+    """Test building models from stored reports"""
+
+    @pytest.mark.asyncio
+    async def test_model_uses_the_audit_rates(self, monkeypatch):
+        """A pricing refresh after the audit does not move the what-if baseline"""
+        report = ReportGenerator.generate_report(
+            job_id="job-1", workspace_id="ws", workspace_name="ws",
+            tables=[
+                TableIngestionData(
+                    table_name="SecurityEvent", ingestion_gb_per_day=2.0, ingestion_gb_per_month=60.0,
+                    current_tier=TierType.HOT, retention_days=90
+                )
+            ],
+            rules=[], ingestion_data={"SecurityEvent": 2.0}, connectors=[],
+            kql_parse_results=[], agent_tokens_used=0, agent_max_tokens=1, agent_run_seconds=0.0
+        )
+        stored = SimpleNamespace(
+            content_hash="h1", json_bytes=lambda: report.model_dump_json().encode()
+        )
+
+        async def get(job_id):
+            return stored
+
+        monkeypatch.setattr(what_if, "report_store", SimpleNamespace(get=get))
+        monkeypatch.setattr(
+            what_if.cost_calculator, "get_tier_rates", lambda profile=None: dict.fromkeys(RATES, 99.0)
+        )
+
+        model = await WhatIfService().get_model("job-1")
+
+        assert report.metadata.tier_rates
+        assert round(model.baseline_cost, 2) == report.summary.total_monthly_cost_hot